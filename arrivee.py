@@ -0,0 +1,79 @@
+import heapq
+import math
+
+import numpy as np
+
+from topologie import topology_for
+
+
+def arrival_times(trees, sources, delay=None, elevation=None, slope_effect: float = 1.0,
+                  cell_size: float = 1.0, topology=None):
+    """
+    Temps d'arrivée du feu dans chaque case d'arbre, par plus court chemin (Dijkstra avec tas)
+
+    Le temps pour passer d'une case u à un voisin v vaut distance(u, v) * (delay[u] + delay[v]) / 2,
+    multiplié par exp(-slope_effect * pente) : le feu accélère en montée et ralentit en
+    descente. Complexité O(N log N) pour N arbres atteints.
+
+    Args:
+        trees: Masque booléen (hauteur, largeur) des cases combustibles
+        sources: Cases (x, y) allumées au temps 0 ; celles qui ne sont pas des arbres sont ignorées
+        delay: Temps de traversée d'une case (1 par défaut), strictement positif
+        elevation: Altitude de chaque case, dans l'unité de cell_size
+        topology: Règle de voisinage (8-connexité bornée par défaut) ; la distance entre
+            voisins est la distance géométrique entre centres de cases
+
+    Returns:
+        Tableau float64 des temps d'arrivée, inf pour les cases non atteintes
+    """
+    height, width = trees.shape
+    topology = topology_for(trees.shape, topology)
+    neighbour_rows, neighbour_cols = topology.rows, topology.cols
+    distances = topology.distances
+    for name, layer in (("delay", delay), ("elevation", elevation)):
+        if layer is not None and np.shape(layer) != trees.shape:
+            raise ValueError(f"La couche {name} doit avoir la forme de la carte {trees.shape}")
+    if delay is not None and not np.all(np.asarray(delay)[trees] > 0):
+        raise ValueError("Les délais de propagation doivent être strictement positifs")
+
+    # listes Python : l'accès élément par élément y est bien plus rapide que dans numpy
+    is_tree = trees.ravel().tolist()
+    delays = None if delay is None else np.asarray(delay, dtype=np.float64).ravel().tolist()
+    heights = None if elevation is None else np.asarray(elevation, dtype=np.float64).ravel().tolist()
+    times = [math.inf] * (height * width)
+
+    heap = []
+    for x, y in sources:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"Position de départ invalide: ({x}, {y})")
+        index = y * width + x
+        if is_tree[index] and times[index]:
+            times[index] = 0.0
+            heap.append((0.0, index))
+    heapq.heapify(heap)
+
+    while heap:
+        time, index = heapq.heappop(heap)
+        if time > times[index]:
+            continue
+        y, x = divmod(index, width)
+        parity = y & 1
+        for rows, cols, distance in zip(neighbour_rows, neighbour_cols, distances):
+            ny, nx = rows[y], cols[parity][x]
+            if ny < 0 or nx < 0:
+                continue
+            neighbour = ny * width + nx
+            if not is_tree[neighbour]:
+                continue
+            cost = distance
+            if delays is not None:
+                cost *= (delays[index] + delays[neighbour]) / 2
+            if heights is not None:
+                slope = (heights[neighbour] - heights[index]) / (distance * cell_size)
+                cost *= math.exp(-slope_effect * slope)
+            arrival = time + cost
+            if arrival < times[neighbour]:
+                times[neighbour] = arrival
+                heapq.heappush(heap, (arrival, neighbour))
+
+    return np.array(times, dtype=np.float64).reshape(height, width)
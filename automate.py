@@ -0,0 +1,121 @@
+import numpy as np
+
+from topologie import topology_for
+
+# Valeurs des cases (TerrainType)
+TREE = 1
+BURNT = 3
+BURNING = 4
+
+
+class FireHistory:
+    """
+    Historique d'un feu pas à pas, stocké en images différentielles
+
+    frames[t] contient les indices à plat des cases qui prennent feu au pas t ; elles
+    deviennent brûlées au pas t + 1. La taille totale est donc le nombre de cases
+    brûlées, quel que soit le nombre de pas.
+    """
+    __slots__ = ("initial", "frames", "finished")
+
+    def __init__(self, initial, frames, finished: bool):
+        self.initial = initial
+        self.frames = frames
+        # False si la simulation a été arrêtée avant l'extinction du feu
+        self.finished = finished
+
+    @property
+    def steps(self):
+        """Numéro du dernier état enregistré (l'extinction si le feu est fini)"""
+        return len(self.frames) if self.finished else len(self.frames) - 1
+
+    @property
+    def burnt(self):
+        return sum(frame.size for frame in self.frames)
+
+    def state(self, step: int):
+        """Grille uint8 après step pas (0 : case de départ en feu)"""
+        if not 0 <= step <= self.steps:
+            raise ValueError(f"Pas invalide: {step}")
+        cells = self.initial.copy()
+        flat = cells.reshape(-1)
+        for frame in self.frames[:step]:
+            flat[frame] = BURNT
+        if step < len(self.frames):
+            flat[self.frames[step]] = BURNING
+        return cells
+
+
+def run_steps(cells, start_x: int, start_y: int, max_steps: int = None, topology=None):
+    """
+    Fait avancer le feu pas à pas sur cells (uint8, modifié en place)
+
+    À chaque pas, les arbres voisins d'une case en feu prennent feu et les cases en
+    feu deviennent brûlées. Seul le front est traité, par tableaux d'indices et
+    sans boucle par case : un pas coûte O(taille du front).
+
+    Args:
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+
+    Returns:
+        (images différentielles (voir FireHistory), True si le feu s'est éteint)
+    """
+    topology = topology_for(cells.shape, topology)
+    flat = cells.reshape(-1)
+    front = np.array([start_y * cells.shape[1] + start_x], dtype=np.int64)
+    flat[front] = BURNING
+    frames = [front]
+    step = 0
+    while max_steps is None or step < max_steps:
+        neighbours = topology.neighbour_indices(front).ravel()
+        neighbours = neighbours[neighbours >= 0]
+        ignited = np.unique(neighbours[flat[neighbours] == TREE])
+        flat[front] = BURNT
+        step += 1
+        if not ignited.size:
+            return frames, True
+        flat[ignited] = BURNING
+        frames.append(ignited)
+        front = ignited
+    return frames, False
+
+
+def burn_from_sources(trees, sources, topology=None):
+    """
+    Feu parti simultanément de plusieurs cases, propagé en une seule passe
+
+    Le front de tous les départs avance ensemble, pas à pas, par tableaux d'indices.
+    Une case est attribuée au départ qui l'atteint en premier ; à égalité, au départ
+    de plus petit indice.
+
+    Args:
+        sources: Cases (x, y) ; celles qui ne sont pas des arbres sont ignorées
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+
+    Returns:
+        Tableau int32 (hauteur, largeur) de l'indice du départ de chaque case brûlée, -1 ailleurs
+    """
+    height, width = trees.shape
+    topology = topology_for(trees.shape, topology)
+    origin = np.full(trees.shape, -1, dtype=np.int32)
+    for label, (x, y) in enumerate(sources):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"Position de départ invalide: ({x}, {y})")
+        if trees[y, x] and origin[y, x] < 0:
+            origin[y, x] = label
+    flat_trees = trees.reshape(-1)
+    flat_origin = origin.reshape(-1)
+    front = np.flatnonzero(flat_origin >= 0)
+    labels = flat_origin[front]
+    while front.size:
+        neighbours = topology.neighbour_indices(front)
+        ok = neighbours >= 0
+        ok[ok] = flat_trees[neighbours[ok]] & (flat_origin[neighbours[ok]] < 0)
+        candidates = neighbours[ok]
+        candidate_labels = np.broadcast_to(labels, neighbours.shape)[ok]
+        # une case atteinte par plusieurs départs au même pas revient au plus petit
+        order = np.argsort(candidate_labels, kind="stable")
+        front, first = np.unique(candidates[order], return_index=True)
+        labels = candidate_labels[order][first]
+        flat_origin[front] = labels
+    return origin
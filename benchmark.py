@@ -0,0 +1,221 @@
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from cas_pratique import ForestFireSimulator, TerrainType
+from composantes import label_components_parallel
+
+SIZES = (32, 64, 128)
+DENSITIES = (0.45, 0.6, 0.75)
+WATER = 0.05
+SEED = 0
+THRESHOLD = 0.25
+BASELINE = "benchmark_baseline.json"
+
+
+def _fire(sim, x, y):
+    sim.reset_map()
+    sim.simulate_fire(x, y)
+
+
+def _fire_component(sim, x, y):
+    sim.reset_map()
+    sim.simulate_fire(x, y, engine="component")
+
+
+def _cut(mode):
+    def run(sim, x, y):
+        sim.reset_map()
+        sim.apply_smart_preventive_cut(x, y, mode=mode)
+    return run
+
+
+def _export_html(sim, x, y):
+    sim.reset_map()
+    sim.simulate_fire(x, y)
+    with tempfile.TemporaryDirectory() as directory:
+        sim.export_html(os.path.join(directory, "benchmark.html"))
+
+
+# nom -> (fonction(sim, x, y), plus grande taille de carte mesurée, None sans limite) ;
+# la recherche exhaustive simule un feu par arbre et devient vite très longue
+CASES = {
+    "simulate_fire": (_fire, None),
+    "simulate_fire_component": (_fire_component, None),
+    "cut_exhaustive": (_cut("exhaustive"), 32),
+    "cut_incremental": (_cut("incremental"), 64),
+    "cut_dominator": (_cut("dominator"), None),
+    "export_html": (_export_html, None),
+}
+
+
+def make_simulator(size: int, density: float, seed: int = SEED, backend: str = "numpy"):
+    """Carte carrée reproductible, départ du feu au centre forcé en arbre"""
+    sim = ForestFireSimulator(size, size, backend=backend)
+    sim.map_generator(tree_percentage=density, water_percentage=WATER, seed=seed)
+    x = y = size // 2
+    sim.map[y][x] = TerrainType.TREE
+    sim.reset_map()
+    return sim, x, y
+
+
+def measure(function, sim, x, y, repeats: int = 3):
+    """
+    Mesure un appel : meilleur temps sur repeats exécutions, pic mémoire et feux simulés
+
+    Le pic est mesuré par tracemalloc lors d'une exécution à part, qui ralentirait les
+    temps. Les feux sont comptés par les compteurs du simulateur : une coupe évaluée
+    compte pour un feu, même quand la recherche ne relance pas simulate_fire.
+
+    Returns:
+        Dictionnaire {"time", "peak", "fires", "fires_per_s"}
+    """
+    times = []
+    for _ in range(repeats):
+        before = sim.events.counters.copy()
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            function(sim, x, y)
+        times.append(time.perf_counter() - start)
+        delta = sim.events.counters - before
+        fires = max(delta["fires"], delta["cuts_evaluated"])
+
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            function(sim, x, y)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {"time": best, "peak": peak, "fires": fires, "fires_per_s": fires / best if best > 0 else None}
+
+
+def run_suite(cases=None, sizes=SIZES, densities=DENSITIES, seed: int = SEED, repeats: int = 3,
+              backend: str = "numpy", progress=None):
+    """
+    Mesure chaque cas pour chaque taille et densité
+
+    Returns:
+        Dictionnaire "cas/taille/densité" -> résultat de measure
+    """
+    results = {}
+    for size in sizes:
+        for density in densities:
+            sim, x, y = make_simulator(size, density, seed, backend)
+            for name in cases or CASES:
+                function, max_size = CASES[name]
+                if max_size is not None and size > max_size:
+                    continue
+                key = f"{name}/{size}/{density}"
+                results[key] = measure(function, sim, x, y, repeats)
+                if progress:
+                    progress(key, results[key])
+    return results
+
+
+def strip_scaling(size: int, density: float = 0.6, workers=(1, 2, 4), seed: int = SEED, repeats: int = 3):
+    """
+    Temps de l'étiquetage par bandes (label_components_parallel) selon le nombre de processus
+
+    Returns:
+        Liste de dictionnaires {"workers", "time", "speedup"}, speedup relatif à workers[0]
+    """
+    sim, _, _ = make_simulator(size, density, seed)
+    trees = sim.map.data == TerrainType.TREE.value
+    rows = []
+    for count in workers:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            label_components_parallel(trees, count)
+            times.append(time.perf_counter() - start)
+        rows.append({"workers": count, "time": min(times)})
+    for row in rows:
+        row["speedup"] = rows[0]["time"] / row["time"]
+    return rows
+
+
+def compare(results, baseline, threshold: float = THRESHOLD):
+    """
+    Régressions par rapport à une référence : temps ou pic mémoire au-delà de (1 + threshold) fois la référence
+
+    Returns:
+        Liste de tuples (clé, mesure, valeur de référence, valeur actuelle)
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        for metric in ("time", "peak"):
+            if reference[metric] and result[metric] > reference[metric] * (1 + threshold):
+                regressions.append((key, metric, reference[metric], result[metric]))
+    return regressions
+
+
+def save_baseline(results, filename: str = BASELINE):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_baseline(filename: str = BASELINE):
+    with open(filename, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _print_result(key, result):
+    rate = "-" if result["fires_per_s"] is None or not result["fires"] else f"{result['fires_per_s']:.1f}"
+    print(f"{key:<40} {result['time'] * 1000:>10.2f} ms {result['peak'] / 1024:>10.1f} Ko {rate:>10} feux/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance du simulateur d'incendie")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), help="Cas mesurés (tous par défaut)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--densities", nargs="+", type=float, default=list(DENSITIES))
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--backend", choices=ForestFireSimulator.BACKENDS, default="numpy")
+    parser.add_argument("--baseline", default=BASELINE, help="Fichier JSON de référence")
+    parser.add_argument("--save", action="store_true", help="Enregistre les mesures comme nouvelle référence")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Ralentissement toléré avant de signaler une régression (0.25 = 25 %%)")
+    parser.add_argument("--scaling", type=int, metavar="TAILLE",
+                        help="Mesure aussi l'étiquetage par bandes sur une carte de cette taille")
+    args = parser.parse_args(argv)
+
+    print(f"{'cas/taille/densité':<40} {'temps':>13} {'pic mémoire':>13} {'débit':>17}")
+    results = run_suite(args.cases, args.sizes, args.densities, args.seed, args.repeats, args.backend,
+                        progress=_print_result)
+
+    if args.scaling:
+        print(f"\nÉtiquetage par bandes, carte {args.scaling}x{args.scaling}:")
+        for row in strip_scaling(args.scaling, seed=args.seed, repeats=args.repeats):
+            print(f"  {row['workers']} processus: {row['time'] * 1000:.2f} ms (x{row['speedup']:.2f})")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nRéférence enregistrée dans {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nPas de référence ({args.baseline}) : relancer avec --save pour en créer une")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    for key, metric, reference, value in regressions:
+        print(f"RÉGRESSION {key} {metric}: {reference:.6g} -> {value:.6g} (x{value / reference:.2f})")
+    if not regressions:
+        print(f"\nAucune régression au-delà de {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
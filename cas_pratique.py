@@ -1,28 +1,514 @@
 import random
 import copy
+import base64
+import json
+import logging
 from enum import Enum
 
+import numpy as np
+
+from composantes import component_mask, burn_size_raster
+from coupes import best_single_cut, IncrementalCutSearch, ParallelCutEvaluator
+from evenements import FireEvents, LoggingAdapter
+from generation import generate_terrain, iter_terrain_blocks, seed_sequence
+from format_carte import read_map_file, write_map_file
+from tuiles import TiledMap, burn_tiled
+from stochastique import run_ensemble, spread_probabilities
+from automate import FireHistory, run_steps, burn_from_sources
+from arrivee import arrival_times
+from pare_feu import plan_firebreak
+from topologie import CONNECTIVITIES, _index_dtype, get_topology
+from empreinte import FireCache, FireRecord, tree_fingerprint, zobrist_hash
+from creuse import SparseForest
+from surcouche import MapOverlay, burn_overlay
+
 class TerrainType(Enum):
     """Type de terrain"""
     EMPTY = 0      # Terrain nu
     TREE = 1       # Arbre
     WATER = 2      # Plan d'eau
     BURNT = 3      # Terrain brûlé
+    BURNING = 4    # En feu (simulation pas à pas)
+
+
+# TerrainType indexé par sa valeur (uint8 -> enum)
+TERRAIN_BY_VALUE = tuple(sorted(TerrainType, key=lambda terrain: terrain.value))
+
+
+class _TerrainRow:
+    """Vue sur une ligne d'une TerrainGrid, convertit uint8 <-> TerrainType"""
+    __slots__ = ("grid", "y", "data")
+
+    def __init__(self, grid, y: int):
+        self.grid = grid
+        self.y = y
+        self.data = grid.data[y]
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [TERRAIN_BY_VALUE[value] for value in self.data[x].tolist()]
+        return TERRAIN_BY_VALUE[self.data[x]]
+
+    def __setitem__(self, x, terrain: TerrainType):
+        if x < 0:
+            x += len(self.data)
+        self.grid.set_cell(x, self.y, terrain.value)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        for value in self.data.tolist():
+            yield TERRAIN_BY_VALUE[value]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def count(self, terrain: TerrainType):
+        return int(np.count_nonzero(self.data == terrain.value))
+
+
+class TerrainGrid:
+    """
+    Grille de terrain stockée dans un tableau numpy uint8 contigu (valeurs de TerrainType).
+    L'accès grid[y][x] renvoie un TerrainType pour rester compatible avec les listes de listes.
+
+    Les écritures passent par set_cell / set_cells : elles incrémentent version et,
+    si le journal est actif, y enregistrent les anciennes valeurs pour pouvoir les annuler.
+    Si fingerprint est suivi (track_fingerprint), elles le mettent à jour en O(cases modifiées).
+    """
+    __slots__ = ("data", "journal", "version", "fingerprint")
+
+    def __init__(self, data):
+        self.data = np.ascontiguousarray(data, dtype=np.uint8)
+        if self.data.ndim != 2:
+            raise ValueError("La grille doit être un tableau à 2 dimensions")
+        # liste de (indices à plat, anciennes valeurs), None si le journal est inactif
+        self.journal = None
+        self.version = 0
+        # empreinte de Zobrist des cases d'arbres, None si elle n'est pas suivie
+        self.fingerprint = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Construit une grille depuis une liste de listes de TerrainType"""
+        values = [[cell.value for cell in row] for row in rows]
+        return cls(np.array(values, dtype=np.uint8).reshape(len(rows), len(rows[0]) if rows else 0))
+
+    def to_rows(self):
+        """Retourne la grille sous forme de liste de listes de TerrainType"""
+        return [[TERRAIN_BY_VALUE[value] for value in row] for row in self.data.tolist()]
+
+    def copy(self):
+        grid = TerrainGrid(self.data.copy())
+        grid.fingerprint = self.fingerprint
+        return grid
+
+    def track_fingerprint(self):
+        """Calcule l'empreinte des arbres (une seule fois en O(N)), tenue à jour ensuite"""
+        if self.fingerprint is None:
+            self.fingerprint = tree_fingerprint(self.data == TerrainType.TREE.value)
+        return self.fingerprint
+
+    def set_cell(self, x: int, y: int, value: int):
+        index = y * self.data.shape[1] + x
+        old = self.data[y, x]
+        if self.journal is not None:
+            self.journal.append((index, old))
+        if self.fingerprint is not None and (old == TerrainType.TREE.value) != (value == TerrainType.TREE.value):
+            self.fingerprint ^= zobrist_hash(index)
+        self.data[y, x] = value
+        self.version += 1
+
+    def set_cells(self, indices, value: int):
+        """Écrit value dans les cases d'indices à plat donnés (sans doublons)"""
+        flat = self.data.reshape(-1)
+        if self.journal is not None:
+            self.journal.append((indices, flat[indices]))
+        if self.fingerprint is not None:
+            indices = np.asarray(indices)
+            toggled = (flat[indices] == TerrainType.TREE.value) != (value == TerrainType.TREE.value)
+            self.fingerprint ^= zobrist_hash(indices[toggled])
+        flat[indices] = value
+        self.version += 1
+
+    def start_journal(self):
+        self.journal = []
+
+    def checkpoint(self):
+        """Position courante du journal, à passer à rollback"""
+        if self.journal is None:
+            raise ValueError("Le journal n'est pas actif")
+        return len(self.journal)
+
+    def rollback(self, mark: int = 0):
+        """Annule les écritures journalisées depuis mark, en O(cases modifiées)"""
+        if self.journal is None:
+            raise ValueError("Le journal n'est pas actif")
+        flat = self.data.reshape(-1)
+        if self.fingerprint is not None:
+            touched = self.written_since(mark)
+            was_tree = flat[touched] == TerrainType.TREE.value
+        for indices, old in reversed(self.journal[mark:]):
+            flat[indices] = old
+        del self.journal[mark:]
+        if self.fingerprint is not None:
+            self.fingerprint ^= zobrist_hash(touched[was_tree != (flat[touched] == TerrainType.TREE.value)])
+        self.version += 1
+
+    def written_since(self, mark: int = 0):
+        """Indices à plat (triés, sans doublons) des cases écrites depuis mark dans le journal"""
+        if self.journal is None:
+            raise ValueError("Le journal n'est pas actif")
+        written = [indices for indices, _ in self.journal[mark:]]
+        arrays = [indices.reshape(-1) for indices in written if type(indices) is np.ndarray]
+        if len(arrays) < len(written):
+            # écritures case par case (set_cell, propagation par file)
+            arrays.append(np.array([index for index in written if type(index) is not np.ndarray], dtype=np.int64))
+        if not arrays:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(arrays).astype(np.int64))
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.data.shape[0]
+        return _TerrainRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.data.shape[0]):
+            yield _TerrainRow(self, y)
+
+    def __eq__(self, other):
+        if isinstance(other, TerrainGrid):
+            return np.array_equal(self.data, other.data)
+        return self.to_rows() == list(other)
+
+    __hash__ = None
+
+    def count(self, terrain: TerrainType):
+        return int(np.count_nonzero(self.data == terrain.value))
+
+
+# nombre de bits à 1 de chaque octet, pour compter les cases d'eau du masque compact
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+class _SparseRow:
+    """Vue sur une ligne d'une SparseGrid, convertit valeur <-> TerrainType"""
+    __slots__ = ("grid", "y")
+
+    def __init__(self, grid, y: int):
+        self.grid = grid
+        self.y = y
+
+    def values(self):
+        """Valeurs uint8 de la ligne, en O(largeur + log(cases stockées))"""
+        width = self.grid.width
+        start = self.y * width
+        row = self.grid.water_range(start, start + width).astype(np.uint8) * np.uint8(TerrainType.WATER.value)
+        for value, cells in self.grid.layers.items():
+            lo, hi = np.searchsorted(cells, [start, start + width])
+            row[cells[lo:hi] - start] = value
+        return row
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return [TERRAIN_BY_VALUE[value] for value in self.values()[x].tolist()]
+        if x < 0:
+            x += self.grid.width
+        return TERRAIN_BY_VALUE[self.grid.get(x, self.y)]
+
+    def __setitem__(self, x, terrain: TerrainType):
+        if x < 0:
+            x += self.grid.width
+        self.grid.set_cell(x, self.y, terrain.value)
+
+    def __len__(self):
+        return self.grid.width
+
+    def __iter__(self):
+        for value in self.values().tolist():
+            yield TERRAIN_BY_VALUE[value]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    __hash__ = None
+
+    def count(self, terrain: TerrainType):
+        return int(np.count_nonzero(self.values() == terrain.value))
+
+
+class SparseGrid:
+    """
+    Grille clairsemée : les arbres et les cases brûlées (ou en feu) sont stockés comme
+    indices à plat triés, l'eau comme un masque d'un bit par case partagé entre les
+    copies (il n'est recopié que si une écriture le modifie). La mémoire est donc
+    proportionnelle au nombre d'arbres, plus surface / 8 octets pour l'eau.
+
+    L'accès grid[y][x] renvoie un TerrainType comme pour TerrainGrid ; chaque écriture
+    coûte O(cases stockées), à regrouper avec set_cells.
+    """
+    __slots__ = ("width", "height", "layers", "water", "_lookup")
+
+    def __init__(self, width: int, height: int, layers=None, water=None):
+        self.width = width
+        self.height = height
+        # valeur TerrainType -> indices à plat triés (ni terrain nu ni eau)
+        self.layers = {value: np.asarray(cells, dtype=np.int64) for value, cells in (layers or {}).items()}
+        # masque de l'eau (np.packbits des cases à plat), jamais modifié en place
+        self.water = np.zeros(-(-width * height // 8), dtype=np.uint8) if water is None else water
+        # index haché indice à plat -> valeur (lookup), reconstruit après une écriture
+        self._lookup = None
+
+    @classmethod
+    def from_array(cls, cells):
+        cells = np.asarray(cells, dtype=np.uint8)
+        return cls.from_blocks(cells.shape[1], cells.shape[0], [(0, cells)])
+
+    @classmethod
+    def from_blocks(cls, width: int, height: int, blocks):
+        """Construit la grille à partir de blocs de lignes (y0, tableau uint8), sans grille complète"""
+        grid = cls(width, height)
+        parts = {}
+        for y0, block in blocks:
+            flat = np.asarray(block).reshape(-1)
+            for value in np.unique(flat).tolist():
+                indices = np.flatnonzero(flat == value) + y0 * width
+                if value == TerrainType.WATER.value:
+                    np.bitwise_or.at(grid.water, indices >> 3, (128 >> (indices & 7)).astype(np.uint8))
+                elif value != TerrainType.EMPTY.value:
+                    parts.setdefault(value, []).append(indices)
+        grid.layers = {value: np.concatenate(chunks) for value, chunks in parts.items()}
+        return grid
+
+    @property
+    def shape(self):
+        return (self.height, self.width)
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les indices et le masque de l'eau"""
+        return self.water.nbytes + sum(cells.nbytes for cells in self.layers.values())
+
+    def forest(self):
+        """SparseForest des arbres, sans copie"""
+        return SparseForest(self.cells(TerrainType.TREE.value), self.shape)
+
+    def cells(self, value: int):
+        """Indices à plat triés des cases de valeur donnée (terrain nu exclu)"""
+        if value == TerrainType.WATER.value:
+            return np.flatnonzero(np.unpackbits(self.water, count=self.width * self.height))
+        return self.layers.get(value, np.zeros(0, dtype=np.int64))
+
+    def water_range(self, start: int, stop: int):
+        """Masque booléen de l'eau pour les cases d'indices start à stop - 1"""
+        offset = start & 7
+        bits = np.unpackbits(self.water[start >> 3:-(-stop // 8)])
+        return bits[offset:offset + stop - start].astype(bool)
+
+    def _is_water(self, indices):
+        return (self.water[indices >> 3] & (128 >> (indices & 7))) != 0
+
+    def get(self, x: int, y: int):
+        return self.read(y * self.width + x)
+
+    def read(self, index: int):
+        """Valeur de la case d'indice à plat index, par l'index haché (lookup)"""
+        value = self.lookup().get(index)
+        if value is not None:
+            return value
+        if self.water[index >> 3] & (128 >> (index & 7)):
+            return TerrainType.WATER.value
+        return TerrainType.EMPTY.value
+
+    def set_cell(self, x: int, y: int, value: int):
+        self.set_cells([y * self.width + x], value)
+
+    def lookup(self):
+        """Dictionnaire indice à plat -> valeur des cases stockées hors eau, pour les lectures case par case"""
+        if self._lookup is None:
+            self._lookup = {}
+            for value, cells in self.layers.items():
+                self._lookup.update(dict.fromkeys(cells.tolist(), value))
+        return self._lookup
+
+    def set_cells(self, indices, value: int):
+        """Écrit value dans les cases d'indices à plat donnés"""
+        self._lookup = None
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        for other, cells in list(self.layers.items()):
+            if other != value:
+                self.layers[other] = cells[~np.isin(cells, indices, assume_unique=True)]
+        is_water = self._is_water(indices)
+        if value == TerrainType.WATER.value:
+            changed = indices[~is_water]
+        else:
+            changed = indices[is_water]
+        if changed.size:
+            # copie à l'écriture : le masque peut être partagé avec self.map
+            self.water = self.water.copy()
+            np.bitwise_xor.at(self.water, changed >> 3, (128 >> (changed & 7)).astype(np.uint8))
+        if value not in (TerrainType.EMPTY.value, TerrainType.WATER.value):
+            self.layers[value] = np.union1d(self.cells(value), indices)
+
+    def to_array(self):
+        """Grille dense uint8 (hauteur, largeur)"""
+        cells = np.unpackbits(self.water, count=self.width * self.height) * np.uint8(TerrainType.WATER.value)
+        for value, indices in self.layers.items():
+            cells[indices] = value
+        return cells.reshape(self.height, self.width)
+
+    def copy(self):
+        layers = {value: cells.copy() for value, cells in self.layers.items()}
+        return SparseGrid(self.width, self.height, layers, self.water)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.height
+        return _SparseRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield _SparseRow(self, y)
+
+    def __eq__(self, other):
+        if isinstance(other, SparseGrid):
+            return self.shape == other.shape and np.array_equal(self.water, other.water) and all(
+                np.array_equal(self.cells(value), other.cells(value)) for value in self.layers.keys() | other.layers.keys())
+        if isinstance(other, TerrainGrid):
+            return np.array_equal(self.to_array(), other.data)
+        return [list(row) for row in self] == list(other)
+
+    __hash__ = None
+
+    def count(self, terrain: TerrainType):
+        water = int(_POPCOUNT[self.water].sum(dtype=np.int64))
+        if terrain == TerrainType.WATER:
+            return water
+        if terrain == TerrainType.EMPTY:
+            return self.width * self.height - water - sum(int(cells.size) for cells in self.layers.values())
+        return int(self.cells(terrain.value).size)
+
 
 class ForestFireSimulator:    
-    def __init__(self, width: int = 10, height: int = 8):
+    BACKENDS = ("list", "numpy", "sparse")
+    ENGINES = ("queue", "component")
+    CUT_MODES = ("exhaustive", "dominator", "incremental", "lazy")
+
+    def __init__(self, width: int = 10, height: int = 8, backend: str = "list", connectivity=8, wrap: bool = False):
         """
         Initialisation
+
+        Args:
+            backend: "list" (listes de TerrainType), "numpy" (TerrainGrid uint8) ou "sparse"
+                (SparseGrid : seuls les arbres et cases brûlées sont stockés, pour les forêts clairsemées)
+            connectivity: Voisins par lesquels le feu se propage : 4, 8 ou "hex"
+            wrap: Carte torique (les bords opposés sont voisins)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inconnu: {backend}")
+        if connectivity not in CONNECTIVITIES:
+            raise ValueError(f"Connexité inconnue: {connectivity}")
         self.width = width
         self.height = height
+        self.backend = backend
+        self.connectivity = connectivity
+        self.wrap = wrap
+        get_topology(width, height, connectivity, wrap)  # vérifie la combinaison taille / connexité / repli
         self.map = []
         self.current_map = []
+        # graine de la dernière carte générée par le générateur vectorisé
+        self.seed = None
+        self.events = FireEvents()
+        # cache des résultats de feux (enable_fire_cache), None si désactivé
+        self.fire_cache = None
+        # (map, version de map, current_map) lors de la dernière copie journalisée
+        self._journal_source = None
+
+    def enable_logging(self, logger: logging.Logger = None, level: int = logging.INFO, events=None):
+        """
+        Relaie les événements de la simulation vers le module logging
+
+        Args:
+            events: Noms des événements à relayer (tous par défaut)
+
+        Returns:
+            L'adaptateur, à passer à disable_logging
+        """
+        adapter = LoggingAdapter(logger, level)
+        return adapter.attach(self.events, events or self.events.listeners)
+
+    def disable_logging(self, adapter: LoggingAdapter):
+        adapter.detach(self.events)
+
+    def enable_fire_cache(self, capacity: int = 1024):
+        """
+        Mémorise les feux déjà simulés (cases brûlées) pour ne pas les recalculer
+
+        Ne s'applique qu'au backend numpy : current_map tient à jour l'empreinte de Zobrist
+        de ses arbres, et simulate_fire réapplique directement le résultat d'un feu déjà vu
+        sur les mêmes arbres depuis le même départ.
+
+        Args:
+            capacity: Nombre maximum de feux mémorisés (les moins récemment utilisés sont évincés)
+
+        Returns:
+            Le FireCache, dont hits, misses et evictions permettent de le dimensionner
+        """
+        self.fire_cache = FireCache(capacity)
+        return self.fire_cache
+
+    def disable_fire_cache(self):
+        self.fire_cache = None
        
-    def map_generator(self, tree_percentage: float = 0.6, water_percentage: float = 0.1):
+    def map_generator(self, tree_percentage: float = 0.6, water_percentage: float = 0.1, seed=None, smoothing: int = 0):
         """
         Génère une carte
+
+        Le backend numpy, une graine ou un lissage utilisent le générateur vectorisé par
+        blocs (module generation) ; sinon la carte est tirée case par case avec random.
+        Avec le backend sparse, chaque bloc est converti dès sa génération : la carte
+        dense n'existe jamais en entier.
+
+        Args:
+            seed: Entier ou numpy.random.Generator ; la même graine donne la même carte
+            smoothing: Rayon du lissage spatial (forêts et lacs regroupés), 0 pour aucun
         """
+        if self.backend == "sparse":
+            sequence, self.seed = seed_sequence(seed)
+            blocks = iter_terrain_blocks(self.width, self.height, tree_percentage, water_percentage, sequence, smoothing)
+            self.map = SparseGrid.from_blocks(self.width, self.height, blocks)
+            self.reset_map()
+            return
+        if self.backend == "numpy" or seed is not None or smoothing:
+            sequence, self.seed = seed_sequence(seed)
+            cells = generate_terrain(self.width, self.height, tree_percentage, water_percentage, sequence, smoothing)
+            self.map = self._from_array(cells)
+            self.reset_map()
+            return
+
+        self.seed = None
         self.map = []
        
         for y in range(self.height):
@@ -41,95 +527,696 @@ class ForestFireSimulator:
         self.current_map = copy.deepcopy(self.map)
    
        
+    def save_map(self, filename: str, include_current: bool = True, packing: str = "uint8"):
+        """
+        Enregistre la carte dans le format binaire compact (module format_carte)
+
+        Args:
+            include_current: Enregistre aussi current_map (état après incendie)
+            packing: "uint8" (chargement par memory-map) ou "2bit" (4 cases par octet)
+        """
+        layers = [self._grid_array(self.map)]
+        if include_current:
+            layers.append(self._grid_array(self.current_map))
+        write_map_file(filename, layers, self.seed, packing)
+        return filename
+
+    @classmethod
+    def load_map(cls, filename: str, mmap: bool = True):
+        """
+        Charge une carte enregistrée par save_map dans un simulateur au backend numpy
+
+        Avec mmap=True (et le compactage uint8) les grilles sont projetées en mémoire :
+        l'ouverture ne lit rien et les pages non modifiées restent partagées.
+        Sans couche current_map, elle est projetée depuis la couche map et journalisée.
+        """
+        content = read_map_file(filename, mmap)
+        simulator = cls(content["width"], content["height"], backend="numpy")
+        simulator.seed = content["seed"]
+        simulator.map = TerrainGrid(content["layers"][0])
+        if len(content["layers"]) > 1:
+            simulator.current_map = TerrainGrid(content["layers"][1])
+        elif mmap and isinstance(content["layers"][0], np.memmap):
+            simulator.current_map = TerrainGrid(read_map_file(filename, mmap)["layers"][0])
+            simulator.current_map.start_journal()
+            simulator._journal_source = (simulator.map, simulator.map.version, simulator.current_map)
+        else:
+            simulator.reset_map()
+        return simulator
+
+    @classmethod
+    def from_tiles(cls, directory: str, work_directory: str, cache_tiles: int = 64):
+        """
+        Simulateur sur une carte en tuiles (module tuiles), plus grande que la mémoire
+
+        self.map lit les tuiles de directory ; current_map écrit ses tuiles modifiées
+        dans work_directory (distinct de directory ; seuls les fichiers de tuiles y sont
+        écrits et supprimés). La mémoire est bornée par 2 * cache_tiles tuiles.
+        """
+        simulator = cls(backend="numpy")
+        simulator.backend = "tiled"
+        simulator.map = TiledMap(directory, cache_tiles)
+        simulator.current_map = TiledMap(directory, cache_tiles, overlay=work_directory)
+        simulator.current_map.discard_changes()
+        simulator.width = simulator.map.width
+        simulator.height = simulator.map.height
+        simulator.seed = simulator.map.seed
+        return simulator
+
+    @property
+    def topology(self):
+        """Tables de voisinage de la carte, calculées une fois par taille (voir topologie.py)"""
+        return get_topology(self.width, self.height, self.connectivity, self.wrap)
+
     def get_neighbors(self, x: int, y: int):
         """
         Retourne les coordonnées des terrains voisins
         """
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    neighbors.append((nx, ny))
-        return neighbors
+        return self.topology.neighbours(x, y)
    
     def reset_map(self):
-        """Remet la carte dans son état initial"""
+        """
+        Remet la carte dans son état initial
+
+        Avec une TerrainGrid, current_map journalise ses écritures : tant que self.map
+        n'a pas changé, la remise à zéro n'annule que les cases modifiées.
+        """
+        if self._journal_is_valid():
+            self.current_map.rollback(0)
+            return
+        if isinstance(self.current_map, TiledMap):
+            self.current_map.discard_changes()
+            return
         self.current_map = copy.deepcopy(self.map)
+        if isinstance(self.current_map, TerrainGrid):
+            self.current_map.start_journal()
+            self._journal_source = (self.map, self.map.version, self.current_map)
+
+    def _journal_is_valid(self):
+        if self._journal_source is None:
+            return False
+        source_map, version, current_map = self._journal_source
+        return (source_map is self.map and version == self.map.version
+                and current_map is self.current_map and current_map.journal is not None)
+
+    def checkpoint(self):
+        """
+        Marque l'état de current_map pour y revenir avec rollback
+
+        O(1) avec une TerrainGrid journalisée, copie complète avec des listes.
+        """
+        if isinstance(self.current_map, TerrainGrid):
+            if self.current_map.journal is None:
+                self.current_map.start_journal()
+            return (self.current_map, self.current_map.checkpoint())
+        return (None, copy.deepcopy(self.current_map))
+
+    def rollback(self, checkpoint):
+        """Restaure current_map dans l'état marqué par checkpoint"""
+        grid, mark = checkpoint
+        if grid is None:
+            self.current_map = copy.deepcopy(mark)
+            return
+        if grid is not self.current_map:
+            raise ValueError("Ce point de restauration appartient à une autre carte")
+        grid.rollback(mark)
+
+    def overlay(self, cuts=()):
+        """
+        Surcouche sur self.map pour les requêtes « et si » : les cases modifiées sont
+        gardées à part, la carte n'est ni copiée ni modifiée. Les surcouches d'une même
+        carte peuvent être évaluées en parallèle (simulate_fire, find_best_cut) tant que
+        self.map ne change pas.
+
+        Args:
+            cuts: Cases (x, y) coupées dans la surcouche
+        """
+        fingerprint, tree = None, None
+        if self.fire_cache is not None and isinstance(self.map, TerrainGrid):
+            fingerprint, tree = self.map.track_fingerprint(), TerrainType.TREE.value
+        overlay = MapOverlay(self._cell_reader(self.map), (self.height, self.width), fingerprint, tree)
+        for x, y in cuts:
+            overlay.set(x, y, TerrainType.EMPTY.value)
+        return overlay
+
+    def _cell_reader(self, grid):
+        """Fonction indice à plat -> valeur de la case, lue directement dans la grille"""
+        width = self.width
+        if isinstance(grid, TerrainGrid):
+            return grid.data.reshape(-1).item
+        if isinstance(grid, SparseGrid):
+            return grid.read
+        if isinstance(grid, TiledMap):
+            raise ValueError("Opération non disponible pour une carte en tuiles")
+        return lambda index: grid[index // width][index % width].value
+
+    def _cells(self, grid):
+        """
+        Retourne (cellules, valeur arbre, valeur brûlé) pour parcourir une grille
+        quel que soit le backend : le tableau uint8 brut pour une TerrainGrid,
+        la liste de listes de TerrainType sinon
+        """
+        if isinstance(grid, TerrainGrid):
+            return grid.data, TerrainType.TREE.value, TerrainType.BURNT.value
+        return grid, TerrainType.TREE, TerrainType.BURNT
+
+    def _grid_array(self, grid):
+        """
+        Retourne la grille sous forme de tableau uint8 (vue directe pour une TerrainGrid,
+        copie dense temporaire pour une SparseGrid)
+        """
+        if isinstance(grid, TerrainGrid):
+            return grid.data
+        if isinstance(grid, SparseGrid):
+            return grid.to_array()
+        if isinstance(grid, TiledMap):
+            raise ValueError("Opération non disponible pour une carte en tuiles")
+        return TerrainGrid.from_rows(grid).data
+
+    def _from_array(self, array):
+        """Grille au format du backend à partir d'un tableau uint8"""
+        if self.backend == "numpy":
+            return TerrainGrid(array)
+        if self.backend == "sparse":
+            return SparseGrid.from_array(array)
+        return TerrainGrid(array).to_rows()
+
+    def _trees(self, grid):
+        """Arbres de la grille : SparseForest pour une SparseGrid, masque booléen sinon"""
+        if isinstance(grid, SparseGrid):
+            return grid.forest()
+        return self._grid_array(grid) == TerrainType.TREE.value
+
+    def _tree_positions(self, grid):
+        """Cases (x, y) des arbres dans l'ordre de lecture"""
+        if isinstance(grid, SparseGrid):
+            indices = grid.cells(TerrainType.TREE.value)
+        elif isinstance(grid, TerrainGrid):
+            indices = np.flatnonzero(grid.data == TerrainType.TREE.value)
+        else:
+            return [(x, y) for y in range(self.height) for x in range(self.width) if grid[y][x] == TerrainType.TREE]
+        ys, xs = np.divmod(indices, self.width)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def _burn_cells(self, burnt_mask):
+        """Marque comme brûlées dans current_map les cases du masque"""
+        if isinstance(self.current_map, (TerrainGrid, SparseGrid)):
+            self.current_map.set_cells(np.flatnonzero(burnt_mask), TerrainType.BURNT.value)
+            return
+        for y, x in zip(*np.nonzero(burnt_mask)):
+            self.current_map[y][x] = TerrainType.BURNT
+
+    def _terrain_counts(self, grid):
+        """Nombre de cases par type de terrain"""
+        if isinstance(grid, TerrainGrid):
+            counts = np.bincount(grid.data.ravel(), minlength=len(TERRAIN_BY_VALUE))
+            return {terrain: int(counts[terrain.value]) for terrain in TerrainType}
+        if isinstance(grid, TiledMap):
+            counts = grid.counts(len(TERRAIN_BY_VALUE))
+            return {terrain: int(counts[terrain.value]) for terrain in TerrainType}
+        if isinstance(grid, SparseGrid):
+            return {terrain: grid.count(terrain) for terrain in TerrainType}
+        return {terrain: sum(row.count(terrain) for row in grid) for terrain in TerrainType}
    
-    def simulate_fire(self, start_x: int, start_y: int):
+    def simulate_fire(self, start_x: int, start_y: int, engine: str = "queue", workers: int = None, overlay: MapOverlay = None,
+                      max_burn: int = None):
         """
         Simule un incendie à partir d'une position donnée
         Retourne le nombre de case brulé
+
+        Args:
+            engine: "queue" (propagation case par case) ou "component"
+                (étiquetage de la composante d'arbres en temps linéaire)
+            workers: Avec engine="component", étiquette la carte par bandes dans
+                ce nombre de processus (résultat identique)
+            overlay: Surcouche (voir overlay) dans laquelle le feu est simulé : seules ses
+                cases sont écrites, self.map et current_map restent intacts (engine ignoré)
+            max_burn: Borne : la propagation s'arrête dès que max_burn cases ont brûlé et
+                max_burn est renvoyé (feu partiel). Propagation case par case seulement
+                (engine="queue", surcouche ou backend sparse)
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Moteur inconnu: {engine}")
         if not (0 <= start_x < self.width and 0 <= start_y < self.height):
             raise ValueError("Position de départ invalide")
-       
-        if self.current_map[start_y][start_x] != TerrainType.TREE:
-            print(f"Pas d'arbre à brûler à la position ({start_x}, {start_y})")
+
+        tiled = isinstance(self.current_map, TiledMap)
+        if max_burn is not None:
+            if max_burn < 1:
+                raise ValueError("max_burn doit être strictement positif")
+            if overlay is None and (tiled or (engine == "component" and not isinstance(self.current_map, SparseGrid))):
+                raise ValueError("max_burn n'est pas disponible avec ce moteur")
+        if overlay is not None:
+            is_tree = overlay.get(start_x, start_y) == TerrainType.TREE.value
+        elif tiled:
+            is_tree = self.current_map.get(start_x, start_y) == TerrainType.TREE.value
+        else:
+            cells, tree, burnt = self._cells(self.current_map)
+            is_tree = cells[start_y][start_x] == tree
+
+        if not is_tree:
+            self.events.emit("ignition", x=start_x, y=start_y, burning=False)
             return 0
-       
+
+        self.events.emit("ignition", x=start_x, y=start_y, burning=True)
+        if overlay is not None:
+            burnt_count = self._simulate_fire_overlay(start_x, start_y, overlay, max_burn)
+        elif tiled:
+            if self.connectivity != 8 or self.wrap:
+                raise ValueError("Les cartes en tuiles ne gèrent que la 8-connexité bornée")
+            # le moteur par tuiles ne charge que les tuiles atteintes par le feu
+            burnt_count = burn_tiled(self.current_map, start_x, start_y)
+        elif isinstance(self.current_map, SparseGrid):
+            burnt_count = self._simulate_fire_sparse(start_x, start_y, max_burn)
+        elif self.fire_cache is not None and isinstance(self.current_map, TerrainGrid):
+            burnt_count = self._simulate_fire_cached(start_x, start_y, engine, workers, max_burn)
+        elif engine == "component":
+            burnt_count = self._simulate_fire_component(start_x, start_y, workers)
+        else:
+            burnt_count = self._simulate_fire_queue(start_x, start_y, max_burn)
+
+        self.events.counters["fires"] += 1
+        self.events.counters["cells_burnt"] += burnt_count
+        self.events.emit("fire_finished", x=start_x, y=start_y, burnt=burnt_count)
+        return burnt_count
+
+    def _simulate_fire_overlay(self, start_x: int, start_y: int, overlay: MapOverlay, max_burn: int = None):
+        """Feu écrit dans la surcouche seulement, lu dans le cache si la surcouche a une empreinte"""
+        key = None
+        burnt_indices = None
+        if self.fire_cache is not None and overlay.fingerprint is not None:
+            key = (overlay.fingerprint, start_x, start_y)
+            burnt_indices = self.fire_cache.get(key, lambda record: record.burnt(max_burn))
+        if burnt_indices is not None:
+            overlay.set_cells(burnt_indices, TerrainType.BURNT.value)
+            burnt_indices = burnt_indices.tolist()
+        else:
+            burnt_indices = burn_overlay(overlay, start_x, start_y, self.topology,
+                                         TerrainType.TREE.value, TerrainType.BURNT.value, max_burn)
+            if key is not None:
+                self._remember_fire(key, burnt_indices, max_burn)
+        if self.events.listeners["cell_burnt"]:
+            for total, index in enumerate(burnt_indices, start=1):
+                self.events.emit("cell_burnt", x=index % self.width, y=index // self.width, total=total)
+        return len(burnt_indices)
+
+    def _simulate_fire_sparse(self, start_x: int, start_y: int, max_burn: int = None):
+        """Composante du départ cherchée parmi les arbres seulement, en O(arbres brûlés * log(arbres))"""
+        burnt_cells = self.current_map.forest().component(start_x, start_y, self.topology, max_burn)
+        self.current_map.set_cells(burnt_cells, TerrainType.BURNT.value)
+        if self.events.listeners["cell_burnt"]:
+            for total, index in enumerate(burnt_cells.tolist(), start=1):
+                self.events.emit("cell_burnt", x=index % self.width, y=index // self.width, total=total)
+        return int(burnt_cells.size)
+
+    def _simulate_fire_cached(self, start_x: int, start_y: int, engine: str, workers: int = None, max_burn: int = None):
+        """
+        Feu lu dans le cache si les mêmes arbres ont déjà brûlé depuis ce départ, sinon
+        simulé par engine puis mémorisé (seulement si current_map est journalisée)
+        """
+        grid = self.current_map
+        key = (grid.track_fingerprint(), start_x, start_y)
+        burnt_indices = self.fire_cache.get(key, lambda record: record.burnt(max_burn))
+        if burnt_indices is not None:
+            grid.set_cells(burnt_indices, TerrainType.BURNT.value)
+            if self.events.listeners["cell_burnt"]:
+                for total, index in enumerate(burnt_indices.tolist(), start=1):
+                    self.events.emit("cell_burnt", x=index % self.width, y=index // self.width, total=total)
+            return len(burnt_indices)
+
+        mark = len(grid.journal) if grid.journal is not None else None
+        if engine == "component":
+            burnt_count = self._simulate_fire_component(start_x, start_y, workers)
+            if mark is not None:
+                # cases écrites d'un bloc, triées : leur début n'est pas un feu arrêté
+                self._remember_fire(key, grid.written_since(mark), max_burn, ordered=False)
+        else:
+            burnt_count = self._simulate_fire_queue(start_x, start_y, max_burn)
+            if mark is not None:
+                # une entrée du journal par case, dans l'ordre de propagation
+                self._remember_fire(key, [index for index, _ in grid.journal[mark:]], max_burn)
+        return burnt_count
+
+    def _remember_fire(self, key, burnt_indices, max_burn: int = None, ordered: bool = True):
+        """
+        Mémorise un feu ; arrêté par max_burn, il reste une borne inférieure dont le
+        début sert aux feux de borne plus petite, sans remplacer un feu complet déjà connu
+        """
+        complete = max_burn is None or len(burnt_indices) < max_burn
+        known = self.fire_cache.peek(key)
+        if complete or known is None or not known.complete:
+            cells = np.asarray(burnt_indices, dtype=_index_dtype(self.width * self.height))
+            self.fire_cache.put(key, FireRecord(cells, complete, ordered))
+
+    def _simulate_fire_queue(self, start_x: int, start_y: int, max_burn: int = None):
+        """Propagation case par case depuis le départ du feu, arrêtée à max_burn cases brûlées"""
+        cells, tree, burnt = self._cells(self.current_map)
+        # abonnés à l'événement cell_burnt (liste vide : aucun coût)
+        on_cell_burnt = self.events.listeners["cell_burnt"]
+        journal = self.current_map.journal if isinstance(self.current_map, TerrainGrid) else None
+        # cases brûlées, pour l'empreinte des arbres si current_map la suit
+        tracked = isinstance(self.current_map, TerrainGrid) and self.current_map.fingerprint is not None
+        burnt_indices = []
+        # voisins lus dans les tables précalculées : aucune liste allouée par case
+        topology = self.topology
+        neighbour_tables = list(zip(topology.rows, topology.cols))
+
         # liste pour progation du feu
         fire_queue = [(start_x, start_y)]
         burnt_count = 0
        
-        print(f"Début de l'incendie à la position ({start_x}, {start_y})")
-       
         while fire_queue:
             x, y = fire_queue.pop(0)
            
             # si pas arbre on passe
-            if self.current_map[y][x] != TerrainType.TREE:
+            if cells[y][x] != tree:
                 continue
            
             # brule la case (terrain arbre)
-            self.current_map[y][x] = TerrainType.BURNT
+            cells[y][x] = burnt
+            if journal is not None:
+                journal.append((y * self.width + x, tree))
+            if tracked:
+                burnt_indices.append(y * self.width + x)
             burnt_count += 1
-            print(f"Case brûlée: ({x}, {y}) - Total: {burnt_count}")
+            if on_cell_burnt:
+                self.events.emit("cell_burnt", x=x, y=y, total=burnt_count)
+            if burnt_count == max_burn:
+                break
            
             # propagation aux voisins
-            for nx, ny in self.get_neighbors(x, y):
-                if self.current_map[ny][nx] == TerrainType.TREE:
+            parity = y & 1
+            for rows, cols in neighbour_tables:
+                ny, nx = rows[y], cols[parity][x]
+                if ny < 0 or nx < 0:
+                    continue
+                if cells[ny][nx] == tree:
                     # vérifie que voisin est pas déjà dans la liste
                     if (nx, ny) not in fire_queue:
                         fire_queue.append((nx, ny))
-       
-        print(f"Incendie terminé - Total de cases brûlées: {burnt_count}")
+
+        if tracked:
+            self.current_map.fingerprint ^= zobrist_hash(burnt_indices)
         return burnt_count
    
-    def export_html(self, filename: str = "forest_fire_simulation.html", title: str = "Simulation d'Incendie de Forêt", use_map: bool = False):
+    def _simulate_fire_component(self, start_x: int, start_y: int, workers: int = None):
+        """
+        Le feu est déterministe : les cases brûlées sont exactement la composante
+        8-connexe d'arbres qui contient le départ du feu
+        """
+        trees = self._grid_array(self.current_map) == TerrainType.TREE.value
+        burnt_mask = component_mask(trees, start_x, start_y, workers, self.topology)
+        self._burn_cells(burnt_mask)
+
+        if self.events.listeners["cell_burnt"]:
+            for total, (y, x) in enumerate(zip(*np.nonzero(burnt_mask)), start=1):
+                self.events.emit("cell_burnt", x=int(x), y=int(y), total=total)
+        return int(np.count_nonzero(burnt_mask))
+
+    def simulate_fire_steps(self, start_x: int, start_y: int, max_steps: int = None):
+        """
+        Simule l'incendie pas à pas (automate cellulaire) avec l'état BURNING
+
+        current_map est mis à jour comme avec simulate_fire ; si max_steps arrête le
+        feu avant son extinction, les cases du front restent en feu.
+
+        Returns:
+            FireHistory, à passer à export_html_animation
+        """
+        if not (0 <= start_x < self.width and 0 <= start_y < self.height):
+            raise ValueError("Position de départ invalide")
+        initial = self._grid_array(self.current_map).copy()
+        if initial[start_y, start_x] != TerrainType.TREE.value:
+            self.events.emit("ignition", x=start_x, y=start_y, burning=False)
+            return FireHistory(initial, [], True)
+
+        self.events.emit("ignition", x=start_x, y=start_y, burning=True)
+        cells = initial.copy()
+        frames, finished = run_steps(cells, start_x, start_y, max_steps, self.topology)
+        history = FireHistory(initial, frames, finished)
+
+        changed = np.concatenate(frames)
+        if isinstance(self.current_map, (TerrainGrid, SparseGrid)):
+            # deux écritures journalisées : reset_map reste en O(cases modifiées)
+            burnt_frames = frames if finished else frames[:-1]
+            if burnt_frames:  # max_steps=0 : seul le départ est en feu, rien n'a encore brûlé
+                self.current_map.set_cells(np.concatenate(burnt_frames), TerrainType.BURNT.value)
+            if not finished:
+                self.current_map.set_cells(frames[-1], TerrainType.BURNING.value)
+        else:
+            width = self.width
+            for index, value in zip(changed.tolist(), cells.reshape(-1)[changed].tolist()):
+                self.current_map[index // width][index % width] = TERRAIN_BY_VALUE[value]
+
+        if self.events.listeners["cell_burnt"]:
+            for total, index in enumerate(changed.tolist(), start=1):
+                self.events.emit("cell_burnt", x=index % self.width, y=index // self.width, total=total)
+        burnt_count = int(changed.size)
+        self.events.counters["fires"] += 1
+        self.events.counters["cells_burnt"] += burnt_count
+        self.events.emit("fire_finished", x=start_x, y=start_y, burnt=burnt_count)
+        return history
+
+    def simulate_fires(self, ignitions):
+        """
+        Simule plusieurs départs de feu simultanés en une seule passe sur current_map
+
+        Args:
+            ignitions: Liste ou tableau de cases (x, y)
+
+        Returns:
+            Dictionnaire avec :
+            - burnt: nombre total de cases brûlées
+            - burnt_by_ignition: cases brûlées attribuées à chaque départ (celui qui les atteint en premier)
+            - origin: tableau (hauteur, largeur) de l'indice du départ de chaque case brûlée, -1 ailleurs
+        """
+        ignitions = [(int(x), int(y)) for x, y in ignitions]
+        trees = self._grid_array(self.current_map) == TerrainType.TREE.value
+        origin = burn_from_sources(trees, ignitions, self.topology)
+        burnt_mask = origin >= 0
+        by_ignition = np.bincount(origin[burnt_mask], minlength=len(ignitions))
+
+        for label, (x, y) in enumerate(ignitions):
+            self.events.emit("ignition", x=x, y=y, burning=bool(origin[y, x] == label))
+        self._burn_cells(burnt_mask)
+        if self.events.listeners["cell_burnt"]:
+            for total, (y, x) in enumerate(zip(*np.nonzero(burnt_mask)), start=1):
+                self.events.emit("cell_burnt", x=int(x), y=int(y), total=total)
+        for label, (x, y) in enumerate(ignitions):
+            if origin[y, x] == label:
+                self.events.counters["fires"] += 1
+                self.events.emit("fire_finished", x=x, y=y, burnt=int(by_ignition[label]))
+        burnt_count = int(np.count_nonzero(burnt_mask))
+        self.events.counters["cells_burnt"] += burnt_count
+        return {
+            "burnt": burnt_count,
+            "burnt_by_ignition": by_ignition.tolist(),
+            "origin": origin,
+        }
+   
+    def simulate_fire_ensemble(self, start_x: int, start_y: int, realizations: int = 1000,
+                               p_spread: float = 0.5, wind=None, wind_strength: float = 0.5,
+                               seed=None, batch_size: int = 64, workers: int = None):
+        """
+        Feu stochastique : chaque arbre en feu allume chaque voisin arbre avec une probabilité
+        p_spread (modulée par le vent), sur un ensemble de réalisations calculées par lots
+
+        current_map n'est pas modifiée.
+
+        Args:
+            wind: Direction (wx, wy) vers laquelle souffle le vent, ou None
+            wind_strength: Effet du vent, de 0 (aucun) à 1
+            seed: Graine ; même graine et même batch_size donnent le même résultat
+            workers: Nombre de processus entre lesquels répartir les lots
+
+        Returns:
+            Dictionnaire avec burn_probability (probabilité de brûler par case),
+            burn_counts (cases brûlées par réalisation), mean_burn et std_burn
+        """
+        if not (0 <= start_x < self.width and 0 <= start_y < self.height):
+            raise ValueError("Position de départ invalide")
+        if realizations < 1:
+            raise ValueError("Il faut au moins une réalisation")
+        trees = self._grid_array(self.current_map) == TerrainType.TREE.value
+        # une ligne de probabilités par parité de ligne (les directions hexagonales en dépendent)
+        probabilities = np.array([spread_probabilities(p_spread, wind, wind_strength, offsets)
+                                  for offsets in self.topology.real_offsets])
+        hits, counts = run_ensemble(trees, start_x, start_y, realizations, probabilities, seed, batch_size, workers,
+                                    self.topology)
+        return {
+            "burn_probability": hits / realizations,
+            "burn_counts": counts,
+            "mean_burn": float(counts.mean()),
+            "std_burn": float(counts.std()),
+        }
+
+    def fire_arrival_times(self, ignitions, fuel=None, elevation=None, slope_effect: float = 1.0):
+        """
+        Instant où le feu atteint chaque case, depuis une ou plusieurs cases de départ
+
+        current_map n'est pas modifiée.
+
+        Args:
+            ignitions: Liste de cases (x, y) allumées au temps 0
+            fuel: Temps de traversée de chaque case (hauteur, largeur), 1 par défaut :
+                plus il est grand, plus le combustible ralentit le feu
+            elevation: Altitude de chaque case (en cases) ; le feu accélère en montée
+            slope_effect: Sensibilité à la pente
+
+        Returns:
+            Tableau float64 (hauteur, largeur) des temps d'arrivée, inf hors du feu
+        """
+        trees = self._grid_array(self.current_map) == TerrainType.TREE.value
+        return arrival_times(trees, ignitions, fuel, elevation, slope_effect, topology=self.topology)
+
+    def ignition_risk(self, workers: int = None):
+        """
+        Risque d'ignition de toute la carte, calculé avec un seul étiquetage de self.map
+
+        Args:
+            workers: Si renseigné, étiquetage parallèle par bandes dans ce nombre de processus
+
+        Returns:
+            Dictionnaire avec :
+            - burn_size: tableau (hauteur, largeur) du nombre de cases brûlées si le feu part de chaque case
+            - expected_burn: cases brûlées en moyenne pour un départ uniforme sur toute la carte
+            - expected_burn_trees: cases brûlées en moyenne pour un départ uniforme sur les arbres
+            - largest_cluster: taille du plus grand massif d'arbres
+            - clusters: nombre de massifs d'arbres
+        """
+        trees = self._grid_array(self.map) == TerrainType.TREE.value
+        raster, sizes = burn_size_raster(trees, workers, self.topology)
+        tree_count = int(np.count_nonzero(trees))
+        total = int(raster.sum())
+        return {
+            "burn_size": raster,
+            "expected_burn": total / raster.size if raster.size else 0.0,
+            "expected_burn_trees": total / tree_count if tree_count else 0.0,
+            "largest_cluster": int(sizes.max()) if tree_count else 0,
+            "clusters": int(np.count_nonzero(sizes)),
+        }
+
+    # Au-delà de ce nombre de cases, export_html(render="auto") dessine la carte sur un <canvas>
+    CANVAS_THRESHOLD = 10_000
+
+    TERRAIN_COLORS = {
+        TerrainType.EMPTY: '#D2B48C',    # terrain nu
+        TerrainType.TREE: '#228B22',     # arbres
+        TerrainType.WATER: '#4169E1',    # l'eau
+        TerrainType.BURNT: '#8B0000',    # terrain brûlé
+        TerrainType.BURNING: '#FF8C00'   # en feu
+    }
+
+    TERRAIN_NAMES = {
+        TerrainType.EMPTY: 'Terrain nu',
+        TerrainType.TREE: 'Arbre',
+        TerrainType.WATER: 'Eau',
+        TerrainType.BURNT: 'Terrain brûlé',
+        TerrainType.BURNING: 'En feu'
+    }
+
+    TERRAIN_ICONS = {
+        TerrainType.EMPTY: '🍂',
+        TerrainType.TREE: '🌳',
+        TerrainType.WATER: '💧',
+        TerrainType.BURNT: '🔥',
+        TerrainType.BURNING: '🟧',
+    }
+
+    # Couleurs des cases atteintes en premier et en dernier avec export_html(arrival=...)
+    ARRIVAL_COLORS = ('#FFFF66', '#8B0000')
+
+    def export_html(self, filename: str = "forest_fire_simulation.html", title: str = "Simulation d'Incendie de Forêt", use_map: bool = False, render: str = "auto", arrival=None):
         """
         Export HTML
+
+        Le document est écrit au fil de l'eau dans le fichier.
+
+        Args:
+            render: "cells" (une case HTML par cellule), "canvas" (grille encodée une fois
+                en base64 et dessinée par un petit script) ou "auto" (canvas au-delà de
+                CANVAS_THRESHOLD cases)
+            arrival: Temps d'arrivée (fire_arrival_times) : les cases atteintes sont
+                colorées du plus tôt (jaune) au plus tard (rouge sombre)
         """
+        if render not in ("auto", "cells", "canvas"):
+            raise ValueError(f"Rendu inconnu: {render}")
+        if render == "auto":
+            render = "canvas" if self.width * self.height > self.CANVAS_THRESHOLD else "cells"
 
         map_to_export = self.map if use_map else self.current_map
        
-        colors = {
-            TerrainType.EMPTY: '#D2B48C',    # terrain nu
-            TerrainType.TREE: '#228B22',     # arbres
-            TerrainType.WATER: '#4169E1',    # l'eau
-            TerrainType.BURNT: '#8B0000'     # terrain brûlé
-        }
-       
-        symbols = {
-            TerrainType.EMPTY: 'Terrain nu',
-            TerrainType.TREE: 'Arbre',
-            TerrainType.WATER: 'Eau',
-            TerrainType.BURNT: 'Terrain brûlé'
-        }
+        total_cells = self.width * self.height
+        stats = self._html_terrain_stats(self._terrain_counts(map_to_export), total_cells)
+
+        levels, max_time = None, 0.0
+        if arrival is not None:
+            levels, max_time = self._arrival_levels(arrival)
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self._html_head(title))
+            if render == "canvas":
+                self._write_html_canvas(f, map_to_export, levels, max_time)
+            else:
+                self._write_html_cells(f, map_to_export, levels, max_time)
+            f.write(self._html_stats(stats, total_cells))
        
+        print(f"Export HTML créé : {filename}")
+        return filename
+
+    def _arrival_levels(self, arrival):
+        """Temps d'arrivée ramenés à des niveaux uint8 0..254 (255 : case non atteinte)"""
+        arrival = np.asarray(arrival, dtype=np.float64)
+        if arrival.shape != (self.height, self.width):
+            raise ValueError("Le raster des temps d'arrivée doit avoir la taille de la carte")
+        reached = np.isfinite(arrival)
+        max_time = float(arrival[reached].max()) if reached.any() else 0.0
+        levels = np.full(arrival.shape, 255, dtype=np.uint8)
+        if max_time > 0:
+            levels[reached] = np.rint(arrival[reached] * (254 / max_time))
+        else:
+            levels[reached] = 0
+        return levels, max_time
+
+    def _arrival_color(self, level: int):
+        start, end = (np.array([int(color[i:i + 2], 16) for i in (1, 3, 5)]) for color in self.ARRIVAL_COLORS)
+        red, green, blue = np.rint(start + (end - start) * level / 254).astype(int)
+        return f"#{red:02X}{green:02X}{blue:02X}"
+
+    def export_html_animation(self, history: FireHistory, filename: str = "forest_fire_animation.html", title: str = "Propagation de l'incendie", delay_ms: int = 100):
+        """
+        Export HTML animé d'un feu simulé par simulate_fire_steps
+
+        Même page que export_html en rendu canvas : la grille initiale est encodée une
+        fois, puis chaque pas ne transporte que ses images différentielles (indices
+        int32 en base64), rejouées dans le navigateur.
+        """
         total_cells = self.width * self.height
-        stats = {}
-        for terrain_type in TerrainType:
-            count = sum(row.count(terrain_type) for row in map_to_export)
-            stats[terrain_type] = {
-                'count': count,
-                'percentage': (count / total_cells) * 100
+        if total_cells >= 2**31:
+            raise ValueError("Carte trop grande pour être animée")
+        final = TerrainGrid(history.state(history.steps))
+        stats = self._html_terrain_stats(self._terrain_counts(final), total_cells)
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self._html_head(title))
+            self._write_html_canvas(f, TerrainGrid(history.initial))
+            self._write_html_frames(f, history, delay_ms)
+            f.write(self._html_stats(stats, total_cells))
+
+        print(f"Export HTML créé : {filename}")
+        return filename
+
+    def _html_terrain_stats(self, counts, total_cells: int):
+        return {
+            terrain_type: {
+                'count': counts[terrain_type],
+                'percentage': (counts[terrain_type] / total_cells) * 100
             }
-       
-        html_content = f"""<!DOCTYPE html>
+            for terrain_type in TerrainType
+        }
+
+    def _html_head(self, title: str):
+        return f"""<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
@@ -167,6 +1254,11 @@ class ForestFireSimulator:
             border: 2px solid #333;
             background-color: #333;
         }}
+        .map-canvas {{
+            border: 2px solid #333;
+            image-rendering: pixelated;
+            max-width: 100%;
+        }}
         .cell {{
             width: 30px;
             height: 30px;
@@ -198,25 +1290,180 @@ class ForestFireSimulator:
     <div class="container">
         <h1>{title}</h1>
        
-        <div class="map-container">
-            <div class="map">"""
-       
-        icons = {
-            TerrainType.EMPTY: '🍂',
-            TerrainType.TREE: '🌳',
-            TerrainType.WATER: '💧',
-            TerrainType.BURNT: '🔥',
-        }
+        <div class="map-container">"""
 
+    def _write_html_cells(self, f, map_to_export, levels=None, max_time: float = 0.0):
+        """Une case HTML avec infobulle par cellule, écrite ligne par ligne"""
+        f.write("""
+            <div class="map">""")
         for y in range(self.height):
-            for x in range(self.width):
-                terrain = map_to_export[y][x]
-                icon = icons[terrain]
-                html_content += f"""
-                <div class="cell" title="({x},{y}) - {symbols[terrain]}"><span>{icon}</span></div>"""
-       
-        html_content += f"""
-            </div>
+            row = map_to_export[y]
+            if levels is None:
+                f.write("".join(
+                    f"""
+                <div class="cell" title="({x},{y}) - {self.TERRAIN_NAMES[terrain]}"><span>{self.TERRAIN_ICONS[terrain]}</span></div>"""
+                    for x, terrain in enumerate(row)
+                ))
+                continue
+            for x, terrain in enumerate(row):
+                level = int(levels[y, x])
+                if level == 255:
+                    f.write(f"""
+                <div class="cell" title="({x},{y}) - {self.TERRAIN_NAMES[terrain]}"><span>{self.TERRAIN_ICONS[terrain]}</span></div>""")
+                else:
+                    f.write(f"""
+                <div class="cell" style="background-color: {self._arrival_color(level)}" title="({x},{y}) - {self.TERRAIN_NAMES[terrain]} - t ≈ {level * max_time / 254:.2f}"><span>{self.TERRAIN_ICONS[terrain]}</span></div>""")
+        f.write("""
+            </div>""")
+
+    def _write_html_canvas(self, f, map_to_export, levels=None, max_time: float = 0.0, chunk_size: int = 3 * 2**16):
+        """
+        Grille encodée une seule fois (octets uint8 en base64) et dessinée sur un <canvas>
+
+        Les octets sont encodés par blocs de taille multiple de 3 pour que les morceaux
+        de base64 se concatènent sans remplissage intermédiaire. Les niveaux de temps
+        d'arrivée, s'il y en a, suivent dans un second bloc de la même forme.
+        """
+        cells = self._grid_array(map_to_export).reshape(-1)
+        palette = {terrain.value: self.TERRAIN_COLORS[terrain] for terrain in TerrainType}
+        names = {terrain.value: self.TERRAIN_NAMES[terrain] for terrain in TerrainType}
+        scale = max(1, min(30, 1200 // max(self.width, 1)))
+        f.write(f"""
+            <div>
+            <canvas id="map" class="map-canvas" width="{self.width}" height="{self.height}" style="width: {self.width * scale}px"></canvas>
+            <div id="cell-info" class="stat-item">&nbsp;</div>
+            <script id="map-data" type="application/octet-stream">""")
+        for start in range(0, cells.size, chunk_size):
+            f.write(base64.b64encode(cells[start:start + chunk_size].tobytes()).decode("ascii"))
+        if levels is not None:
+            f.write("""</script>
+            <script id="arrival-data" type="application/octet-stream">""")
+            levels = levels.reshape(-1)
+            for start in range(0, levels.size, chunk_size):
+                f.write(base64.b64encode(levels[start:start + chunk_size].tobytes()).decode("ascii"))
+        arrival_rgb = [[int(color[i:i + 2], 16) for i in (1, 3, 5)] for color in self.ARRIVAL_COLORS]
+        f.write(f"""</script>
+            <script>
+        (function () {{
+            const width = {self.width}, height = {self.height};
+            const maxTime = {max_time!r}, arrivalColors = {json.dumps(arrival_rgb)};
+            const arrivalData = document.getElementById("arrival-data");
+            const arrival = arrivalData ? atob(arrivalData.textContent.trim()) : null;
+            const palette = {json.dumps(palette)};
+            const names = {json.dumps(names, ensure_ascii=False)};
+            const raw = atob(document.getElementById("map-data").textContent.trim());
+            const cells = new Uint8Array(raw.length);
+            const canvas = document.getElementById("map");
+            const context = canvas.getContext("2d");
+            const image = context.createImageData(width, height);
+            const rgb = {{}};
+            for (const value in palette) {{
+                const hex = palette[value];
+                rgb[value] = [1, 3, 5].map(i => parseInt(hex.substr(i, 2), 16));
+            }}
+            function arrivalColor(level) {{
+                const [start, end] = arrivalColors;
+                return [0, 1, 2].map(k => Math.round(start[k] + (end[k] - start[k]) * level / 254));
+            }}
+            function paint(i) {{
+                const level = arrival ? arrival.charCodeAt(i) : 255;
+                const color = level < 255 ? arrivalColor(level) : rgb[cells[i]];
+                image.data.set([color[0], color[1], color[2], 255], 4 * i);
+            }}
+            for (let i = 0; i < raw.length; i++) {{
+                cells[i] = raw.charCodeAt(i);
+                paint(i);
+            }}
+            context.putImageData(image, 0, 0);
+            // utilisé par l'animation pour repeindre les cases modifiées
+            window.forestMap = {{
+                cells: cells,
+                paint: paint,
+                redraw: () => context.putImageData(image, 0, 0),
+            }};
+            canvas.addEventListener("mousemove", function (event) {{
+                const box = canvas.getBoundingClientRect();
+                const x = Math.floor((event.clientX - box.left) * width / box.width);
+                const y = Math.floor((event.clientY - box.top) * height / box.height);
+                if (x < 0 || y < 0 || x >= width || y >= height) return;
+                const level = arrival ? arrival.charCodeAt(y * width + x) : 255;
+                document.getElementById("cell-info").textContent =
+                    "(" + x + "," + y + ") - " + names[cells[y * width + x]] +
+                    (level < 255 ? " - t ≈ " + (level * maxTime / 254).toFixed(2) : "");
+            }});
+        }})();
+            </script>
+            </div>""")
+
+    def _write_html_frames(self, f, history: FireHistory, delay_ms: int, chunk_size: int = 3 * 2**16):
+        """Images différentielles et script de lecture, après le canvas de _write_html_canvas"""
+        offsets = np.cumsum([0] + [frame.size for frame in history.frames]).tolist()
+        f.write("""
+        <div class="stat-item">
+            <button id="play">Pause</button> <span id="step"></span>
+        </div>
+        <script id="frames-data" type="application/octet-stream">""")
+        if history.frames:
+            data = np.concatenate(history.frames).astype("<i4").tobytes()
+            for start in range(0, len(data), chunk_size):
+                f.write(base64.b64encode(data[start:start + chunk_size]).decode("ascii"))
+        f.write(f"""</script>
+        <script>
+        (function () {{
+            const map = window.forestMap;
+            const initial = map.cells.slice();
+            const offsets = {json.dumps(offsets)};
+            const steps = {history.steps};
+            const burning = {TerrainType.BURNING.value}, burnt = {TerrainType.BURNT.value};
+            const raw = atob(document.getElementById("frames-data").textContent.trim());
+            const bytes = new Uint8Array(raw.length);
+            for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+            const indices = new DataView(bytes.buffer);
+            const label = document.getElementById("step");
+            let step = 0, timer = null;
+
+            function setFrame(frame, value) {{
+                if (frame < 0 || frame + 1 >= offsets.length) return;
+                for (let k = offsets[frame]; k < offsets[frame + 1]; k++) {{
+                    const i = indices.getInt32(4 * k, true);
+                    map.cells[i] = value;
+                    map.paint(i);
+                }}
+            }}
+            function show() {{
+                setFrame(step - 1, burnt);
+                setFrame(step, burning);
+                map.redraw();
+                label.textContent = "Pas " + step + " / " + steps;
+            }}
+            function restart() {{
+                map.cells.set(initial);
+                for (let i = 0; i < initial.length; i++) map.paint(i);
+                step = 0;
+                show();
+            }}
+            function tick() {{
+                if (step >= steps) {{ restart(); return; }}
+                step++;
+                show();
+            }}
+            document.getElementById("play").addEventListener("click", function () {{
+                if (timer === null) {{
+                    timer = setInterval(tick, {int(delay_ms)});
+                    this.textContent = "Pause";
+                }} else {{
+                    clearInterval(timer);
+                    timer = null;
+                    this.textContent = "Lecture";
+                }}
+            }});
+            show();
+            timer = setInterval(tick, {int(delay_ms)});
+        }})();
+        </script>""")
+
+    def _html_stats(self, stats, total_cells: int):
+        html_content = f"""
         </div>
        
         <div class="stats">
@@ -225,7 +1472,7 @@ class ForestFireSimulator:
        
         for terrain_type in TerrainType:
             if stats[terrain_type]['count'] > 0:
-                name = symbols[terrain_type]
+                name = self.TERRAIN_NAMES[terrain_type]
                 count = stats[terrain_type]['count']
                 percentage = stats[terrain_type]['percentage']
                 html_content += f"""
@@ -236,12 +1483,7 @@ class ForestFireSimulator:
     </div>
 </body>
 </html>"""
-       
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-       
-        print(f"Export HTML créé : {filename}")
-        return filename
+        return html_content
    
     def display_map(self, show_burnt=True):
         """Test"""
@@ -257,6 +1499,7 @@ class ForestFireSimulator:
             TerrainType.TREE: '🌳',
             TerrainType.WATER: '💧',
             TerrainType.BURNT: '🔥',
+            TerrainType.BURNING: '🟧',
         }
        
         map_to_show = self.current_map if show_burnt else self.map
@@ -271,10 +1514,11 @@ class ForestFireSimulator:
         print("=" * (self.width + 2))
        
         total_cells = self.width * self.height
-        tree_count = sum(row.count(TerrainType.TREE) for row in map_to_show)
-        water_count = sum(row.count(TerrainType.WATER) for row in map_to_show)
-        empty_count = sum(row.count(TerrainType.EMPTY) for row in map_to_show)
-        burnt_count = sum(row.count(TerrainType.BURNT) for row in map_to_show)
+        counts = self._terrain_counts(map_to_show)
+        tree_count = counts[TerrainType.TREE]
+        water_count = counts[TerrainType.WATER]
+        empty_count = counts[TerrainType.EMPTY]
+        burnt_count = counts[TerrainType.BURNT]
        
         print(f"Statistique:")
         print(f"- Arbres: {tree_count}/{total_cells} ({tree_count/total_cells*100:.1f}%)")
@@ -283,7 +1527,7 @@ class ForestFireSimulator:
         if burnt_count > 0:
             print(f"- Terrain brûlé: {burnt_count}/{total_cells} ({burnt_count/total_cells*100:.1f}%)")
 
-    def apply_smart_n_preventive_cut(self, fire_x: int, fire_y: int, nCase: int):
+    def apply_smart_n_preventive_cut(self, fire_x: int, fire_y: int, nCase: int, mode: str = "exhaustive", workers: int = None):
         """
         Coupe intelligemment jusqu'à n arbres pour limiter la propagation du feu.
 
@@ -291,14 +1535,66 @@ class ForestFireSimulator:
             fire_x: Coordonnée x du départ du feu
             fire_y: Coordonnée y du départ du feu
             nCase: Nombre maximum d'arbres à couper
+            mode: Mode de recherche de chaque coupe (voir apply_smart_preventive_cut) ;
+                "lazy" est un alias de "incremental". Un glouton paresseux à la CELF (tas de
+                bornes supérieures des gains) suppose un gain sous-modulaire, ce que n'est pas
+                le feu : deux coupes peuvent ensemble isoler un massif qu'aucune n'isole seule,
+                et un gain périmé n'est alors plus une borne. IncrementalCutSearch ne
+                réévalue que les candidats dont la coupe précédente a changé le feu, avec le
+                même résultat que le glouton exhaustif
+            workers: Nombre de processus pour évaluer les candidats (voir apply_smart_preventive_cut)
 
         Returns:
             Liste de tuples (x, y, feu_avant, feu_apres) pour chaque coupe effectuée
         """
+        if workers is not None:
+            with self._parallel_evaluator(fire_x, fire_y, mode, workers) as evaluator:
+                return self._apply_n_cuts(nCase, lambda: self._apply_parallel_cut(fire_x, fire_y, evaluator))
+
+        if mode in ("incremental", "lazy"):
+            # composante et résultats par candidat conservés entre les coupes
+            search = self._incremental_search(fire_x, fire_y)
+            return self._apply_n_cuts(nCase, lambda: self._apply_incremental_cut(fire_x, fire_y, search))
+
+        return self._apply_n_cuts(nCase, lambda: self.apply_smart_preventive_cut(fire_x, fire_y, mode=mode))
+
+    def apply_firebreak(self, fire_x: int, fire_y: int, protected=None, budget: int = None):
+        """
+        Coupe un pare-feu minimal, calculé par flot maximum plutôt que coupe par coupe
+
+        Args:
+            protected: Zone à protéger du feu : masque booléen (hauteur, largeur) ou liste de cases (x, y)
+            budget: Nombre maximum d'arbres à couper ; sans zone protégée, la coupe d'au plus
+                budget arbres qui limite le plus le feu est cherchée anneau par anneau autour du départ
+
+        Returns:
+            Tuple (liste des cases (x, y) coupées, feu_avant, feu_apres), ou None si la zone
+            protégée ne peut pas être isolée avec budget arbres
+        """
+        if protected is not None and not isinstance(protected, np.ndarray):
+            mask = np.zeros((self.height, self.width), dtype=bool)
+            for x, y in protected:
+                mask[y, x] = True
+            protected = mask
+        trees = self._trees(self.map)
+        plan = plan_firebreak(trees, fire_x, fire_y, protected, budget, self.topology)
+        if plan is None:
+            print("Aucune coupe dans le budget ne protège la zone.")
+            return None
+        cut, nb_brule_initial, nb_brule_apres = plan
+        cuts = [(int(index % self.width), int(index // self.width)) for index in cut]
+        for x, y in cuts:
+            self.map[y][x] = TerrainType.EMPTY
+        self.reset_map()
+        self.simulate_fire(fire_x, fire_y, engine="component")
+        print(f"Pare-feu: {len(cuts)} arbres coupés, Feu initial: {nb_brule_initial}, Feu après coupe: {nb_brule_apres}")
+        return cuts, nb_brule_initial, nb_brule_apres
+
+    def _apply_n_cuts(self, nCase: int, apply_cut):
         coupes_effectuees = []
 
         for _ in range(nCase):
-            result = self.apply_smart_preventive_cut(fire_x, fire_y)
+            result = apply_cut()
             if result is None:
                 break  # Plus aucune amélioration possible
             x, y, feu_avant, feu_apres = result
@@ -307,54 +1603,155 @@ class ForestFireSimulator:
         return coupes_effectuees
        
 
-    def apply_smart_preventive_cut(self, fire_x: int, fire_y: int):
+    def apply_smart_preventive_cut(self, fire_x: int, fire_y: int, mode: str = "exhaustive", workers: int = None):
         """
         Applique une stratégie intelligente de coupe d'un seul arbre pour limiter la propagation du feu.
        
         Args:
             fire_x: Coordonnée x de départ du feu
             fire_y: Coordonnée y de départ du feu
+            mode: "exhaustive" (simule le feu pour chaque arbre), "dominator"
+                (points d'articulation de la composante du feu, une seule passe) ou
+                "incremental" (candidats limités à la composante du feu) ; "lazy" est
+                un alias de "incremental" (voir apply_smart_n_preventive_cut)
+            workers: Si renseigné, les candidats du mode "exhaustive" sont évalués
+                en parallèle dans ce nombre de processus
            
         Returns:
             Tuple (meilleur_x, meilleur_y, nb_brule_initial, nb_brule_apres) de la meilleure coupe
         """
-        # Carte initiale sans modification
-        self.reset_map()
-        nb_brule_initial = self.simulate_fire(fire_x, fire_y)
-       
-        # Liste des positions d'arbres
-        tree_positions = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if self.map[y][x] == TerrainType.TREE
-        ]
+        if mode not in self.CUT_MODES:
+            raise ValueError(f"Mode de coupe inconnu: {mode}")
+        if workers is not None:
+            with self._parallel_evaluator(fire_x, fire_y, mode, workers) as evaluator:
+                return self._apply_parallel_cut(fire_x, fire_y, evaluator)
+        if mode == "dominator":
+            return self._apply_dominator_cut(fire_x, fire_y)
+        if mode in ("incremental", "lazy"):
+            return self._apply_incremental_cut(fire_x, fire_y, self._incremental_search(fire_x, fire_y))
 
-        best_cut = None
-        min_burnt = nb_brule_initial
+        # Recherche sur des surcouches : ni self.map ni current_map ne sont modifiées
+        result = self.find_best_cut(fire_x, fire_y)
+        if result is None:
+            self.reset_map()
+            self.simulate_fire(fire_x, fire_y)
+            return self._apply_best_cut(fire_x, fire_y, None, 0, 0)
+        x, y, nb_brule_initial, min_burnt = result
+        return self._apply_best_cut(fire_x, fire_y, (x, y), nb_brule_initial, min_burnt)
 
-        for (x, y) in tree_positions:
-            # empecher de couper le départ du feu
-            if (x, y) == (fire_x, fire_y):
-                continue
+    def find_best_cut(self, fire_x: int, fire_y: int, overlay: MapOverlay = None):
+        """
+        Meilleure coupe d'un seul arbre, sans rien modifier : le feu de chaque candidat
+        est simulé dans sa propre surcouche de self.map, et arrêté dès qu'il brûle
+        autant de cases que la meilleure coupe trouvée jusque-là (max_burn)
 
-            # Créer une copie temporaire de la carte
-            temp_map = copy.deepcopy(self.map)
-            temp_map[y][x] = TerrainType.EMPTY  # Couper l'arbre
+        Args:
+            overlay: Surcouche de départ (coupes déjà envisagées), self.map telle quelle par défaut
+
+        Returns:
+            Tuple (meilleur_x, meilleur_y, nb_brule_initial, nb_brule_apres), None si aucune
+            coupe n'améliore la situation
+        """
+        if overlay is None:
+            overlay = self.overlay()
+        baseline = overlay.copy()
+        nb_brule_initial = self.simulate_fire(fire_x, fire_y, overlay=baseline)
+        if nb_brule_initial == 0:
+            return None  # pas d'arbre au départ : aucune coupe ne peut réduire le feu
 
-            # Simuler le feu avec cette carte
-            self.current_map = copy.deepcopy(temp_map)
-            burnt = self.simulate_fire(fire_x, fire_y)
+        # seul un arbre brûlé par le feu initial peut le réduire une fois coupé
+        tree, burnt_value = TerrainType.TREE.value, TerrainType.BURNT.value
+        start = fire_y * self.width + fire_x  # empecher de couper le départ du feu
+        candidates = sorted(index for index, value in baseline.edits.items()
+                            if value == burnt_value and index != start and overlay.get_index(index) == tree)
 
+        best_cut = None
+        min_burnt = nb_brule_initial
+        for y, x in (divmod(index, self.width) for index in candidates):
+            # séparation et évaluation : un candidat est abandonné dès qu'il brûle autant que le meilleur
+            burnt = self._evaluate_cut(fire_x, fire_y, x, y, overlay, max_burn=min_burnt)
             if burnt < min_burnt:
                 min_burnt = burnt
                 best_cut = (x, y)
-       
-        # Réappliquer la meilleure coupe sur la vraie carte
+
+        if best_cut is None:
+            return None
+        return best_cut + (nb_brule_initial, min_burnt)
+
+    def _evaluate_cut(self, fire_x: int, fire_y: int, x: int, y: int, overlay: MapOverlay = None, max_burn: int = None):
+        """
+        Cases brûlées si l'arbre (x, y) est coupé, simulées dans une surcouche
+        (max_burn si le feu atteint cette borne, voir simulate_fire)
+        """
+        overlay = self.overlay() if overlay is None else overlay.copy()
+        overlay.set(x, y, TerrainType.EMPTY.value)  # Couper l'arbre
+        burnt = self.simulate_fire(fire_x, fire_y, overlay=overlay, max_burn=max_burn)
+        self._on_cut_evaluated(x, y, burnt)
+        return burnt
+
+    def _apply_dominator_cut(self, fire_x: int, fire_y: int):
+        """
+        La meilleure coupe est le sommet qui domine le plus d'arbres dans le graphe
+        de la composante du feu (enraciné au départ du feu)
+        """
+        if not (0 <= fire_x < self.width and 0 <= fire_y < self.height):
+            raise ValueError("Position de départ invalide")
+
+        trees = self._trees(self.map)
+        result = best_single_cut(trees, fire_x, fire_y, self.topology)
+        if result is None:
+            self.reset_map()
+            self.simulate_fire(fire_x, fire_y, engine="component")
+            return self._apply_best_cut(fire_x, fire_y, None, 0, 0)
+        x, y, nb_brule_initial, min_burnt = result
+        return self._apply_best_cut(fire_x, fire_y, (x, y), nb_brule_initial, min_burnt, engine="component")
+
+    def _on_cut_evaluated(self, x: int, y: int, burnt: int):
+        self.events.counters["cuts_evaluated"] += 1
+        self.events.emit("cut_evaluated", x=x, y=y, burnt=burnt)
+
+    def _incremental_search(self, fire_x: int, fire_y: int):
+        if not (0 <= fire_x < self.width and 0 <= fire_y < self.height):
+            raise ValueError("Position de départ invalide")
+        return IncrementalCutSearch(self._trees(self.map), fire_x, fire_y, self.topology)
+
+    def _apply_incremental_cut(self, fire_x: int, fire_y: int, search: IncrementalCutSearch):
+        """Meilleure coupe parmi les arbres de la composante du feu uniquement"""
+        result = search.best_cut(self._on_cut_evaluated)
+        if result is None:
+            self.reset_map()
+            self.simulate_fire(fire_x, fire_y, engine="component")
+            return self._apply_best_cut(fire_x, fire_y, None, 0, 0)
+        x, y, nb_brule_initial, min_burnt = result
+        search.cut(x, y)
+        return self._apply_best_cut(fire_x, fire_y, (x, y), nb_brule_initial, min_burnt, engine="component")
+
+    def _parallel_evaluator(self, fire_x: int, fire_y: int, mode: str, workers: int):
+        if mode != "exhaustive":
+            raise ValueError("workers ne s'applique qu'au mode exhaustive")
+        if not (0 <= fire_x < self.width and 0 <= fire_y < self.height):
+            raise ValueError("Position de départ invalide")
+        return ParallelCutEvaluator(self._grid_array(self.map) == TerrainType.TREE.value, workers,
+                                    topology=self.topology)
+
+    def _apply_parallel_cut(self, fire_x: int, fire_y: int, evaluator: ParallelCutEvaluator):
+        result = evaluator.best_cut(fire_x, fire_y)
+        # les processus ne renvoient que leur nombre d'évaluations : compteur sans événement par candidat
+        self.events.counters["cuts_evaluated"] += evaluator.evaluated
+        if result is None:
+            self.reset_map()
+            self.simulate_fire(fire_x, fire_y, engine="component")
+            return self._apply_best_cut(fire_x, fire_y, None, 0, 0)
+        x, y, nb_brule_initial, min_burnt = result
+        evaluator.cut(x, y)
+        return self._apply_best_cut(fire_x, fire_y, (x, y), nb_brule_initial, min_burnt, engine="component")
+
+    def _apply_best_cut(self, fire_x: int, fire_y: int, best_cut, nb_brule_initial: int, min_burnt: int, engine: str = "queue"):
+        """Réapplique la meilleure coupe sur la vraie carte et simule le feu résultant"""
         if best_cut:
             self.map[best_cut[1]][best_cut[0]] = TerrainType.EMPTY
             self.reset_map()
-            self.simulate_fire(fire_x, fire_y)
+            self.simulate_fire(fire_x, fire_y, engine=engine)
             print(f"Meilleure coupe: {best_cut}, Feu initial: {nb_brule_initial}, Feu après coupe: {min_burnt}")
             return best_cut + (nb_brule_initial, min_burnt)
         else:
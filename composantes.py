@@ -0,0 +1,203 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from topologie import _index_dtype, get_topology, topology_for
+
+
+def tree_edges(trees, topology=None):
+    """
+    Retourne les arêtes (u, v) entre arbres voisins, en indices à plat (y * largeur + x)
+
+    Args:
+        trees: tableau booléen 2D, True pour un arbre
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+    """
+    return topology_for(trees.shape, topology).edges(trees)
+
+
+def _compress(parent):
+    """Compression de chemins par sauts de pointeurs : chaque case pointe vers sa racine"""
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def label_components(trees, topology=None):
+    """
+    Étiquette les composantes connexes d'arbres (union-find vectorisé)
+
+    Chaque composante reçoit comme étiquette le plus petit indice à plat de ses cases,
+    le résultat est donc canonique. Les cases sans arbre valent -1.
+
+    Args:
+        trees: tableau booléen 2D, True pour un arbre
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+
+    Returns:
+        Tableau 2D d'étiquettes de même forme que trees
+    """
+    trees = np.asarray(trees, dtype=bool)
+    parent = np.arange(trees.size, dtype=_index_dtype(trees.size))
+    u, v = tree_edges(trees, topology)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        u, v, pu, pv = u[differ], v[differ], pu[differ], pv[differ]
+        if not u.size:
+            break
+        # rattache la plus grande racine à la plus petite
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        parent = _compress(parent)
+    return np.where(trees.ravel(), parent, -1).reshape(trees.shape)
+
+
+def _label_strip(task):
+    """Étiquette les lignes [y0, y1) de la grille partagée, en indices globaux"""
+    trees_name, labels_name, shape, dtype, y0, y1, connectivity = task
+    trees_shm = shared_memory.SharedMemory(name=trees_name)
+    labels_shm = shared_memory.SharedMemory(name=labels_name)
+    try:
+        trees = np.ndarray(shape, dtype=bool, buffer=trees_shm.buf)
+        labels = np.ndarray(shape, dtype=dtype, buffer=labels_shm.buf)
+        # bande bornée : les arêtes qui sortent de la bande sont ajoutées à la fusion
+        strip = label_components(trees[y0:y1], get_topology(shape[1], y1 - y0, connectivity))
+        offset = y0 * shape[1]
+        labels[y0:y1] = np.where(strip >= 0, strip + offset, -1)
+        del trees, labels
+    finally:
+        trees_shm.close()
+        labels_shm.close()
+
+
+def _merge_strips(labels, trees, bounds, topology):
+    """
+    Fusionne les étiquettes reliées par les arêtes absentes des bandes : celles qui
+    franchissent une frontière et, sur un tore, celles qui font le tour de la grille
+
+    Union-find vectorisé sur les seules étiquettes concernées : chaque groupe prend
+    la plus petite étiquette, comme l'étiquetage séquentiel.
+    """
+    height, width = labels.shape
+    rows = {y for boundary in bounds[1:-1] for y in (boundary - 1, boundary)}
+    if topology.wrap:
+        rows |= {0, height - 1}
+    rows = np.array(sorted(rows), dtype=np.int64)
+    cells = (rows[:, None] * width + np.arange(width)).ravel()
+    if topology.wrap:
+        columns = np.arange(height)[:, None] * width + np.array([0, width - 1])
+        cells = np.union1d(cells, columns.ravel())
+    flat_trees = trees.reshape(-1)
+    cells = cells[flat_trees[cells]]
+    neighbours = topology.neighbour_indices(cells)
+    # même voisinage sans repli : une arête qui n'y existe pas fait le tour de la grille
+    # (comparaison direction par direction, valable même pour une largeur de 2)
+    bounded = get_topology(width, height, topology.connectivity).neighbour_indices(cells)
+    sources = np.broadcast_to(cells, neighbours.shape)
+    ok = neighbours >= 0
+    ok[ok] = flat_trees[neighbours[ok]]
+    sources, targets, wrapped = sources[ok], neighbours[ok], bounded[ok] != neighbours[ok]
+    strip_of = np.searchsorted(bounds, np.arange(height), side="right")
+    crossing = (strip_of[sources // width] != strip_of[targets // width]) | wrapped
+    flat_labels = labels.reshape(-1)
+    above, below = flat_labels[sources[crossing]], flat_labels[targets[crossing]]
+    if not above.size:
+        return labels
+    keys, pairs = np.unique(np.concatenate([above, below]), return_inverse=True)
+    u, v = pairs[:above.size], pairs[above.size:]
+    # les clés sont triées : le plus petit indice local porte la plus petite étiquette
+    parent = np.arange(keys.size)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        u, v, pu, pv = u[differ], v[differ], pu[differ], pv[differ]
+        if not u.size:
+            break
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        parent = _compress(parent)
+    roots = keys[parent]
+    flat = labels.reshape(-1)
+    position = np.searchsorted(keys, flat)
+    position[position == keys.size] = 0
+    touched = keys[position] == flat
+    flat[touched] = roots[position[touched]]
+    return labels
+
+
+def label_components_parallel(trees, workers: int, strips: int = None, topology=None):
+    """
+    Étiquetage par décomposition en bandes horizontales, une bande par tâche
+
+    Les bandes sont étiquetées dans un pool de processus à partir d'une grille en
+    mémoire partagée, puis les équivalences aux frontières sont fusionnées par
+    union-find. Le résultat est identique, bit à bit, à label_components.
+
+    Args:
+        workers: Nombre de processus
+        strips: Nombre de bandes (workers par défaut)
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+    """
+    trees = np.asarray(trees, dtype=bool)
+    height, width = trees.shape
+    topology = topology_for(trees.shape, topology)
+    strips = max(1, min(strips or workers, height // 2))
+    if workers <= 1 or strips == 1 or trees.size == 0:
+        return label_components(trees, topology)
+
+    dtype = _index_dtype(trees.size)
+    trees_shm = shared_memory.SharedMemory(create=True, size=trees.size)
+    labels_shm = shared_memory.SharedMemory(create=True, size=trees.size * np.dtype(dtype).itemsize)
+    try:
+        shared_trees = np.ndarray(trees.shape, dtype=bool, buffer=trees_shm.buf)
+        shared_trees[:] = trees
+        # frontières sur des lignes paires : la parité des lignes hexagonales est conservée
+        bounds = sorted({2 * (y // 2) for y in np.linspace(0, height, strips + 1).astype(int).tolist()[:-1]} | {height})
+        tasks = [(trees_shm.name, labels_shm.name, trees.shape, dtype, y0, y1, topology.connectivity)
+                 for y0, y1 in zip(bounds, bounds[1:])]
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_label_strip, tasks))
+        labels = np.ndarray(trees.shape, dtype=dtype, buffer=labels_shm.buf).copy()
+        del shared_trees
+    finally:
+        trees_shm.close()
+        trees_shm.unlink()
+        labels_shm.close()
+        labels_shm.unlink()
+    return _merge_strips(labels, trees, bounds, topology)
+
+
+def _labels(trees, workers: int = None, topology=None):
+    if workers:
+        return label_components_parallel(trees, workers, topology=topology)
+    return label_components(trees, topology)
+
+
+def component_mask(trees, x: int, y: int, workers: int = None, topology=None):
+    """Masque booléen de la composante d'arbres contenant la case (x, y)"""
+    labels = _labels(trees, workers, topology)
+    if labels[y, x] < 0:
+        return np.zeros(labels.shape, dtype=bool)
+    return labels == labels[y, x]
+
+
+def burn_size_raster(trees, workers: int = None, topology=None):
+    """
+    Nombre de cases brûlées si le feu part de chaque case (0 hors arbre)
+
+    Args:
+        workers: Si renseigné, étiquetage parallèle par bandes (label_components_parallel)
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+
+    Returns:
+        (raster, tailles) : raster 2D des tailles de feu et tableau des tailles
+        de composantes indexé par étiquette
+    """
+    labels = _labels(trees, workers, topology).ravel()
+    is_tree = labels >= 0
+    sizes = np.bincount(labels[is_tree], minlength=labels.size)
+    raster = np.zeros(labels.size, dtype=np.int64)
+    raster[is_tree] = sizes[labels[is_tree]]
+    return raster.reshape(np.shape(trees)), sizes
@@ -0,0 +1,292 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from composantes import component_mask, tree_edges
+from creuse import SparseForest
+from topologie import topology_for
+
+
+def component_graph(trees, start_x: int, start_y: int, topology=None):
+    """
+    Graphe de voisinage de la composante d'arbres contenant (start_x, start_y)
+
+    Args:
+        trees: Masque booléen des arbres ou SparseForest
+
+    Returns:
+        (cells, indptr, indices) : indices à plat des cases de la composante (triés),
+        et adjacence au format CSR en indices locaux ; None si le départ n'est pas un arbre
+    """
+    if isinstance(trees, SparseForest):
+        return trees.component_graph(start_x, start_y, topology)
+    trees = np.asarray(trees, dtype=bool)
+    if not trees[start_y, start_x]:
+        return None
+    component = component_mask(trees, start_x, start_y, topology=topology)
+    cells = np.flatnonzero(component)
+    local = np.full(trees.size, -1, dtype=np.int64)
+    local[cells] = np.arange(cells.size)
+
+    u, v = tree_edges(component, topology)
+    u, v = local[u], local[v]
+    sources = np.concatenate([u, v])
+    targets = np.concatenate([v, u])
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(cells.size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=cells.size), out=indptr[1:])
+    return cells, indptr, targets[order]
+
+
+def separated_counts(indptr, indices, root: int):
+    """
+    Pour chaque sommet v, nombre de sommets (v compris) que la suppression de v
+    sépare de la racine : v domine exactement ces sommets.
+
+    Parcours en profondeur itératif (points d'articulation de Tarjan) : la suppression
+    de v isole le sous-arbre de chaque enfant c tel que low[c] >= disc[v].
+    """
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    n = len(indptr) - 1
+    disc = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    size = [1] * n
+    separated = [1] * n
+    next_edge = indptr[:-1]
+
+    disc[root] = 0
+    timer = 1
+    stack = [root]
+    while stack:
+        v = stack[-1]
+        i = next_edge[v]
+        if i < indptr[v + 1]:
+            next_edge[v] = i + 1
+            w = indices[i]
+            if disc[w] == -1:
+                parent[w] = v
+                disc[w] = low[w] = timer
+                timer += 1
+                stack.append(w)
+            elif w != parent[v] and disc[w] < low[v]:
+                low[v] = disc[w]
+        else:
+            stack.pop()
+            p = parent[v]
+            if p >= 0:
+                size[p] += size[v]
+                if low[v] < low[p]:
+                    low[p] = low[v]
+                if low[v] >= disc[p]:
+                    separated[p] += size[v]
+    separated[root] = 0
+    return separated
+
+
+def best_single_cut(trees, start_x: int, start_y: int, topology=None):
+    """
+    Meilleure coupe d'un seul arbre, calculée en une passe sur la composante du feu
+
+    En cas d'égalité, la première case dans l'ordre de lecture (y puis x) est retenue,
+    comme pour la recherche exhaustive.
+
+    Returns:
+        Tuple (x, y, nb_brule_initial, nb_brule_apres), ou None si aucune coupe n'améliore
+    """
+    graph = component_graph(trees, start_x, start_y, topology)
+    if graph is None:
+        return None
+    cells, indptr, indices = graph
+    if cells.size <= 1:
+        return None
+    width = trees.shape[1]
+    root = int(np.searchsorted(cells, start_y * width + start_x))
+    separated = separated_counts(indptr, indices, root)
+    # les cases sont triées dans l'ordre de lecture : max garde la première à égalité
+    best = max(range(len(separated)), key=separated.__getitem__)
+    y, x = divmod(int(cells[best]), width)
+    return x, y, int(cells.size), int(cells.size) - separated[best]
+
+
+class IncrementalCutSearch:
+    """
+    Recherche de coupes restreinte à la composante du feu, conservée d'une coupe à l'autre
+
+    Pour chaque candidat v on garde le nombre de cases brûlées si v est coupé et
+    l'ensemble des cases que cette coupe retire au feu. Après la coupe c, le résultat
+    de v reste exact si c faisait partie des cases retirées par v : seuls les candidats
+    dont la zone brûlée contenait c sont réévalués.
+    """
+
+    def __init__(self, trees, start_x: int, start_y: int, topology=None):
+        self.width = trees.shape[1]
+        graph = component_graph(trees, start_x, start_y, topology)
+        if graph is None:
+            self.cells = np.empty(0, dtype=np.int64)
+            self.neighbours = []
+            self.root = -1
+        else:
+            self.cells, indptr, indices = graph
+            indices = indices.tolist()
+            indptr = indptr.tolist()
+            self.neighbours = [indices[indptr[i]:indptr[i + 1]] for i in range(self.cells.size)]
+            self.root = int(np.searchsorted(self.cells, start_y * self.width + start_x))
+        self.alive = bytearray([1]) * self.cells.size
+        self.size = int(self.cells.size)
+        # candidat -> (nb_brule_apres_coupe, cases retirées au feu)
+        self.results = {}
+
+    def _burn(self, removed: int, with_lost: bool = True):
+        """Feu dans la composante courante privée de la case removed"""
+        todo = bytearray(self.alive)
+        todo[removed] = 0
+        todo[self.root] = 0
+        stack = [self.root]
+        burnt = 1
+        neighbours = self.neighbours
+        while stack:
+            v = stack.pop()
+            for w in neighbours[v]:
+                if todo[w]:
+                    todo[w] = 0
+                    stack.append(w)
+                    burnt += 1
+        if burnt == self.size - 1 or not with_lost:
+            return burnt, frozenset()
+        return burnt, frozenset(i for i, left in enumerate(todo) if left)
+
+    def best_cut(self, on_evaluated=None):
+        """
+        Args:
+            on_evaluated: Appelé avec (x, y, nb_brule) pour chaque candidat (ré)évalué
+
+        Returns:
+            Tuple (x, y, nb_brule_initial, nb_brule_apres), ou None si aucune coupe n'améliore
+        """
+        if self.size <= 1:
+            return None
+        best = None
+        for v in range(self.cells.size):
+            if not self.alive[v] or v == self.root:
+                continue
+            if v not in self.results:
+                self.results[v] = self._burn(v)
+                if on_evaluated is not None:
+                    y, x = divmod(int(self.cells[v]), self.width)
+                    on_evaluated(x, y, self.results[v][0])
+            if best is None or self.results[v][0] < self.results[best][0]:
+                best = v
+        y, x = divmod(int(self.cells[best]), self.width)
+        return x, y, self.size, self.results[best][0]
+
+    def cut(self, x: int, y: int):
+        """Applique la coupe (x, y) et ne garde que les résultats encore valides"""
+        cut = int(np.searchsorted(self.cells, y * self.width + x))
+        burnt, lost = self.results.pop(cut) if cut in self.results else self._burn(cut)
+        self.alive[cut] = 0
+        for v in lost:
+            self.alive[v] = 0
+        self.size = burnt
+        for v in list(self.results):
+            v_burnt, v_lost = self.results[v]
+            if not self.alive[v] or cut not in v_lost:
+                del self.results[v]
+            elif lost:
+                self.results[v] = (v_burnt, v_lost - lost)
+
+
+# État des processus de calcul : grille partagée et graphe de la composante du feu
+_WORKER = {}
+
+
+def _init_worker(shm_name: str, shape, topology):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER["shm"] = shm
+    _WORKER["trees"] = np.ndarray(shape, dtype=bool, buffer=shm.buf)
+    _WORKER["topology"] = topology
+    _WORKER["key"] = None
+
+
+def _evaluate_chunk(task):
+    """Meilleur (nb_brule, candidat) parmi les candidats locaux [lo, hi), et nombre de candidats évalués"""
+    generation, start_x, start_y, lo, hi = task
+    key = (generation, start_x, start_y)
+    if _WORKER["key"] != key:
+        _WORKER["search"] = IncrementalCutSearch(_WORKER["trees"], start_x, start_y, _WORKER["topology"])
+        _WORKER["key"] = key
+    search = _WORKER["search"]
+    best = None
+    evaluated = 0
+    for v in range(lo, hi):
+        if v == search.root:
+            continue
+        burnt = search._burn(v, with_lost=False)[0]
+        evaluated += 1
+        if best is None or burnt < best[0]:
+            best = (burnt, v)
+    return best, evaluated
+
+
+class ParallelCutEvaluator:
+    """
+    Évaluation des candidats à la coupe dans un pool de processus
+
+    La grille d'arbres est placée une seule fois en mémoire partagée ; chaque tâche ne
+    transporte qu'un intervalle de candidats. Le gagnant est le plus petit
+    (nb_brule, ordre de lecture), comme pour la recherche séquentielle. Après chaque
+    appel à best_cut, evaluated est le nombre de candidats évalués par les processus.
+    """
+
+    def __init__(self, trees, workers: int, chunks_per_worker: int = 4, topology=None):
+        if workers < 1:
+            raise ValueError("Le nombre de processus doit être positif")
+        trees = np.asarray(trees, dtype=bool)
+        self.topology = topology_for(trees.shape, topology)
+        self.workers = workers
+        self.chunks_per_worker = chunks_per_worker
+        self.generation = 0
+        self.evaluated = 0
+        self._shm = shared_memory.SharedMemory(create=True, size=max(trees.size, 1))
+        self.trees = np.ndarray(trees.shape, dtype=bool, buffer=self._shm.buf)
+        self.trees[:] = trees
+        self._pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self._shm.name, trees.shape, self.topology))
+
+    def best_cut(self, start_x: int, start_y: int):
+        """
+        Returns:
+            Tuple (x, y, nb_brule_initial, nb_brule_apres), ou None si aucune coupe n'améliore
+        """
+        self.evaluated = 0
+        if not self.trees[start_y, start_x]:
+            return None
+        cells = np.flatnonzero(component_mask(self.trees, start_x, start_y, topology=self.topology))
+        if cells.size <= 1:
+            return None
+        chunks = min(cells.size, self.workers * self.chunks_per_worker)
+        bounds = np.linspace(0, cells.size, chunks + 1).astype(int).tolist()
+        tasks = [(self.generation, start_x, start_y, lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+        chunk_results = list(self._pool.map(_evaluate_chunk, tasks))
+        self.evaluated = sum(evaluated for _, evaluated in chunk_results)
+        burnt, best = min(result for result, _ in chunk_results if result is not None)
+        y, x = divmod(int(cells[best]), self.trees.shape[1])
+        return x, y, int(cells.size), burnt
+
+    def cut(self, x: int, y: int):
+        """Coupe l'arbre (x, y) dans la grille partagée"""
+        self.trees[y, x] = False
+        self.generation += 1
+
+    def close(self):
+        self._pool.shutdown()
+        del self.trees
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,84 @@
+import numpy as np
+
+from topologie import topology_for
+
+
+def sorted_lookup(sorted_indices, indices):
+    """Position de chaque indice dans le tableau trié sorted_indices, -1 s'il n'y est pas"""
+    indices = np.asarray(indices, dtype=np.int64)
+    if not sorted_indices.size:
+        return np.full(indices.shape, -1, dtype=np.int64)
+    position = np.minimum(np.searchsorted(sorted_indices, indices), sorted_indices.size - 1)
+    return np.where(sorted_indices[position] == indices, position, -1)
+
+
+class SparseForest:
+    """
+    Forêt clairsemée : seuls les indices à plat (triés) des arbres sont stockés
+
+    S'utilise à la place d'un masque booléen d'arbres dans coupes et pare_feu : le feu
+    et les graphes de composante sont calculés par recherche dichotomique dans les
+    arbres, en mémoire et en temps proportionnels au nombre d'arbres, pas à la surface.
+    """
+    __slots__ = ("cells", "shape")
+
+    def __init__(self, cells, shape):
+        self.cells = np.asarray(cells, dtype=np.int64)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_mask(cls, trees):
+        trees = np.asarray(trees, dtype=bool)
+        return cls(np.flatnonzero(trees), trees.shape)
+
+    def __len__(self):
+        return int(self.cells.size)
+
+    def to_mask(self):
+        trees = np.zeros(self.shape, dtype=bool)
+        trees.reshape(-1)[self.cells] = True
+        return trees
+
+    def component(self, start_x: int, start_y: int, topology=None, limit: int = None):
+        """
+        Indices à plat (triés) des arbres de la composante de (start_x, start_y), vide si ce n'est pas un arbre
+
+        Parcours en largeur vectorisé : à chaque niveau, les voisins du front sont
+        cherchés parmi les arbres en O(front * log(arbres)). Avec limit, le parcours
+        s'arrête dès que limit arbres sont atteints (les plus proches du départ).
+        """
+        topology = topology_for(self.shape, topology)
+        start = sorted_lookup(self.cells, [start_y * self.shape[1] + start_x])
+        if start[0] < 0:
+            return np.zeros(0, dtype=np.int64)
+        visited = np.zeros(self.cells.size, dtype=bool)
+        visited[start] = True
+        front = start
+        remaining = self.cells.size if limit is None else limit - 1
+        while front.size and remaining > 0:
+            neighbours = sorted_lookup(self.cells, topology.neighbour_indices(self.cells[front]).reshape(-1))
+            neighbours = np.unique(neighbours[neighbours >= 0])
+            front = neighbours[~visited[neighbours]][:remaining]
+            visited[front] = True
+            remaining -= front.size
+        return self.cells[visited]
+
+    def component_graph(self, start_x: int, start_y: int, topology=None):
+        """Même résultat que coupes.component_graph, sans grille dense"""
+        topology = topology_for(self.shape, topology)
+        cells = self.component(start_x, start_y, topology)
+        if not cells.size:
+            return None
+        neighbours = sorted_lookup(cells, topology.neighbour_indices(cells))
+        sources = np.broadcast_to(np.arange(cells.size), neighbours.shape)
+        keep = neighbours >= 0
+        sources, targets = sources[keep], neighbours[keep]
+        if topology.wrap and min(self.shape) <= 2:
+            # petite grille torique : un voisin peut être atteint dans deux directions
+            keep = sources != targets
+            pairs = np.unique(np.stack([sources[keep], targets[keep]]), axis=1)
+            sources, targets = pairs[0], pairs[1]
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(cells.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=cells.size), out=indptr[1:])
+        return cells, indptr, targets[order]
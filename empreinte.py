@@ -0,0 +1,135 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+_MASK = (1 << 64) - 1
+# graine des clés de Zobrist : les empreintes sont les mêmes d'une exécution à l'autre
+_SALT = 0x5F3759DF
+
+
+def splitmix64(values):
+    """Mélange splitmix64, vectorisé sur un tableau d'entiers (uint64, modulo 2**64)"""
+    z = np.asarray(values, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def zobrist_hash(indices):
+    """
+    XOR des clés de Zobrist des cases d'indices à plat donnés
+
+    La clé d'une case est splitmix64(indice) : aucune table par case n'est stockée. Basculer
+    une case (arbre <-> autre) revient à combiner son unique clé par XOR à l'empreinte.
+    """
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    if indices.size == 0:
+        return 0
+    return int(np.bitwise_xor.reduce(splitmix64(indices.astype(np.uint64) + np.uint64(_SALT))))
+
+
+def tree_fingerprint(trees):
+    """Empreinte 64 bits d'un masque d'arbres : XOR des clés des cases d'arbres"""
+    return zobrist_hash(np.flatnonzero(trees))
+
+
+class FireRecord:
+    """
+    Cases brûlées par un feu, telles que mémorisées dans un FireCache
+
+    Args:
+        cells: Indices à plat des cases brûlées
+        complete: False si le feu a été arrêté par max_burn : cells n'en est que le début,
+            et le feu complet brûle au moins len(cells) cases
+        ordered: True si cells est dans l'ordre de propagation de la file, le début de
+            cells est alors le feu arrêté par une borne plus petite
+    """
+    __slots__ = ("cells", "complete", "ordered")
+
+    def __init__(self, cells, complete: bool = True, ordered: bool = True):
+        self.cells = cells
+        self.complete = complete
+        self.ordered = ordered
+
+    def burnt(self, max_burn: int = None):
+        """Cases brûlées par le même feu arrêté à max_burn, None si l'enregistrement ne suffit pas"""
+        if max_burn is not None and max_burn < len(self.cells):
+            return self.cells[:max_burn] if self.ordered else None
+        if self.complete or max_burn == len(self.cells):
+            return self.cells
+        return None
+
+
+class FireCache:
+    """
+    Cache LRU borné de résultats de feux, indexé par (empreinte des arbres, x, y)
+
+    Le feu ne dépend que des cases d'arbres : deux cartes avec les mêmes arbres donnent le
+    même feu quel que soit le reste du terrain. Les empreintes font 64 bits, une collision
+    entre deux cartes différentes reste possible mais très improbable.
+    Les accès sont protégés par un verrou : des requêtes sur surcouches peuvent partager
+    le cache depuis plusieurs threads.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError("La capacité du cache doit être strictement positive")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, select=None):
+        """
+        Résultat mémorisé pour key (le plus récemment utilisé), None s'il est absent
+
+        Args:
+            select: Fonction appliquée au résultat mémorisé ; s'il n'en tire rien (None),
+                l'accès compte comme un échec
+        """
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None and select is not None:
+                value = select(value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key):
+        """Résultat mémorisé pour key, sans compter l'accès ni le marquer comme récent"""
+        with self._lock:
+            return self.entries.get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]  # un verrou ne se copie pas
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries), "capacity": self.capacity}
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,67 @@
+import logging
+from collections import Counter
+
+# Événements publiés par ForestFireSimulator
+EVENTS = ("ignition", "cell_burnt", "fire_finished", "cut_evaluated")
+
+
+class FireEvents:
+    """
+    Abonnements aux événements de la simulation et compteurs
+
+    Sans abonné, publier un événement dans une boucle se réduit au test d'une liste vide :
+    les boucles chaudes testent listeners[event] avant d'appeler emit.
+    Les abonnés sont appelés avec callback(event, **données).
+    """
+
+    def __init__(self):
+        self.listeners = {event: [] for event in EVENTS}
+        self.counters = Counter()
+
+    def subscribe(self, event: str, callback):
+        if event not in self.listeners:
+            raise ValueError(f"Événement inconnu: {event}")
+        self.listeners[event].append(callback)
+        return callback
+
+    def unsubscribe(self, event: str, callback):
+        if event not in self.listeners:
+            raise ValueError(f"Événement inconnu: {event}")
+        self.listeners[event].remove(callback)
+
+    def emit(self, event: str, **data):
+        for callback in self.listeners[event]:
+            callback(event, **data)
+
+
+class LoggingAdapter:
+    """Relaie les événements de la simulation vers un logger du module logging"""
+
+    MESSAGES = {
+        "ignition": "Début de l'incendie à la position ({x}, {y})",
+        "no_tree": "Pas d'arbre à brûler à la position ({x}, {y})",
+        "cell_burnt": "Case brûlée: ({x}, {y}) - Total: {total}",
+        "fire_finished": "Incendie terminé - Total de cases brûlées: {burnt}",
+        "cut_evaluated": "Coupe évaluée: ({x}, {y}) - Cases brûlées: {burnt}",
+    }
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("feu_foret")
+        self.level = level
+
+    def __call__(self, event: str, **data):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        if event == "ignition" and not data["burning"]:
+            event = "no_tree"
+        self.logger.log(self.level, self.MESSAGES[event].format(**data))
+
+    def attach(self, events: FireEvents, names=EVENTS):
+        for event in names:
+            events.subscribe(event, self)
+        return self
+
+    def detach(self, events: FireEvents):
+        for event, callbacks in events.listeners.items():
+            if self in callbacks:
+                callbacks.remove(self)
@@ -0,0 +1,103 @@
+import struct
+
+import numpy as np
+
+# En-tête de 64 octets, petit-boutiste :
+# magique, version, compactage, nombre de couches, largeur, hauteur, graine présente, graine (128 bits)
+MAGIC = b"FFMP"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBIIB16s")
+HEADER_SIZE = 64
+
+PACKINGS = {"uint8": 0, "2bit": 1}
+
+
+def _layer_size(width: int, height: int, packing: str):
+    cells = width * height
+    return cells if packing == "uint8" else (cells + 3) // 4
+
+
+def _pack_2bit(cells):
+    flat = np.ascontiguousarray(cells, dtype=np.uint8).reshape(-1)
+    if flat.size and flat.max() > 3:
+        raise ValueError("Le compactage 2 bits ne stocke que les valeurs 0 à 3")
+    padded = np.zeros((flat.size + 3) // 4 * 4, dtype=np.uint8)
+    padded[:flat.size] = flat
+    quads = padded.reshape(-1, 4)
+    return quads[:, 0] | (quads[:, 1] << 2) | (quads[:, 2] << 4) | (quads[:, 3] << 6)
+
+
+def _unpack_2bit(packed, width: int, height: int):
+    quads = np.empty((packed.size, 4), dtype=np.uint8)
+    for shift in range(4):
+        quads[:, shift] = (packed >> (2 * shift)) & 3
+    return quads.reshape(-1)[:width * height].reshape(height, width)
+
+
+def write_map_file(filename: str, layers, seed=None, packing: str = "uint8"):
+    """
+    Écrit une ou deux couches (map, current_map) dans le format binaire
+
+    Args:
+        layers: Tableaux uint8 hauteur x largeur de même forme
+        seed: Graine de la carte (entier positif sur 128 bits au plus) ou None
+        packing: "uint8" (une case par octet, chargeable par memory-map) ou "2bit"
+    """
+    if packing not in PACKINGS:
+        raise ValueError(f"Compactage inconnu: {packing}")
+    if not 1 <= len(layers) <= 2:
+        raise ValueError("Le fichier contient une ou deux couches")
+    height, width = np.shape(layers[0])
+    header = HEADER.pack(MAGIC, VERSION, PACKINGS[packing], len(layers), width, height,
+                         seed is not None, (seed or 0).to_bytes(16, "little"))
+    with open(filename, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for layer in layers:
+            if np.shape(layer) != (height, width):
+                raise ValueError("Les couches doivent avoir la même taille")
+            if packing == "2bit":
+                f.write(_pack_2bit(layer).tobytes())
+            else:
+                f.write(np.ascontiguousarray(layer, dtype=np.uint8).tobytes())
+
+
+def read_map_file(filename: str, mmap: bool = True):
+    """
+    Lit un fichier de carte binaire
+
+    En compactage uint8 et avec mmap=True, les couches sont projetées en mémoire en
+    copie sur écriture : l'ouverture est immédiate, les pages sont partagées entre
+    processus et les modifications ne touchent pas le fichier.
+
+    Returns:
+        Dictionnaire width, height, seed, version et layers (liste de tableaux uint8)
+    """
+    with open(filename, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER.size:
+        raise ValueError("Fichier de carte tronqué")
+    magic, version, packing_code, layer_count, width, height, has_seed, seed = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas une carte")
+    if version != VERSION:
+        raise ValueError(f"Version de carte non gérée: {version}")
+    packing = {code: name for name, code in PACKINGS.items()}[packing_code]
+    size = _layer_size(width, height, packing)
+
+    layers = []
+    for index in range(layer_count):
+        offset = HEADER_SIZE + index * size
+        if packing == "uint8" and mmap and size:
+            layers.append(np.memmap(filename, dtype=np.uint8, mode="c", offset=offset, shape=(height, width)))
+            continue
+        data = np.fromfile(filename, dtype=np.uint8, count=size, offset=offset)
+        if data.size != size:
+            raise ValueError("Fichier de carte tronqué")
+        layers.append(_unpack_2bit(data, width, height) if packing == "2bit" else data.reshape(height, width))
+    return {
+        "width": width,
+        "height": height,
+        "seed": int.from_bytes(seed, "little") if has_seed else None,
+        "version": version,
+        "layers": layers,
+    }
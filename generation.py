@@ -0,0 +1,138 @@
+import math
+
+import numpy as np
+
+# Nombre de lignes tirées par bloc : chaque bloc a son propre flux aléatoire, la carte
+# obtenue pour une graine ne dépend donc pas de la façon dont on la découpe
+BLOCK_ROWS = 256
+
+EMPTY, TREE, WATER = 0, 1, 2
+
+# Approximation de erf d'Abramowitz et Stegun (7.1.26), erreur < 1.5e-7
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def seed_sequence(seed=None):
+    """
+    SeedSequence racine à partir d'un entier, d'une SeedSequence ou d'un Generator
+
+    Returns:
+        (SeedSequence, graine entière permettant de reproduire la carte)
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        sequence = seed
+    elif isinstance(seed, np.random.Generator):
+        sequence = np.random.SeedSequence(int(seed.integers(2**63)))
+    else:
+        sequence = np.random.SeedSequence(seed)
+    return sequence, sequence.entropy
+
+
+def _normal_cdf(z):
+    """Fonction de répartition de la loi normale centrée réduite (vectorisée)"""
+    x = np.abs(z) / math.sqrt(2)
+    t = 1.0 / (1.0 + _ERF_P * x)
+    poly = t * (_ERF_A[0] + t * (_ERF_A[1] + t * (_ERF_A[2] + t * (_ERF_A[3] + t * _ERF_A[4]))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def _box_sum(values, radius: int, axis: int):
+    """Somme sur une fenêtre glissante de largeur 2 * radius + 1, tronquée aux bords"""
+    values = np.moveaxis(values, axis, -1)
+    cumulative = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.float64)
+    np.cumsum(values, axis=-1, out=cumulative[..., 1:])
+    n = values.shape[-1]
+    upper = np.minimum(np.arange(n) + radius + 1, n)
+    lower = np.maximum(np.arange(n) - radius, 0)
+    return np.moveaxis(cumulative[..., upper] - cumulative[..., lower], -1, axis)
+
+
+def _window_counts(n: int, radius: int):
+    index = np.arange(n)
+    return np.minimum(index + radius + 1, n) - np.maximum(index - radius, 0)
+
+
+class _SmoothedField:
+    """
+    Bruit gaussien lissé par une moyenne glissante puis ramené à une loi uniforme
+
+    Les blocs de bruit sont tirés une seule fois et gardés sur une fenêtre de trois
+    blocs, pour lisser à travers les frontières entre blocs.
+    """
+
+    def __init__(self, sequences, width: int, heights, radius: int):
+        self.sequences = sequences
+        self.width = width
+        self.heights = heights
+        self.radius = radius
+        self.noise = {}
+        self.column_counts = _window_counts(width, radius)
+        self.row_counts = _window_counts(sum(heights), radius)
+
+    def _block(self, index: int):
+        if index not in self.noise:
+            rng = np.random.default_rng(self.sequences[index])
+            self.noise[index] = rng.standard_normal((self.heights[index], self.width), dtype=np.float32)
+        return self.noise[index]
+
+    def uniform(self, index: int, y0: int):
+        r = self.radius
+        above = self._block(index - 1)[-r:] if index > 0 else np.empty((0, self.width), np.float32)
+        below = self._block(index + 1)[:r] if index + 1 < len(self.heights) else np.empty((0, self.width), np.float32)
+        block = self._block(index)
+        self.noise.pop(index - 1, None)
+        stacked = np.concatenate([above, block, below])
+        sums = _box_sum(_box_sum(stacked, r, axis=1), r, axis=0)[len(above):len(above) + len(block)]
+        counts = np.outer(self.row_counts[y0:y0 + len(block)], self.column_counts)
+        # la moyenne de k gaussiennes indépendantes, multipliée par sqrt(k), est N(0, 1)
+        return _normal_cdf(sums / np.sqrt(counts))
+
+
+def iter_terrain_blocks(width: int, height: int, tree_percentage: float = 0.6,
+                        water_percentage: float = 0.1, seed=None, smoothing: int = 0):
+    """
+    Génère la carte par blocs de BLOCK_ROWS lignes
+
+    Args:
+        seed: Entier, SeedSequence ou Generator ; la même graine donne toujours la même carte
+        smoothing: Rayon (en cases) du lissage spatial ; 0 pour des cases indépendantes,
+            au-delà les arbres et l'eau se regroupent en forêts et en lacs
+
+    Yields:
+        (y0, bloc) : première ligne du bloc et tableau uint8 de valeurs TerrainType
+    """
+    if not 0 <= smoothing <= BLOCK_ROWS:
+        raise ValueError(f"Le lissage doit être compris entre 0 et {BLOCK_ROWS}")
+    sequence, _ = seed_sequence(seed)
+    heights = [min(BLOCK_ROWS, height - y0) for y0 in range(0, height, BLOCK_ROWS)]
+    water_sequences, tree_sequences = zip(*(child.spawn(2) for child in sequence.spawn(len(heights)))) if heights else ((), ())
+
+    if smoothing:
+        # deux champs indépendants : l'eau d'abord, puis les arbres sur le reste
+        tree_share = min(tree_percentage, 1 - water_percentage) / (1 - water_percentage) if water_percentage < 1 else 0
+        water_field = _SmoothedField(water_sequences, width, heights, smoothing)
+        tree_field = _SmoothedField(tree_sequences, width, heights, smoothing)
+
+    y0 = 0
+    for index, rows in enumerate(heights):
+        block = np.full((rows, width), EMPTY, dtype=np.uint8)
+        if smoothing:
+            block[tree_field.uniform(index, y0) < tree_share] = TREE
+            block[water_field.uniform(index, y0) < water_percentage] = WATER
+        else:
+            rand = np.random.default_rng(water_sequences[index]).random((rows, width), dtype=np.float32)
+            block[rand < water_percentage + tree_percentage] = TREE
+            block[rand < water_percentage] = WATER
+        yield y0, block
+        y0 += rows
+
+
+def generate_terrain(width: int, height: int, tree_percentage: float = 0.6,
+                     water_percentage: float = 0.1, seed=None, smoothing: int = 0):
+    """Carte complète (tableau uint8 hauteur x largeur), voir iter_terrain_blocks"""
+    terrain = np.empty((height, width), dtype=np.uint8)
+    for y0, block in iter_terrain_blocks(width, height, tree_percentage, water_percentage, seed, smoothing):
+        terrain[y0:y0 + len(block)] = block
+    return terrain
@@ -0,0 +1,153 @@
+from collections import deque
+
+import numpy as np
+
+from coupes import component_graph
+
+
+def min_vertex_cut(indptr, indices, source: int, sinks, limit: int = None):
+    """
+    Coupe minimale de sommets entre source et les puits, par flot maximum
+
+    Chaque sommet v est dédoublé en v_entrée -> v_sortie de capacité 1 (infinie pour la
+    source et les puits), chaque arête u - v donne u_sortie -> v_entrée et v_sortie -> u_entrée
+    de capacité infinie. Les chemins augmentants sont cherchés en largeur dans le graphe
+    résiduel, sans le construire : O(flot * (V + E)). Parmi les coupes minimales, celle
+    retenue est la plus proche de la source, donc celle qui laisse brûler le moins.
+
+    Args:
+        indptr, indices: Adjacence CSR (voir coupes.component_graph)
+        sinks: Liste de booléens, True pour les sommets à protéger
+        limit: Abandonne dès que le flot dépasse cette valeur
+
+    Returns:
+        Liste des sommets coupés, ou None si la coupe minimale dépasse limit
+    """
+    indptr = np.asarray(indptr).tolist()
+    indices = np.asarray(indices).tolist()
+    n = len(indptr) - 1
+    # noeud 2v : entrée de v, 2v + 1 : sortie
+    vertex_flow = [0] * n
+    edge_flow = {}
+    flow = 0
+    while True:
+        parent = [-1] * (2 * n)
+        parent[2 * source + 1] = 2 * source + 1
+        queue = deque([2 * source + 1])
+        sink = -1
+        while queue and sink < 0:
+            node = queue.popleft()
+            v = node >> 1
+            if node & 1:
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if parent[2 * w] < 0:
+                        parent[2 * w] = node
+                        if sinks[w]:
+                            sink = 2 * w
+                            break
+                        queue.append(2 * w)
+                if v != source and vertex_flow[v] and parent[2 * v] < 0:
+                    parent[2 * v] = node
+                    queue.append(2 * v)
+            else:
+                if (v == source or not vertex_flow[v]) and parent[node + 1] < 0:
+                    parent[node + 1] = node
+                    queue.append(node + 1)
+                # arcs inverses des arêtes qui portent du flot vers v
+                for u in indices[indptr[v]:indptr[v + 1]]:
+                    if parent[2 * u + 1] < 0 and edge_flow.get((u, v)):
+                        parent[2 * u + 1] = node
+                        queue.append(2 * u + 1)
+
+        if sink < 0:
+            return [v for v in range(n)
+                    if v != source and parent[2 * v] >= 0 and parent[2 * v + 1] < 0]
+
+        path = []
+        node = sink
+        while node != 2 * source + 1:
+            path.append((parent[node], node))
+            node = parent[node]
+        if not any(b == a + 1 and not a & 1 and a >> 1 != source for a, b in path):
+            raise ValueError("Une zone protégée touche le départ du feu : aucune coupe possible")
+        for a, b in path:
+            u, v = a >> 1, b >> 1
+            if u == v:
+                vertex_flow[v] += 1 if b & 1 else -1
+            elif a & 1:
+                edge_flow[(u, v)] = edge_flow.get((u, v), 0) + 1
+            else:
+                edge_flow[(v, u)] -= 1
+        flow += 1
+        if limit is not None and flow > limit:
+            return None
+
+
+def _distances(indptr, indices, root: int, removed=()):
+    """Distance en nombre de pas de chaque sommet à root sans passer par removed, -1 si inaccessible"""
+    distance = [-1] * (len(indptr) - 1)
+    distance[root] = 0
+    queue = deque([root])
+    while queue:
+        v = queue.popleft()
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if distance[w] < 0 and w not in removed:
+                distance[w] = distance[v] + 1
+                queue.append(w)
+    return distance
+
+
+def _burnt_after(indptr, indices, root: int, cut):
+    return sum(1 for d in _distances(indptr, indices, root, set(cut)) if d >= 0)
+
+
+def plan_firebreak(trees, start_x: int, start_y: int, protected=None, budget: int = None, topology=None):
+    """
+    Pare-feu minimal autour du départ (start_x, start_y)
+
+    Avec protected (masque booléen de la carte), coupe minimale qui sépare du feu
+    toutes les cases d'arbres protégées. Avec seulement budget, les cases à plus de r
+    pas du départ sont protégées tour à tour pour chaque rayon r, et la coupe d'au plus
+    budget arbres qui laisse brûler le moins de cases est retenue.
+
+    Returns:
+        (indices à plat des arbres à couper, cases brûlées avant, cases brûlées après),
+        ou None si aucune coupe ne respecte budget
+    """
+    if protected is None and budget is None:
+        raise ValueError("Il faut une zone protégée ou un budget de coupes")
+    graph = component_graph(trees, start_x, start_y, topology)
+    if graph is None:
+        return np.zeros(0, dtype=np.int64), 0, 0
+    cells, indptr, indices = graph
+    root = int(np.searchsorted(cells, start_y * trees.shape[1] + start_x))
+    indptr, indices = indptr.tolist(), indices.tolist()
+    before = len(cells)
+
+    if protected is not None:
+        protected = np.asarray(protected, dtype=bool)
+        if protected.shape != trees.shape:
+            raise ValueError(f"La zone protégée doit avoir la forme de la carte {trees.shape}")
+        sinks = protected.reshape(-1)[cells].tolist()
+        if sinks[root]:
+            raise ValueError("Le départ du feu est dans la zone protégée")
+        if not any(sinks):
+            return np.zeros(0, dtype=np.int64), before, before
+        cut = min_vertex_cut(indptr, indices, root, sinks, budget)
+        if cut is None:
+            return None
+        return cells[cut], before, _burnt_after(indptr, indices, root, cut)
+
+    distance = _distances(indptr, indices, root)
+    best = ([], before)
+    for radius in range(1, max(distance)):
+        sinks = [d > radius for d in distance]
+        cut = min_vertex_cut(indptr, indices, root, sinks, budget)
+        if cut is None:
+            continue
+        after = _burnt_after(indptr, indices, root, cut)
+        if after < best[1] or (after == best[1] and len(cut) < len(best[0])):
+            best = (cut, after)
+        if best[1] == 1:
+            break  # seul le départ brûle encore
+    return cells[np.array(best[0], dtype=np.int64)], before, best[1]
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from generation import seed_sequence
+from topologie import get_topology, topology_for
+
+# Décalages (dy, dx) des 8 voisins, dans l'ordre des directions de la topologie
+OFFSETS_8 = get_topology(1, 1).offsets[0]
+
+
+def spread_probabilities(p_spread: float, wind=None, wind_strength: float = 0.5, offsets=OFFSETS_8):
+    """
+    Probabilité d'allumage vers chaque voisin
+
+    Sans vent, p_spread dans toutes les directions. Avec un vent (wx, wy) (vers l'est :
+    (1, 0), vers le sud : (0, 1)), la probabilité est multipliée par
+    1 + wind_strength * cos(angle entre le voisin et le vent), puis bornée à [0, 1].
+    """
+    if not 0 <= p_spread <= 1:
+        raise ValueError("La probabilité de propagation doit être comprise entre 0 et 1")
+    probabilities = np.full(len(offsets), p_spread, dtype=np.float64)
+    if wind is not None and any(wind):
+        wind = np.array([wind[1], wind[0]], dtype=np.float64)
+        wind /= np.linalg.norm(wind)
+        for i, offset in enumerate(offsets):
+            direction = np.array(offset, dtype=np.float64)
+            cos = direction @ wind / np.linalg.norm(direction)
+            probabilities[i] = min(1.0, max(0.0, p_spread * (1 + wind_strength * cos)))
+    return probabilities
+
+
+def burn_batch(trees, start_x: int, start_y: int, size: int, probabilities, sequence, topology=None):
+    """
+    Fait avancer ensemble size réalisations du feu stochastique
+
+    Chaque case en feu tente une fois d'allumer chacun de ses voisins arbres. Le front
+    de toutes les réalisations est traité en une seule fois, par tableaux d'indices
+    (réalisation, y, x), avec le flux aléatoire propre au lot.
+
+    Args:
+        probabilities: Probabilité d'allumage par direction de la topologie, ou tableau
+            (2, directions) par parité de ligne (voir spread_probabilities)
+        topology: Règle de voisinage (8-connexité bornée par défaut)
+
+    Returns:
+        Tableau booléen (size, hauteur, largeur) des cases brûlées
+    """
+    height, width = trees.shape
+    topology = topology_for(trees.shape, topology)
+    # probabilités par parité de ligne et par direction (elles diffèrent en hexagonal)
+    probabilities = np.broadcast_to(probabilities, (2, topology.directions))
+    rng = np.random.default_rng(sequence)
+    burnt = np.zeros((size, height, width), dtype=bool)
+    if not trees[start_y, start_x]:
+        return burnt
+    burnt[:, start_y, start_x] = True
+    b = np.arange(size)
+    y = np.full(size, start_y)
+    x = np.full(size, start_x)
+    while b.size:
+        draws = rng.random((topology.directions, b.size))
+        parity = y & 1
+        new = []
+        for j, draw in enumerate(draws):
+            ny, nx = topology.row_map[j, y], topology.col_map[j, parity, x]
+            ok = (draw < probabilities[parity, j]) & (ny >= 0) & (nx >= 0)
+            tb, ty, tx = b[ok], ny[ok], nx[ok]
+            ok = trees[ty, tx] & ~burnt[tb, ty, tx]
+            new.append((tb[ok] * height + ty[ok]) * width + tx[ok])
+        front = np.unique(np.concatenate(new))
+        burnt.reshape(-1)[front] = True
+        b, rest = np.divmod(front, height * width)
+        y, x = np.divmod(rest, width)
+    return burnt
+
+
+def _run_batch(task):
+    trees, start_x, start_y, size, probabilities, sequence, topology = task
+    burnt = burn_batch(trees, start_x, start_y, size, probabilities, sequence, topology)
+    return burnt.sum(axis=0, dtype=np.int64), burnt.sum(axis=(1, 2), dtype=np.int64)
+
+
+def run_ensemble(trees, start_x: int, start_y: int, realizations: int, probabilities,
+                 seed=None, batch_size: int = 64, workers: int = None, topology=None):
+    """
+    Ensemble de Monte Carlo du feu stochastique
+
+    Les réalisations sont regroupées en lots de batch_size ; chaque lot a son propre
+    flux aléatoire (SeedSequence.spawn), le résultat ne dépend donc que de la graine et
+    de batch_size, pas de la répartition des lots entre processus.
+
+    Returns:
+        (nombre de réalisations où chaque case a brûlé, cases brûlées par réalisation)
+    """
+    sequence, _ = seed_sequence(seed)
+    sizes = [min(batch_size, realizations - start) for start in range(0, realizations, batch_size)]
+    tasks = [(trees, start_x, start_y, size, probabilities, child, topology)
+             for size, child in zip(sizes, sequence.spawn(len(sizes)))]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_run_batch, tasks))
+    else:
+        results = [_run_batch(task) for task in tasks]
+    hits = np.zeros(trees.shape, dtype=np.int64)
+    for batch_hits, _ in results:
+        hits += batch_hits
+    counts = np.concatenate([batch_counts for _, batch_counts in results]) if results else np.zeros(0, np.int64)
+    return hits, counts
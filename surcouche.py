@@ -0,0 +1,112 @@
+import numpy as np
+
+from empreinte import zobrist_hash
+
+
+class MapOverlay:
+    """
+    Vue modifiable sur une carte de base immuable : seules les cases modifiées sont
+    stockées (indice à plat -> valeur), la base n'est jamais copiée ni écrite
+
+    Plusieurs surcouches peuvent partager la même base, y compris depuis plusieurs
+    threads, tant que la base elle-même ne change pas. Une surcouche n'est utilisée
+    que par un seul thread à la fois.
+
+    Args:
+        read: Fonction indice à plat -> valeur (uint8) de la case dans la base
+        shape: (hauteur, largeur) de la base
+        base_fingerprint: Empreinte des arbres de la base (None si inconnue)
+        tree: Valeur d'un arbre, pour tenir à jour l'empreinte de la surcouche (None :
+            pas d'empreinte, les écritures ne coûtent qu'une entrée de dictionnaire)
+    """
+    __slots__ = ("read", "shape", "edits", "base_fingerprint", "tree", "_tree_delta")
+
+    def __init__(self, read, shape, base_fingerprint=None, tree: int = None):
+        self.read = read
+        self.shape = tuple(shape)
+        self.edits = {}
+        self.base_fingerprint = base_fingerprint
+        self.tree = tree
+        # XOR des clés des cases dont l'état arbre / non-arbre diffère de la base
+        self._tree_delta = 0
+
+    def get_index(self, index: int):
+        value = self.edits.get(index)
+        return self.read(index) if value is None else value
+
+    def get(self, x: int, y: int):
+        return self.get_index(y * self.shape[1] + x)
+
+    def set_index(self, index: int, value: int):
+        if self.tree is not None and (self.get_index(index) == self.tree) != (value == self.tree):
+            self._tree_delta ^= zobrist_hash(index)
+        self.edits[index] = value
+
+    def set(self, x: int, y: int, value: int):
+        self.set_index(y * self.shape[1] + x, value)
+
+    def set_cells(self, indices, value: int):
+        indices = np.asarray(indices).reshape(-1).tolist()
+        if self.tree is not None:
+            toggled = [index for index in indices if (self.get_index(index) == self.tree) != (value == self.tree)]
+            self._tree_delta ^= zobrist_hash(toggled)
+        self.edits.update(dict.fromkeys(indices, value))
+
+    @property
+    def fingerprint(self):
+        """Empreinte des arbres vus à travers la surcouche, None si la base n'en a pas"""
+        if self.base_fingerprint is None:
+            return None
+        return self.base_fingerprint ^ self._tree_delta
+
+    def copy(self):
+        """Nouvelle surcouche sur la même base, avec une copie des modifications (pas de la base)"""
+        overlay = MapOverlay(self.read, self.shape, self.base_fingerprint, self.tree)
+        overlay.edits = dict(self.edits)
+        overlay._tree_delta = self._tree_delta
+        return overlay
+
+    def __len__(self):
+        return len(self.edits)
+
+
+def burn_overlay(overlay: MapOverlay, start_x: int, start_y: int, topology, tree: int, burnt: int, max_burn: int = None):
+    """
+    Propagation du feu dans la surcouche (même parcours que la file du simulateur)
+
+    Les cases brûlées sont écrites dans la surcouche uniquement ; le coût est en
+    O(cases brûlées * voisins), sans lecture du reste de la carte. La propagation
+    s'arrête dès que max_burn cases ont brûlé.
+
+    Returns:
+        Indices à plat des cases brûlées, dans l'ordre de propagation
+    """
+    width = overlay.shape[1]
+    start = start_y * width + start_x
+    if overlay.get_index(start) != tree:
+        return []
+    edits, read = overlay.edits, overlay.read
+    neighbour_tables = list(zip(topology.rows, topology.cols))
+    edits[start] = burnt
+    burnt_indices = [start]
+    limit = overlay.shape[0] * overlay.shape[1] if max_burn is None else max_burn
+    position = 0
+    while position < len(burnt_indices) < limit:
+        y, x = divmod(burnt_indices[position], width)
+        position += 1
+        parity = y & 1
+        for rows, cols in neighbour_tables:
+            ny, nx = rows[y], cols[parity][x]
+            if ny < 0 or nx < 0:
+                continue
+            index = ny * width + nx
+            value = edits.get(index)
+            if (read(index) if value is None else value) == tree:
+                edits[index] = burnt
+                burnt_indices.append(index)
+                if len(burnt_indices) == limit:
+                    break
+    if overlay.tree is not None:
+        # chaque case brûlée était un arbre : une seule mise à jour de l'empreinte
+        overlay._tree_delta ^= zobrist_hash(burnt_indices)
+    return burnt_indices
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+import unittest
+import base64
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from arrivee import arrival_times
+
+
+class TestArrivalTimes(unittest.TestCase):
+    def test_foret_pleine_distance_octile(self):
+        trees = np.ones((7, 9), dtype=bool)
+        times = arrival_times(trees, [(2, 3)])
+        ys, xs = np.indices(trees.shape)
+        dx, dy = abs(xs - 2), abs(ys - 3)
+        expected = np.maximum(dx, dy) + (math.sqrt(2) - 1) * np.minimum(dx, dy)
+        self.assertTrue(np.allclose(times, expected))
+
+    def test_delai_et_cases_non_atteintes(self):
+        trees = np.ones((5, 5), dtype=bool)
+        trees[:, 2] = False
+        times = arrival_times(trees, [(0, 0)], delay=np.full((5, 5), 3.0))
+        self.assertEqual(times[0, 1], 3.0)
+        self.assertTrue(np.all(np.isinf(times[:, 2:])))
+
+    def test_pente_accelere_en_montee(self):
+        trees = np.ones((1, 5), dtype=bool)
+        elevation = np.arange(5, dtype=np.float64).reshape(1, 5)
+        uphill = arrival_times(trees, [(0, 0)], elevation=elevation)
+        downhill = arrival_times(trees, [(4, 0)], elevation=elevation)
+        self.assertLess(uphill[0, 4], 4.0)
+        self.assertGreater(downhill[0, 0], 4.0)
+
+    def test_plusieurs_departs(self):
+        trees = np.ones((1, 9), dtype=bool)
+        times = arrival_times(trees, [(0, 0), (8, 0)])
+        self.assertEqual(times.tolist(), [[0, 1, 2, 3, 4, 3, 2, 1, 0]])
+
+    def test_couche_invalide(self):
+        trees = np.ones((3, 3), dtype=bool)
+        with self.assertRaises(ValueError):
+            arrival_times(trees, [(0, 0)], delay=np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            arrival_times(trees, [(0, 0)], delay=np.zeros((3, 3)))
+
+
+class TestArrivalExport(unittest.TestCase):
+    def setUp(self):
+        self.sim = ForestFireSimulator(12, 10, backend="numpy")
+        self.sim.map_generator(tree_percentage=0.7, water_percentage=0.05, seed=8)
+        self.sim.map[5][6] = TerrainType.TREE
+        self.sim.reset_map()
+
+    def test_meme_cases_que_le_feu(self):
+        times = self.sim.fire_arrival_times([(6, 5)])
+        self.sim.simulate_fire(6, 5)
+        self.assertTrue(np.array_equal(np.isfinite(times), self.sim.current_map.data == TerrainType.BURNT.value))
+
+    def test_export_cells_et_canvas(self):
+        times = self.sim.fire_arrival_times([(6, 5)])
+        filename = "test_arrivee.html"
+        self.sim.export_html(filename, render="cells", arrival=times)
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self.assertEqual(content.count('style="background-color:'), np.count_nonzero(np.isfinite(times)))
+        self.assertIn(f"background-color: {self.sim.ARRIVAL_COLORS[0]}", content)
+
+        self.sim.export_html(filename, render="canvas", arrival=times)
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        os.remove(filename)
+        encoded = content.split('id="arrival-data" type="application/octet-stream">')[1].split("</script>")[0]
+        levels = np.frombuffer(base64.b64decode(encoded), dtype=np.uint8).reshape(times.shape)
+        self.assertTrue(np.array_equal(levels < 255, np.isfinite(times)))
+        self.assertEqual(levels.max(where=levels < 255, initial=0), 254)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import base64
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from automate import BURNING, BURNT, run_steps, burn_from_sources
+
+
+class TestFireSteps(unittest.TestCase):
+    def setUp(self):
+        self.sim = ForestFireSimulator(40, 30, backend="numpy")
+        self.sim.map_generator(tree_percentage=0.7, water_percentage=0.05, seed=4)
+        self.sim.map[15][20] = TerrainType.TREE
+        self.sim.reset_map()
+
+    def test_etat_final_identique_a_simulate_fire(self):
+        history = self.sim.simulate_fire_steps(20, 15)
+        final = self.sim.current_map.data.copy()
+        self.sim.reset_map()
+        burnt = self.sim.simulate_fire(20, 15, engine="component")
+        self.assertTrue(history.finished)
+        self.assertEqual(history.burnt, burnt)
+        self.assertTrue(np.array_equal(final, self.sim.current_map.data))
+        self.assertTrue(np.array_equal(history.state(history.steps), final))
+
+    def test_front_par_distance(self):
+        # sur une forêt pleine, le pas d'allumage est la distance de Tchebychev
+        cells = np.ones((9, 11), dtype=np.uint8)
+        frames, finished = run_steps(cells, 3, 4)
+        self.assertTrue(finished)
+        self.assertEqual(len(frames), 8)
+        for step, frame in enumerate(frames):
+            ys, xs = np.divmod(frame, 11)
+            self.assertTrue(np.all(np.maximum(abs(ys - 4), abs(xs - 3)) == step))
+        self.assertTrue(np.all(cells == BURNT))
+
+    def test_arret_avant_extinction(self):
+        history = self.sim.simulate_fire_steps(20, 15, max_steps=3)
+        self.assertFalse(history.finished)
+        self.assertEqual(history.steps, 3)
+        data = self.sim.current_map.data
+        self.assertTrue(np.array_equal(np.flatnonzero(data == BURNING), np.sort(history.frames[-1])))
+        self.assertTrue(np.array_equal(history.state(3), data))
+        with self.assertRaises(ValueError):
+            history.state(4)
+        # les écritures sont journalisées
+        self.sim.reset_map()
+        self.assertEqual(self.sim.current_map, self.sim.map)
+
+    def test_zero_pas(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = ForestFireSimulator(40, 30, backend=backend)
+            sim.map = sim._from_array(self.sim.map.data)
+            sim.reset_map()
+            history = sim.simulate_fire_steps(20, 15, max_steps=0)
+            self.assertFalse(history.finished)
+            self.assertEqual((history.steps, history.burnt), (0, 1))
+            self.assertEqual(sim.current_map[15][20], TerrainType.BURNING)
+            self.assertEqual(sim._terrain_counts(sim.current_map)[TerrainType.BURNT], 0)
+            sim.reset_map()
+            self.assertEqual(sim.current_map, sim.map)
+
+    def test_backend_liste(self):
+        sim = ForestFireSimulator(40, 30)
+        sim.map = self.sim.map.to_rows()
+        sim.reset_map()
+        history = sim.simulate_fire_steps(20, 15, max_steps=2)
+        expected = [[TerrainType(value) for value in row] for row in history.state(2).tolist()]
+        self.assertEqual(sim.current_map, expected)
+        self.assertEqual(history.burnt, sum(row.count(TerrainType.BURNING) + row.count(TerrainType.BURNT) for row in sim.current_map))
+
+    def test_depart_sans_arbre(self):
+        self.sim.map[0][0] = TerrainType.WATER
+        self.sim.reset_map()
+        history = self.sim.simulate_fire_steps(0, 0)
+        self.assertEqual(history.steps, 0)
+        self.assertEqual(history.burnt, 0)
+
+    def test_export_animation(self):
+        history = self.sim.simulate_fire_steps(20, 15)
+        filename = "test_animation.html"
+        self.sim.export_html_animation(history, filename)
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        os.remove(filename)
+        self.assertIn("<canvas", content)
+        self.assertIn("En feu", content)
+        encoded = content.split('id="frames-data" type="application/octet-stream">')[1].split("</script>")[0]
+        decoded = np.frombuffer(base64.b64decode(encoded), dtype="<i4")
+        self.assertTrue(np.array_equal(decoded, np.concatenate(history.frames)))
+
+
+class TestMultipleFires(unittest.TestCase):
+    def setUp(self):
+        self.sim = ForestFireSimulator(40, 30, backend="numpy")
+        self.sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=9)
+        self.ignitions = [(3, 4), (20, 15), (35, 25), (20, 15)]
+        for x, y in self.ignitions:
+            self.sim.map[y][x] = TerrainType.TREE
+        self.sim.reset_map()
+
+    def test_meme_resultat_que_des_feux_successifs(self):
+        result = self.sim.simulate_fires(self.ignitions)
+        together = self.sim.current_map.data.copy()
+        self.sim.reset_map()
+        total = sum(self.sim.simulate_fire(x, y, engine="component") for x, y in self.ignitions)
+        self.assertEqual(result["burnt"], total)
+        self.assertEqual(sum(result["burnt_by_ignition"]), total)
+        self.assertTrue(np.array_equal(together, self.sim.current_map.data))
+        # départ en double : rien ne lui est attribué
+        self.assertEqual(result["burnt_by_ignition"][3], 0)
+
+    def test_attribution_au_plus_proche(self):
+        # forêt pleine : chaque case revient au départ le plus proche (Tchebychev), le premier à égalité
+        trees = np.ones((9, 12), dtype=bool)
+        sources = [(1, 1), (10, 7), (6, 4)]
+        origin = burn_from_sources(trees, sources)
+        ys, xs = np.indices(trees.shape)
+        distances = np.stack([np.maximum(abs(xs - x), abs(ys - y)) for x, y in sources])
+        self.assertTrue(np.array_equal(origin, np.argmin(distances, axis=0)))
+
+    def test_backend_liste_et_compteurs(self):
+        self.sim.map[0][0] = TerrainType.WATER
+        self.sim.reset_map()
+        sim = ForestFireSimulator(40, 30)
+        sim.map = self.sim.map.to_rows()
+        sim.reset_map()
+        result = sim.simulate_fires(np.array(self.ignitions + [(0, 0)]))
+        self.sim.simulate_fires(self.ignitions)
+        self.assertEqual(sim.current_map, self.sim.current_map.to_rows())
+        self.assertEqual(sim.events.counters["fires"], 3)
+        self.assertEqual(sim.events.counters["cells_burnt"], result["burnt"])
+
+
+if __name__ == '__main__':
+    unittest.main()
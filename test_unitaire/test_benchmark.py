@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+import unittest
+import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_suite_reproductible(self):
+        results = benchmark.run_suite(sizes=[12], densities=[0.6], repeats=1)
+        self.assertEqual(set(results), {f"{name}/12/0.6" for name in benchmark.CASES})
+        self.assertEqual(results["simulate_fire/12/0.6"]["fires"], 1)
+        self.assertGreater(results["cut_exhaustive/12/0.6"]["fires"], 1)
+        for result in results.values():
+            self.assertGreater(result["time"], 0)
+            self.assertGreater(result["peak"], 0)
+
+        again = benchmark.run_suite(sizes=[12], densities=[0.6], repeats=1)
+        self.assertEqual({k: r["fires"] for k, r in results.items()}, {k: r["fires"] for k, r in again.items()})
+
+    def test_taille_maximale_par_cas(self):
+        results = benchmark.run_suite(["cut_exhaustive", "cut_dominator"], sizes=[40], densities=[0.3], repeats=1)
+        self.assertEqual(list(results), ["cut_dominator/40/0.3"])
+
+    def test_comparaison_et_reference(self):
+        baseline = {"a": {"time": 1.0, "peak": 100}, "b": {"time": 1.0, "peak": 100}}
+        results = {"a": {"time": 1.2, "peak": 100}, "b": {"time": 1.0, "peak": 200}, "c": {"time": 9.0, "peak": 1}}
+        self.assertEqual(benchmark.compare(results, baseline, threshold=0.25), [("b", "peak", 100, 200)])
+        self.assertEqual(len(benchmark.compare(results, baseline, threshold=0.1)), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "reference.json")
+            benchmark.save_baseline(baseline, filename)
+            self.assertEqual(benchmark.load_baseline(filename), baseline)
+
+    def test_passage_a_l_echelle(self):
+        rows = benchmark.strip_scaling(32, workers=(1, 2), repeats=1)
+        self.assertEqual([row["workers"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["speedup"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
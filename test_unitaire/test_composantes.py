@@ -0,0 +1,102 @@
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from composantes import label_components, component_mask, label_components_parallel
+
+
+class TestLabelComponents(unittest.TestCase):
+    def test_composantes_8_connexes(self):
+        trees = np.array([
+            [0, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 1],
+            [0, 1, 0, 0],
+        ], dtype=bool)
+        labels = label_components(trees)
+        # étiquette = plus petit indice à plat de la composante
+        self.assertEqual(labels[0, 1], 1)
+        self.assertEqual(labels[1, 0], 1)
+        self.assertEqual(labels[1, 1], 1)
+        self.assertEqual(labels[2, 3], 11)
+        self.assertEqual(labels[3, 1], 13)
+        self.assertEqual(labels[0, 0], -1)
+
+    def test_diagonale(self):
+        trees = np.eye(5, dtype=bool)[:, ::-1]
+        labels = label_components(trees)
+        self.assertEqual(len(np.unique(labels[trees])), 1)
+
+    def test_component_mask_hors_arbre(self):
+        trees = np.zeros((3, 3), dtype=bool)
+        self.assertFalse(component_mask(trees, 1, 1).any())
+
+
+class TestParallelLabeling(unittest.TestCase):
+    def test_identique_bit_a_bit(self):
+        random_state = np.random.default_rng(8)
+        for density in (0.3, 0.45, 0.6):
+            trees = random_state.random((61, 47)) < density
+            expected = label_components(trees)
+            for strips in (2, 5, 61):
+                labels = label_components_parallel(trees, workers=2, strips=strips)
+                self.assertEqual(labels.dtype, expected.dtype)
+                self.assertTrue(np.array_equal(labels, expected))
+
+    def test_composante_traversant_toutes_les_bandes(self):
+        # serpentin : une seule composante qui traverse chaque frontière plusieurs fois
+        trees = np.zeros((20, 9), dtype=bool)
+        trees[:, 0] = True
+        trees[:, 8] = True
+        trees[0, :] = True
+        trees[19, 4:] = True
+        trees[10:, 4] = True
+        labels = label_components_parallel(trees, workers=2, strips=6)
+        self.assertEqual(set(labels[trees].tolist()), {0})
+
+    def test_simulateur_parallele(self):
+        sim = ForestFireSimulator(40, 30, backend="numpy")
+        sim.map_generator(seed=9)
+        sim.map[15][20] = TerrainType.TREE
+        risk = sim.ignition_risk()
+        parallel_risk = sim.ignition_risk(workers=2)
+        self.assertTrue(np.array_equal(risk["burn_size"], parallel_risk["burn_size"]))
+        sim.reset_map()
+        burnt = sim.simulate_fire(20, 15, engine="component", workers=2)
+        self.assertEqual(burnt, risk["burn_size"][15, 20])
+        self.assertEqual(sim.current_map.count(TerrainType.BURNT), burnt)
+
+
+class TestComponentEngine(unittest.TestCase):
+    def test_meme_resultat_que_la_file(self):
+        random_state = np.random.default_rng(3)
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = ForestFireSimulator(30, 20, backend=backend)
+            sim.map_generator(tree_percentage=0.55, water_percentage=0.1)
+            trees = [(x, y) for y in range(sim.height) for x in range(sim.width) if sim.map[y][x] == TerrainType.TREE]
+            for index in random_state.choice(len(trees), size=5, replace=False):
+                x, y = trees[index]
+                with redirect_stdout(io.StringIO()):
+                    sim.reset_map()
+                    expected = sim.simulate_fire(x, y)
+                    expected_map = [list(row) for row in sim.current_map]
+                    sim.reset_map()
+                    burnt = sim.simulate_fire(x, y, engine="component")
+                self.assertEqual(burnt, expected)
+                self.assertEqual([list(row) for row in sim.current_map], expected_map)
+
+    def test_moteur_inconnu(self):
+        sim = ForestFireSimulator(4, 4)
+        sim.map_generator()
+        with self.assertRaises(ValueError):
+            sim.simulate_fire(0, 0, engine="inconnu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,289 @@
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from contextlib import redirect_stdout
+import copy
+import random
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from coupes import best_single_cut, IncrementalCutSearch
+
+
+class TestDominatorCut(unittest.TestCase):
+    def test_pont_entre_deux_bosquets(self):
+        # deux bosquets reliés par un seul arbre en (2,1)
+        trees = np.array([
+            [1, 1, 0, 1, 1],
+            [1, 1, 1, 1, 1],
+            [1, 1, 0, 1, 1],
+        ], dtype=bool)
+        self.assertEqual(best_single_cut(trees, 0, 0), (2, 1, 13, 6))
+
+    def test_pas_d_arbre_au_depart(self):
+        trees = np.zeros((2, 2), dtype=bool)
+        self.assertIsNone(best_single_cut(trees, 0, 0))
+
+    def test_meme_coupe_que_la_recherche_exhaustive(self):
+        np.random.seed(7)
+        random.seed(7)
+        for backend in ForestFireSimulator.BACKENDS:
+            for _ in range(5):
+                sim = ForestFireSimulator(12, 9, backend=backend)
+                sim.map_generator(tree_percentage=0.55, water_percentage=0.1)
+                sim.map[4][6] = TerrainType.TREE
+                exhaustive = copy.deepcopy(sim)
+                with redirect_stdout(io.StringIO()):
+                    expected = exhaustive.apply_smart_n_preventive_cut(6, 4, 3)
+                    result = sim.apply_smart_n_preventive_cut(6, 4, 3, mode="dominator")
+                self.assertEqual(result, expected)
+                self.assertEqual([list(row) for row in sim.map], [list(row) for row in exhaustive.map])
+                if len(result) == 3:
+                    # la dernière coupe a été appliquée : même feu sur la carte coupée
+                    self.assertEqual([list(row) for row in sim.current_map], [list(row) for row in exhaustive.current_map])
+
+    def test_mode_incremental_identique(self):
+        np.random.seed(11)
+        random.seed(11)
+        for backend in ForestFireSimulator.BACKENDS:
+            for _ in range(5):
+                sim = ForestFireSimulator(12, 9, backend=backend)
+                sim.map_generator(tree_percentage=0.6, water_percentage=0.05)
+                sim.map[4][6] = TerrainType.TREE
+                exhaustive = copy.deepcopy(sim)
+                with redirect_stdout(io.StringIO()):
+                    expected = exhaustive.apply_smart_n_preventive_cut(6, 4, 4)
+                    result = sim.apply_smart_n_preventive_cut(6, 4, 4, mode="incremental")
+                self.assertEqual(result, expected)
+                self.assertEqual([list(row) for row in sim.map], [list(row) for row in exhaustive.map])
+
+    def test_mode_lazy_identique_sur_bosquets_en_chaine(self):
+        # bosquets reliés par des ponts : le gain d'une coupe ne fait que diminuer
+        sim = ForestFireSimulator(11, 3)
+        rows = [
+            [1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1],
+            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+            [1, 1, 0, 1, 1, 0, 1, 1, 0, 1, 1],
+        ]
+        sim.map = [[TerrainType(cell) for cell in row] for row in rows]
+        exhaustive = copy.deepcopy(sim)
+        with redirect_stdout(io.StringIO()):
+            expected = exhaustive.apply_smart_n_preventive_cut(0, 0, 3)
+            result = sim.apply_smart_n_preventive_cut(0, 0, 3, mode="lazy")
+        self.assertEqual(result, expected)
+        self.assertEqual(result[0][:2], (2, 1))
+        # les deux recherches n'évaluent que les arbres du feu
+        self.assertLessEqual(sim.events.counters["cuts_evaluated"], exhaustive.events.counters["cuts_evaluated"])
+
+    def test_mode_lazy_pas_plus_d_evaluations(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            for seed in range(13, 18):
+                sim = ForestFireSimulator(12, 9, backend=backend)
+                sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=seed)
+                sim.map[4][6] = TerrainType.TREE
+                exhaustive = copy.deepcopy(sim)
+                with redirect_stdout(io.StringIO()):
+                    expected = exhaustive.apply_smart_n_preventive_cut(6, 4, 4)
+                    result = sim.apply_smart_n_preventive_cut(6, 4, 4, mode="lazy")
+                self.assertEqual(result, expected)
+                self.assertEqual([list(row) for row in sim.map], [list(row) for row in exhaustive.map])
+                self.assertLessEqual(sim.events.counters["cuts_evaluated"], exhaustive.events.counters["cuts_evaluated"])
+
+    def test_mode_lazy_alias_de_incremental(self):
+        sim = ForestFireSimulator(12, 9)
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=14)
+        sim.map[4][6] = TerrainType.TREE
+        incremental = copy.deepcopy(sim)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(sim.apply_smart_n_preventive_cut(6, 4, 4, mode="lazy"),
+                             incremental.apply_smart_n_preventive_cut(6, 4, 4, mode="incremental"))
+        self.assertEqual(sim.events.counters, incremental.events.counters)
+
+    def test_mode_lazy_identique_toutes_connexites(self):
+        # le feu n'est pas sous-modulaire : deux coupes peuvent ensemble isoler un massif
+        rng = np.random.default_rng(8)
+        for backend in ForestFireSimulator.BACKENDS:
+            for connectivity, wrap in ((4, False), (8, False), (8, True), ("hex", True)):
+                for _ in range(5):
+                    sim = ForestFireSimulator(7, 6, backend=backend, connectivity=connectivity, wrap=wrap)
+                    sim.map_generator(tree_percentage=0.55, water_percentage=0.05, seed=rng)
+                    sim.map[0][1] = TerrainType.TREE
+                    exhaustive = copy.deepcopy(sim)
+                    with redirect_stdout(io.StringIO()):
+                        expected = exhaustive.apply_smart_n_preventive_cut(1, 0, 3)
+                        result = sim.apply_smart_n_preventive_cut(1, 0, 3, mode="lazy")
+                    self.assertEqual(result, expected)
+                    self.assertEqual(sim.current_map, exhaustive.current_map)
+
+    def test_resultats_conserves_entre_coupes(self):
+        trees = np.array([
+            [1, 1, 0, 1, 1],
+            [1, 1, 1, 1, 1],
+            [1, 1, 0, 1, 1],
+        ], dtype=bool)
+        search = IncrementalCutSearch(trees, 0, 0)
+        self.assertEqual(search.best_cut(), (2, 1, 13, 6))
+        search.cut(2, 1)
+        # les arbres de l'autre bosquet ne sont plus candidats
+        self.assertEqual(search.size, 6)
+        self.assertEqual(len(search.results), 0)
+        self.assertEqual(search.best_cut(), (1, 0, 6, 5))
+
+    def test_workers_identique(self):
+        np.random.seed(5)
+        random.seed(5)
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = ForestFireSimulator(12, 9, backend=backend)
+            sim.map_generator(tree_percentage=0.6, water_percentage=0.05)
+            sim.map[4][6] = TerrainType.TREE
+            exhaustive = copy.deepcopy(sim)
+            with redirect_stdout(io.StringIO()):
+                expected = exhaustive.apply_smart_n_preventive_cut(6, 4, 3)
+                result = sim.apply_smart_n_preventive_cut(6, 4, 3, workers=2)
+            self.assertEqual(result, expected)
+            self.assertEqual([list(row) for row in sim.map], [list(row) for row in exhaustive.map])
+
+    def test_workers_evaluations_comptees(self):
+        sim = ForestFireSimulator(12, 9)
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=5)
+        sim.map[4][6] = TerrainType.TREE
+        exhaustive = copy.deepcopy(sim)
+        with redirect_stdout(io.StringIO()):
+            exhaustive.apply_smart_preventive_cut(6, 4)
+            sim.apply_smart_preventive_cut(6, 4, workers=2)
+        # chaque arbre du feu initial sauf le départ, comme la recherche exhaustive
+        self.assertGreater(sim.events.counters["cuts_evaluated"], 0)
+        self.assertEqual(sim.events.counters["cuts_evaluated"], exhaustive.events.counters["cuts_evaluated"])
+
+    def test_workers_mode_non_exhaustif(self):
+        sim = ForestFireSimulator(4, 4)
+        sim.map_generator()
+        with self.assertRaises(ValueError):
+            sim.apply_smart_preventive_cut(0, 0, mode="dominator", workers=2)
+
+    def test_mode_inconnu(self):
+        sim = ForestFireSimulator(4, 4)
+        sim.map_generator()
+        with self.assertRaises(ValueError):
+            sim.apply_smart_preventive_cut(0, 0, mode="inconnu")
+
+
+class TestMaxBurn(unittest.TestCase):
+    def make(self, backend):
+        sim = ForestFireSimulator(12, 9, backend=backend)
+        sim.map = sim._from_array(np.ones((9, 12), dtype=np.uint8) * TerrainType.TREE.value)
+        sim.reset_map()
+        return sim
+
+    def test_propagation_arretee_a_la_borne(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = self.make(backend)
+            self.assertEqual(sim.simulate_fire(0, 0, max_burn=10), 10)
+            self.assertEqual(sim._terrain_counts(sim.current_map)[TerrainType.BURNT], 10)
+            overlay = sim.overlay()
+            self.assertEqual(sim.simulate_fire(0, 0, overlay=overlay, max_burn=7), 7)
+            self.assertEqual(len(overlay), 7)
+            sim.reset_map()
+            # borne jamais atteinte : feu complet
+            self.assertEqual(sim.simulate_fire(0, 0, max_burn=1000), 108)
+
+    def test_borne_invalide(self):
+        sim = self.make("numpy")
+        with self.assertRaises(ValueError):
+            sim.simulate_fire(0, 0, max_burn=0)
+        with self.assertRaises(ValueError):
+            sim.simulate_fire(0, 0, engine="component", max_burn=5)
+
+    def test_feu_interrompu_memorise_comme_borne(self):
+        sim = self.make("numpy")
+        cache = sim.enable_fire_cache(16)
+        self.assertEqual(sim.simulate_fire(0, 0, overlay=sim.overlay(), max_burn=5), 5)
+        # le début d'un feu arrêté sert aux bornes plus petites, pas au feu complet
+        overlay = sim.overlay()
+        self.assertEqual(sim.simulate_fire(0, 0, overlay=overlay, max_burn=3), 3)
+        self.assertEqual(cache.hits, 1)
+        reference = sim.overlay()
+        sim.disable_fire_cache()
+        sim.simulate_fire(0, 0, overlay=reference, max_burn=3)
+        self.assertEqual(overlay.edits, reference.edits)
+        sim.enable_fire_cache(16)
+        self.assertEqual(sim.simulate_fire(0, 0, overlay=sim.overlay(), max_burn=5), 5)
+        self.assertEqual(sim.simulate_fire(0, 0, overlay=sim.overlay()), 108)
+        self.assertEqual(sim.simulate_fire(0, 0, overlay=sim.overlay(), max_burn=5), 5)
+        self.assertEqual(sim.fire_cache.hits, 1)
+
+    def test_borne_sur_feu_memorise(self):
+        # le début d'un feu lu dans le cache est celui de la propagation, pas l'ordre des indices
+        for engine in ("queue", "component"):
+            sim = ForestFireSimulator(5, 1, backend="numpy")
+            sim.map = sim._from_array(np.ones((1, 5), dtype=np.uint8) * TerrainType.TREE.value)
+            sim.reset_map()
+            sim.enable_fire_cache(16)
+            self.assertEqual(sim.simulate_fire(2, 0, engine=engine), 5)
+            sim.reset_map()
+            self.assertEqual(sim.simulate_fire(2, 0, max_burn=2), 2)
+            self.assertEqual([[cell.value for cell in row] for row in sim.current_map], [[1, 3, 3, 1, 1]])
+            overlay = sim.overlay()
+            self.assertEqual(sim.simulate_fire(2, 0, overlay=overlay, max_burn=2), 2)
+            self.assertEqual(sorted(overlay.edits), [1, 2])
+
+    def test_recherche_repetee_lue_dans_le_cache(self):
+        np.random.seed(21)
+        random.seed(21)
+        sim = ForestFireSimulator(14, 10, backend="numpy")
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05)
+        sim.map[5][7] = TerrainType.TREE
+        cache = sim.enable_fire_cache(1024)
+        expected = sim.find_best_cut(7, 5)
+        hits, misses = cache.hits, cache.misses
+        # les feux arrêtés par la borne sont relus comme bornes inférieures
+        self.assertEqual(sim.find_best_cut(7, 5), expected)
+        self.assertEqual(cache.misses, misses)
+        self.assertEqual(cache.hits - hits, misses)
+
+    def test_depart_sans_arbre(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = self.make(backend)
+            sim.map[0][0] = TerrainType.WATER
+            sim.reset_map()
+            self.assertIsNone(sim.find_best_cut(0, 0))
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertIsNone(sim.apply_smart_preventive_cut(0, 0))
+            self.assertIn("Aucune coupe", output.getvalue())
+
+    def test_candidats_elagues(self):
+        np.random.seed(21)
+        random.seed(21)
+        sim = ForestFireSimulator(14, 10)
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05)
+        sim.map[5][7] = TerrainType.TREE
+        burnt = []
+        sim.events.subscribe("cell_burnt", lambda event, **data: burnt.append(1))
+        bounded = sim.find_best_cut(7, 5)
+        pruned = len(burnt)
+        # même recherche sans borne : chaque candidat brûle jusqu'au bout
+        burnt.clear()
+        overlay = sim.overlay()
+        nb_brule = sim.simulate_fire(7, 5, overlay=overlay.copy())
+        results = [(sim._evaluate_cut(7, 5, x, y), y, x) for x, y in sim._tree_positions(sim.map) if (x, y) != (7, 5)]
+        best, y, x = min(results)
+        self.assertEqual(bounded, (x, y, nb_brule, best) if best < nb_brule else None)
+        self.assertLess(pruned, len(burnt))
+
+    def test_candidats_limites_au_feu_initial(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = self.make(backend)
+            # départ isolé : les 105 autres arbres ne sont pas atteints par le feu
+            for x, y in ((1, 0), (0, 1), (1, 1)):
+                sim.map[y][x] = TerrainType.WATER
+            sim.reset_map()
+            self.assertIsNone(sim.find_best_cut(0, 0))
+            self.assertEqual(sim.events.counters["cuts_evaluated"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType, SparseGrid
+from composantes import component_mask
+from coupes import component_graph
+from creuse import SparseForest, sorted_lookup
+from topologie import get_topology
+
+
+class TestSparseForest(unittest.TestCase):
+    def test_sorted_lookup(self):
+        cells = np.array([2, 5, 9])
+        self.assertEqual(sorted_lookup(cells, [5, 3, 9, 10]).tolist(), [1, -1, 2, -1])
+        self.assertEqual(sorted_lookup(np.zeros(0, dtype=np.int64), [1]).tolist(), [-1])
+
+    def test_composante_identique_au_masque(self):
+        trees = np.random.default_rng(1).random((16, 20)) < 0.6
+        for connectivity, wrap in ((4, False), (8, False), ("hex", True)):
+            topology = get_topology(trees.shape[1], trees.shape[0], connectivity, wrap)
+            forest = SparseForest.from_mask(trees)
+            y, x = np.argwhere(trees)[0]
+            expected = np.flatnonzero(component_mask(trees, x, y, topology=topology))
+            np.testing.assert_array_equal(forest.component(x, y, topology), expected)
+            sparse_graph = component_graph(forest, x, y, topology)
+            dense_graph = component_graph(trees, x, y, topology)
+            np.testing.assert_array_equal(sparse_graph[0], dense_graph[0])
+            np.testing.assert_array_equal(sparse_graph[1], dense_graph[1])
+            # même voisinage, l'ordre des voisins d'une case peut différer
+            indptr = dense_graph[1]
+            for i in range(len(indptr) - 1):
+                self.assertEqual(set(sparse_graph[2][indptr[i]:indptr[i + 1]].tolist()),
+                                 set(dense_graph[2][indptr[i]:indptr[i + 1]].tolist()))
+
+    def test_depart_hors_arbre(self):
+        forest = SparseForest([3], (2, 2))
+        self.assertEqual(forest.component(0, 0).size, 0)
+        self.assertIsNone(forest.component_graph(0, 0))
+
+
+class TestSparseGrid(unittest.TestCase):
+    def test_acces_et_ecriture(self):
+        cells = np.random.default_rng(2).integers(0, 4, (5, 7)).astype(np.uint8)
+        grid = SparseGrid.from_array(cells)
+        np.testing.assert_array_equal(grid.to_array(), cells)
+        self.assertEqual(grid[1][3], TerrainType(cells[1, 3]))
+        grid[1][3] = TerrainType.BURNT
+        grid.set_cells([0, 1], TerrainType.EMPTY.value)
+        cells[1, 3] = TerrainType.BURNT.value
+        cells[0, :2] = TerrainType.EMPTY.value
+        np.testing.assert_array_equal(grid.to_array(), cells)
+        for terrain in TerrainType:
+            self.assertEqual(grid.count(terrain), int(np.count_nonzero(cells == terrain.value)))
+
+    def test_memoire_proportionnelle_aux_arbres(self):
+        grid = SparseGrid(10000, 10000)
+        grid.set_cells([5, 70000], TerrainType.TREE.value)
+        self.assertEqual(sum(cells.size for cells in grid.layers.values()), 2)
+        self.assertEqual(grid.count(TerrainType.EMPTY), 10000 * 10000 - 2)
+
+    def test_eau_en_masque_partage(self):
+        cells = np.zeros((6, 9), dtype=np.uint8)
+        cells[1:4, 2:7] = TerrainType.WATER.value
+        cells[5, 0] = TerrainType.TREE.value
+        grid = SparseGrid.from_array(cells)
+        self.assertNotIn(TerrainType.WATER.value, grid.layers)
+        self.assertEqual(grid.count(TerrainType.WATER), 15)
+        self.assertEqual(grid[2][3], TerrainType.WATER)
+        self.assertEqual(list(grid[1]), [TerrainType(value) for value in cells[1]])
+
+        # les copies partagent le masque de l'eau jusqu'à ce qu'une écriture le change
+        copy_ = grid.copy()
+        copy_.set_cells([0, 45], TerrainType.BURNT.value)
+        self.assertIs(copy_.water, grid.water)
+        copy_[2][3] = TerrainType.TREE
+        self.assertIsNot(copy_.water, grid.water)
+        self.assertEqual(grid[2][3], TerrainType.WATER)
+        self.assertEqual(copy_.count(TerrainType.WATER), 14)
+
+    def test_carte_peu_boisee_plus_legere_que_dense(self):
+        sim = ForestFireSimulator(2000, 2000, backend="sparse")
+        sim.map_generator(tree_percentage=0.02, water_percentage=0.5, seed=1)
+        dense = 2000 * 2000
+        # carte + carte courante : arbres en indices, eau en bits partagés
+        self.assertLess(sim.map.nbytes + sim.current_map.nbytes, dense)
+        self.assertEqual(sim.map.count(TerrainType.TREE), len(sim._tree_positions(sim.map)))
+
+
+class TestSparseBackend(unittest.TestCase):
+    def make(self, backend, **kwargs):
+        sim = ForestFireSimulator(25, 18, backend=backend, **kwargs)
+        sim.map_generator(0.55, 0.1, seed=7)
+        return sim
+
+    def test_carte_identique_au_backend_numpy(self):
+        dense, sparse = self.make("numpy"), self.make("sparse")
+        self.assertIsInstance(sparse.map, SparseGrid)
+        np.testing.assert_array_equal(sparse.map.to_array(), dense.map.data)
+
+    def test_feu_identique(self):
+        for kwargs in ({}, {"connectivity": 4, "wrap": True}):
+            dense, sparse = self.make("numpy", **kwargs), self.make("sparse", **kwargs)
+            x, y = np.argwhere(dense.map.data == TerrainType.TREE.value)[0][::-1]
+            self.assertEqual(sparse.simulate_fire(x, y), dense.simulate_fire(x, y))
+            np.testing.assert_array_equal(sparse.current_map.to_array(), dense.current_map.data)
+            sparse.reset_map()
+            self.assertEqual(sparse.current_map, sparse.map)
+
+    def test_coupes_identiques(self):
+        dense, sparse = self.make("numpy"), self.make("sparse")
+        x, y = np.argwhere(dense.map.data == TerrainType.TREE.value)[0][::-1]
+        for mode in ForestFireSimulator.CUT_MODES:
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(sparse.apply_smart_preventive_cut(x, y, mode=mode),
+                                 dense.apply_smart_preventive_cut(x, y, mode=mode))
+        np.testing.assert_array_equal(sparse.map.to_array(), dense.map.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
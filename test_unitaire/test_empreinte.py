@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import copy
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType, TerrainGrid
+from empreinte import FireCache, FireRecord, tree_fingerprint, zobrist_hash
+
+
+def fingerprint_of(grid):
+    return tree_fingerprint(grid.data == TerrainType.TREE.value)
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_mise_a_jour_incrementale(self):
+        grid = TerrainGrid(np.random.default_rng(0).integers(0, 3, (6, 7)))
+        grid.start_journal()
+        grid.track_fingerprint()
+        grid.set_cell(0, 0, TerrainType.TREE.value)
+        grid.set_cell(1, 0, TerrainType.EMPTY.value)
+        self.assertEqual(grid.fingerprint, fingerprint_of(grid))
+        mark = grid.checkpoint()
+        grid.set_cells(np.array([3, 10, 20]), TerrainType.BURNT.value)
+        grid.set_cell(3, 0, TerrainType.TREE.value)
+        self.assertEqual(grid.fingerprint, fingerprint_of(grid))
+        grid.rollback(mark)
+        self.assertEqual(grid.fingerprint, fingerprint_of(grid))
+        self.assertEqual(grid.copy().fingerprint, grid.fingerprint)
+        grid.rollback(0)
+        self.assertEqual(grid.fingerprint, fingerprint_of(grid))
+
+    def test_coupe_bascule_une_cle(self):
+        trees = np.ones((4, 4), dtype=bool)
+        cut = trees.copy()
+        cut[2, 1] = False
+        self.assertEqual(tree_fingerprint(trees) ^ zobrist_hash(9), tree_fingerprint(cut))
+        self.assertNotEqual(tree_fingerprint(trees), tree_fingerprint(cut))
+        self.assertEqual(tree_fingerprint(np.zeros((4, 4), dtype=bool)), 0)
+
+
+class TestFireCache(unittest.TestCase):
+    def test_lru_et_compteurs(self):
+        cache = FireCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)  # évince "b", le moins récemment utilisé
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evictions": 1, "size": 2, "capacity": 2})
+        with self.assertRaises(ValueError):
+            FireCache(0)
+
+    def test_feu_memorise_et_borne(self):
+        cells = np.array([7, 3, 9, 1])
+        complete, partial = FireRecord(cells), FireRecord(cells[:2], complete=False)
+        self.assertEqual(complete.burnt().tolist(), [7, 3, 9, 1])
+        self.assertEqual(complete.burnt(2).tolist(), [7, 3])
+        self.assertEqual(partial.burnt(2).tolist(), [7, 3])
+        self.assertIsNone(partial.burnt(3))
+        self.assertIsNone(partial.burnt())
+        # cases triées : seul le feu complet peut en être lu
+        self.assertIsNone(FireRecord(np.sort(cells), ordered=False).burnt(2))
+        self.assertEqual(FireRecord(np.sort(cells), ordered=False).burnt(10).tolist(), [1, 3, 7, 9])
+
+        cache = FireCache(4)
+        cache.put("feu", partial)
+        self.assertIsNone(cache.get("feu", lambda record: record.burnt()))
+        self.assertEqual(cache.get("feu", lambda record: record.burnt(1)).tolist(), [7])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIs(cache.peek("feu"), partial)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_simulateur_identique_avec_cache(self):
+        sim = ForestFireSimulator(14, 12, backend="numpy")
+        sim.map_generator(tree_percentage=0.65, water_percentage=0.05, seed=5)
+        sim.map[6][7] = TerrainType.TREE
+        reference = copy.deepcopy(sim)
+        cache = sim.enable_fire_cache(16)
+
+        for engine in ("queue", "component", "queue"):
+            sim.reset_map()
+            reference.reset_map()
+            self.assertEqual(sim.simulate_fire(7, 6, engine=engine), reference.simulate_fire(7, 6))
+            self.assertTrue(np.array_equal(sim.current_map.data, reference.current_map.data))
+            self.assertEqual(sim.current_map.fingerprint, fingerprint_of(sim.current_map))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        burnt = []
+        sim.events.subscribe("cell_burnt", lambda event, **data: burnt.append((data["x"], data["y"])))
+        sim.reset_map()
+        count = sim.simulate_fire(7, 6)
+        self.assertEqual(len(burnt), count)
+        self.assertTrue(all(sim.current_map[y][x] == TerrainType.BURNT for x, y in burnt))
+
+    def test_recherche_de_coupes_reutilise_les_feux(self):
+        sim = ForestFireSimulator(10, 9, backend="numpy")
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=2)
+        sim.map[4][5] = TerrainType.TREE
+        reference = copy.deepcopy(sim)
+        cache = sim.enable_fire_cache(1024)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(sim.apply_smart_n_preventive_cut(5, 4, 2),
+                             reference.apply_smart_n_preventive_cut(5, 4, 2))
+        # le feu de chaque coupe retenue a déjà été simulé pendant la recherche
+        self.assertGreaterEqual(cache.hits, 2)
+        self.assertEqual(sim.current_map, reference.current_map)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import logging
+from contextlib import redirect_stdout
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+import copy
+
+
+class TestFireEvents(unittest.TestCase):
+    def setUp(self):
+        self.map = [
+            [0, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 0],
+            [0, 1, 0, 0],
+        ]
+        self.sim = ForestFireSimulator(4, 4)
+        self.sim.map = [[TerrainType(cell) for cell in row] for row in self.map]
+        self.sim.current_map = copy.deepcopy(self.sim.map)
+
+    def test_simulation_silencieuse(self):
+        f = io.StringIO()
+        with redirect_stdout(f):
+            self.sim.simulate_fire(1, 1)
+        self.assertEqual(f.getvalue(), "")
+
+    def test_abonnement(self):
+        received = []
+        self.sim.events.subscribe("ignition", lambda event, **data: received.append((event, data)))
+        self.sim.events.subscribe("cell_burnt", lambda event, **data: received.append((event, data)))
+        self.sim.events.subscribe("fire_finished", lambda event, **data: received.append((event, data)))
+        self.sim.simulate_fire(1, 1)
+
+        self.assertEqual(received[0], ("ignition", {"x": 1, "y": 1, "burning": True}))
+        self.assertEqual([data["total"] for event, data in received if event == "cell_burnt"], [1, 2, 3])
+        self.assertEqual(received[-1], ("fire_finished", {"x": 1, "y": 1, "burnt": 3}))
+
+    def test_abonnement_moteur_composante(self):
+        burnt = []
+        self.sim.events.subscribe("cell_burnt", lambda event, **data: burnt.append((data["x"], data["y"])))
+        self.sim.simulate_fire(1, 1, engine="component")
+        self.assertCountEqual(burnt, [(1, 0), (0, 1), (1, 1)])
+
+    def test_evenement_inconnu(self):
+        with self.assertRaises(ValueError):
+            self.sim.events.subscribe("inconnu", print)
+
+    def test_compteurs(self):
+        with redirect_stdout(io.StringIO()):
+            self.sim.apply_smart_preventive_cut(0, 1)
+        counters = self.sim.events.counters
+        # feu initial + 2 candidats brûlés par ce feu + feu après la coupe ; (1, 3) n'est pas évalué
+        self.assertEqual(counters["fires"], 4)
+        self.assertEqual(counters["cuts_evaluated"], 2)
+
+    def test_logging(self):
+        adapter = self.sim.enable_logging(level=logging.INFO)
+        with self.assertLogs("feu_foret", level="INFO") as logs:
+            self.sim.simulate_fire(1, 1)
+            self.sim.simulate_fire(0, 0)
+        self.assertIn("INFO:feu_foret:Début de l'incendie à la position (1, 1)", logs.output)
+        self.assertIn("INFO:feu_foret:Case brûlée: (1, 1) - Total: 1", logs.output)
+        self.assertIn("INFO:feu_foret:Incendie terminé - Total de cases brûlées: 3", logs.output)
+        self.assertIn("INFO:feu_foret:Pas d'arbre à brûler à la position (0, 0)", logs.output)
+
+        self.sim.disable_logging(adapter)
+        self.assertTrue(all(not callbacks for callbacks in self.sim.events.listeners.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
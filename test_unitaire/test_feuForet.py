@@ -8,7 +8,10 @@ import unittest
 from contextlib import redirect_stdout
 from cas_pratique import ForestFireSimulator
 from cas_pratique import TerrainType
+from cas_pratique import TerrainGrid
 import copy
+import base64
+import numpy as np
 
 class TestFireSimulation(unittest.TestCase):
     def setUp(self):
@@ -251,6 +254,224 @@ class TestFireSimulation(unittest.TestCase):
         # Nettoyage
         os.remove(test_filename)
 
+    def test_export_html_canvas(self):
+        test_filename = "test_export_canvas.html"
+        self.sim.export_html(filename=test_filename, render="canvas")
+
+        with open(test_filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        os.remove(test_filename)
+
+        self.assertIn("<canvas", content)
+        self.assertNotIn('class="cell"', content)
+        self.assertIn("Statistiques de la simulation", content)
+        # la grille est encodée une seule fois, octet par case
+        encoded = content.split('type="application/octet-stream">')[1].split("</script>")[0]
+        self.assertEqual(list(base64.b64decode(encoded)), [cell for row in self.map for cell in row])
+
+    def test_export_html_auto_grande_carte(self):
+        test_filename = "test_export_auto.html"
+        sim = ForestFireSimulator(200, 100, backend="numpy")
+        sim.map_generator()
+        sim.export_html(filename=test_filename)
+        with open(test_filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        os.remove(test_filename)
+        self.assertIn("<canvas", content)
+        self.assertLess(len(content), 2 * 200 * 100)
+
+    def test_export_html_rendu_inconnu(self):
+        with self.assertRaises(ValueError):
+            self.sim.export_html(filename="inutile.html", render="inconnu")
+
+
+class TestSeededMapGenerator(unittest.TestCase):
+    def test_meme_graine_meme_carte(self):
+        sim_list = ForestFireSimulator(40, 30)
+        sim_list.map_generator(seed=42)
+        sim_numpy = ForestFireSimulator(40, 30, backend="numpy")
+        sim_numpy.map_generator(seed=42)
+        self.assertEqual(sim_numpy.map, sim_list.map)
+        self.assertEqual(sim_numpy.seed, 42)
+
+        sim_numpy.map_generator(seed=43)
+        self.assertNotEqual(sim_numpy.map, sim_list.map)
+
+    def test_generator_et_graine_reproductible(self):
+        sim = ForestFireSimulator(20, 10, backend="numpy")
+        sim.map_generator(seed=np.random.default_rng(1))
+        first = sim.map.copy()
+        sim.map_generator(seed=sim.seed)
+        self.assertEqual(sim.map, first)
+
+        # sans graine, la graine tirée permet de reproduire la carte
+        sim.map_generator(smoothing=2)
+        first = sim.map.copy()
+        sim.map_generator(seed=sim.seed, smoothing=2)
+        self.assertEqual(sim.map, first)
+
+    def test_pourcentages(self):
+        for smoothing in (0, 3):
+            sim = ForestFireSimulator(300, 300, backend="numpy")
+            sim.map_generator(tree_percentage=0.5, water_percentage=0.2, seed=7, smoothing=smoothing)
+            self.assertAlmostEqual(sim.map.count(TerrainType.TREE) / 90000, 0.5, delta=0.05)
+            self.assertAlmostEqual(sim.map.count(TerrainType.WATER) / 90000, 0.2, delta=0.05)
+
+    def test_lissage_regroupe_les_arbres(self):
+        def boundaries(grid):
+            trees = grid.data == TerrainType.TREE.value
+            return np.count_nonzero(trees[:, 1:] != trees[:, :-1]) + np.count_nonzero(trees[1:] != trees[:-1])
+
+        sim = ForestFireSimulator(300, 600, backend="numpy")
+        sim.map_generator(seed=3)
+        independent = boundaries(sim.map)
+        sim.map_generator(seed=3, smoothing=3)
+        self.assertLess(boundaries(sim.map), independent / 2)
+
+    def test_lissage_invalide(self):
+        sim = ForestFireSimulator(10, 10, backend="numpy")
+        with self.assertRaises(ValueError):
+            sim.map_generator(smoothing=-1)
+
+
+class TestIgnitionRisk(unittest.TestCase):
+    def setUp(self):
+        self.map = [
+            [0, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 0],
+            [0, 1, 0, 0],
+        ]
+        self.sim = ForestFireSimulator(4, 4)
+        self.sim.map = [[TerrainType(cell) for cell in row] for row in self.map]
+        self.sim.current_map = copy.deepcopy(self.sim.map)
+
+    def test_raster_identique_aux_simulations(self):
+        risk = self.sim.ignition_risk()
+        for y in range(4):
+            for x in range(4):
+                self.sim.reset_map()
+                self.assertEqual(risk["burn_size"][y][x], self.sim.simulate_fire(x, y))
+
+    def test_statistiques(self):
+        risk = self.sim.ignition_risk()
+        self.assertEqual(risk["largest_cluster"], 3)
+        self.assertEqual(risk["clusters"], 2)
+        self.assertAlmostEqual(risk["expected_burn"], (3 * 3 + 1) / 16)
+        self.assertAlmostEqual(risk["expected_burn_trees"], (3 * 3 + 1) / 4)
+
+    def test_carte_sans_arbre(self):
+        sim = ForestFireSimulator(3, 2, backend="numpy")
+        sim.map_generator(tree_percentage=0, water_percentage=0.5)
+        risk = sim.ignition_risk()
+        self.assertEqual(risk["largest_cluster"], 0)
+        self.assertEqual(risk["expected_burn_trees"], 0.0)
+        self.assertFalse(risk["burn_size"].any())
+
+
+class TestNumpyBackend(unittest.TestCase):
+    def setUp(self):
+        self.map = [
+            [0, 1, 0, 0],
+            [1, 1, 0, 0],
+            [0, 0, 0, 0],
+            [0, 1, 0, 0],
+        ]
+        self.sim = ForestFireSimulator(4, 4, backend="numpy")
+        self.sim.map = TerrainGrid(self.map)
+        self.sim.current_map = self.sim.map.copy()
+
+    def test_backend_invalide(self):
+        with self.assertRaises(ValueError):
+            ForestFireSimulator(4, 4, backend="inconnu")
+
+    def test_map_generator_uint8(self):
+        sim = ForestFireSimulator(15, 12, backend="numpy")
+        sim.map_generator(tree_percentage=0.5, water_percentage=0.2)
+        self.assertEqual(sim.map.data.dtype.name, "uint8")
+        self.assertEqual(sim.map.data.shape, (12, 15))
+        self.assertEqual(len(sim.map), 12)
+        for row in sim.map:
+            self.assertEqual(len(row), 15)
+            for cell in row:
+                self.assertIn(cell, [TerrainType.EMPTY, TerrainType.TREE, TerrainType.WATER])
+
+    def test_acces_compatible(self):
+        self.assertEqual(self.sim.map[1][0], TerrainType.TREE)
+        self.assertEqual(self.sim.map[2][2], TerrainType.EMPTY)
+        self.sim.current_map[2][2] = TerrainType.WATER
+        self.assertEqual(self.sim.current_map.data[2, 2], TerrainType.WATER.value)
+        self.assertEqual(self.sim.map, [[TerrainType(cell) for cell in row] for row in self.map])
+
+    def test_simulate_fire_et_reset(self):
+        burnt = self.sim.simulate_fire(1, 1)
+        self.assertEqual(burnt, 3)
+        self.assertEqual(self.sim.current_map[0][1], TerrainType.BURNT)
+        self.assertEqual(self.sim.current_map[3][1], TerrainType.TREE)
+        self.sim.reset_map()
+        self.assertEqual(self.sim.current_map, self.sim.map)
+        self.assertIsNot(self.sim.current_map.data, self.sim.map.data)
+
+    def test_apply_smart_preventive_cut(self):
+        result = self.sim.apply_smart_preventive_cut(0, 1)
+        self.assertEqual(result, (1, 0, 3, 2))
+
+    def test_reset_journalise(self):
+        self.sim.reset_map()
+        current = self.sim.current_map
+        self.sim.simulate_fire(1, 1)
+        self.assertEqual(len(current.journal), 3)
+        self.sim.reset_map()
+        # restauration en place des seules cases modifiées
+        self.assertIs(self.sim.current_map, current)
+        self.assertEqual(current.journal, [])
+        self.assertEqual(self.sim.current_map, self.sim.map)
+
+        self.sim.simulate_fire(1, 1, engine="component")
+        self.sim.reset_map()
+        self.assertIs(self.sim.current_map, current)
+        self.assertEqual(self.sim.current_map, self.sim.map)
+
+    def test_reset_apres_modification_de_map(self):
+        self.sim.reset_map()
+        current = self.sim.current_map
+        self.sim.map[0][1] = TerrainType.EMPTY
+        self.sim.reset_map()
+        self.assertIsNot(self.sim.current_map, current)
+        self.assertEqual(self.sim.current_map[0][1], TerrainType.EMPTY)
+
+    def test_checkpoint_rollback(self):
+        self.sim.reset_map()
+        self.sim.current_map[3][1] = TerrainType.EMPTY
+        checkpoint = self.sim.checkpoint()
+        self.sim.simulate_fire(1, 1)
+        self.sim.rollback(checkpoint)
+        self.assertEqual(self.sim.current_map[1][1], TerrainType.TREE)
+        self.assertEqual(self.sim.current_map[3][1], TerrainType.EMPTY)
+        self.sim.reset_map()
+        self.assertEqual(self.sim.current_map[3][1], TerrainType.TREE)
+
+    def test_checkpoint_rollback_listes(self):
+        sim = ForestFireSimulator(4, 4)
+        sim.map = [[TerrainType(cell) for cell in row] for row in self.map]
+        sim.reset_map()
+        checkpoint = sim.checkpoint()
+        sim.simulate_fire(1, 1)
+        sim.rollback(checkpoint)
+        self.assertEqual(sim.current_map, sim.map)
+
+    def test_export_et_display(self):
+        test_filename = "test_export_numpy.html"
+        self.sim.simulate_fire(1, 1)
+        f = io.StringIO()
+        with redirect_stdout(f):
+            self.sim.display_map()
+            self.sim.export_html(filename=test_filename)
+        self.assertIn("- Terrain brûlé: 3/16", f.getvalue())
+        with open(test_filename, 'r', encoding='utf-8') as html:
+            self.assertIn("🔥", html.read())
+        os.remove(test_filename)
+
 
 if __name__ == "__main__":
     unittest.main()
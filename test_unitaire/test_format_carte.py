@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import tempfile
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from format_carte import read_map_file, write_map_file, HEADER_SIZE
+
+
+class TestMapFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "carte.ffmp")
+        self.sim = ForestFireSimulator(13, 7, backend="numpy")
+        self.sim.map_generator(seed=2**100 + 5)
+        self.sim.map[3][6] = TerrainType.TREE
+        self.sim.simulate_fire(6, 3, engine="component")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_aller_retour(self):
+        for packing in ("uint8", "2bit"):
+            for mmap in (True, False):
+                self.sim.save_map(self.filename, packing=packing)
+                loaded = ForestFireSimulator.load_map(self.filename, mmap=mmap)
+                self.assertEqual((loaded.width, loaded.height), (13, 7))
+                self.assertEqual(loaded.seed, 2**100 + 5)
+                self.assertEqual(loaded.map, self.sim.map)
+                self.assertEqual(loaded.current_map, self.sim.current_map)
+
+    def test_taille_du_fichier(self):
+        self.sim.save_map(self.filename, packing="2bit", include_current=False)
+        self.assertEqual(os.path.getsize(self.filename), HEADER_SIZE + (13 * 7 + 3) // 4)
+        self.sim.save_map(self.filename)
+        self.assertEqual(os.path.getsize(self.filename), HEADER_SIZE + 2 * 13 * 7)
+
+    def test_memory_map_copie_sur_ecriture(self):
+        self.sim.save_map(self.filename, include_current=False)
+        loaded = ForestFireSimulator.load_map(self.filename)
+        self.assertIsInstance(loaded.map.data.base, np.memmap)
+        self.assertEqual(loaded.current_map, loaded.map)
+
+        loaded.simulate_fire(6, 3)
+        loaded.reset_map()
+        self.assertEqual(loaded.current_map, self.sim.map)
+        loaded.map[0][0] = TerrainType.WATER
+        # le fichier n'est pas modifié
+        self.assertEqual(ForestFireSimulator.load_map(self.filename).map, self.sim.map)
+
+    def test_fichier_invalide(self):
+        with open(self.filename, "wb") as f:
+            f.write(b"pas une carte" * 10)
+        with self.assertRaises(ValueError):
+            read_map_file(self.filename)
+        with self.assertRaises(ValueError):
+            write_map_file(self.filename, [np.full((2, 2), 5, dtype=np.uint8)], packing="2bit")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from coupes import component_graph
+from pare_feu import min_vertex_cut, plan_firebreak
+
+
+def two_corridors():
+    # massif de départ à gauche, relié au grand massif de droite par deux couloirs d'une case
+    trees = np.zeros((9, 14), dtype=bool)
+    trees[2:7, 0:4] = True
+    trees[2, 4:7] = True
+    trees[6, 4:7] = True
+    trees[:, 7:] = True
+    return trees
+
+
+class TestMinVertexCut(unittest.TestCase):
+    def test_chemin_et_limite(self):
+        trees = np.ones((1, 6), dtype=bool)
+        cells, indptr, indices = component_graph(trees, 0, 0)
+        sinks = [False] * 5 + [True]
+        self.assertEqual(len(min_vertex_cut(indptr, indices, 0, sinks)), 1)
+        self.assertEqual(min_vertex_cut(indptr, indices, 0, sinks), [1])
+
+        trees = two_corridors()
+        cells, indptr, indices = component_graph(trees, 0, 4)
+        root = int(np.searchsorted(cells, 4 * 14))
+        sinks = (cells % 14 >= 7).tolist()
+        self.assertEqual(len(min_vertex_cut(indptr, indices, root, sinks)), 2)
+        self.assertIsNone(min_vertex_cut(indptr, indices, root, sinks, limit=1))
+
+    def test_zone_protegee_adjacente(self):
+        trees = np.ones((3, 3), dtype=bool)
+        protected = np.zeros((3, 3), dtype=bool)
+        protected[1, 1] = True
+        with self.assertRaises(ValueError):
+            plan_firebreak(trees, 0, 0, protected=protected)
+
+
+class TestFirebreak(unittest.TestCase):
+    def setUp(self):
+        self.sim = ForestFireSimulator(14, 9, backend="numpy")
+        self.sim.map = self.sim._from_array(np.where(two_corridors(), TerrainType.TREE.value, TerrainType.EMPTY.value))
+        self.sim.reset_map()
+
+    def test_budget_bat_le_glouton(self):
+        with redirect_stdout(io.StringIO()):
+            greedy = self.sim.apply_smart_n_preventive_cut(0, 4, 2, mode="dominator")
+        # aucune coupe isolée ne sépare les deux massifs : le glouton n'écorne que des coins
+        self.assertGreater(greedy[-1][3], 80)
+        self.sim.map = self.sim._from_array(np.where(two_corridors(), TerrainType.TREE.value, TerrainType.EMPTY.value))
+        self.sim.reset_map()
+
+        with redirect_stdout(io.StringIO()):
+            cuts, before, after = self.sim.apply_firebreak(0, 4, budget=2)
+        self.assertEqual(len(cuts), 2)
+        self.assertEqual(before, int(two_corridors().sum()))
+        self.assertLessEqual(after, 5 * 4 + 4)
+        self.assertEqual(self.sim.current_map.count(TerrainType.BURNT), after)
+        for x, y in cuts:
+            self.assertEqual(self.sim.map[y][x], TerrainType.EMPTY)
+
+    def test_zone_protegee(self):
+        protected = [(12, 0), (12, 8)]
+        with redirect_stdout(io.StringIO()):
+            cuts, before, after = self.sim.apply_firebreak(0, 4, protected=protected)
+        self.assertEqual(len(cuts), 2)
+        for x, y in protected:
+            self.assertEqual(self.sim.current_map[y][x], TerrainType.TREE)
+
+    def test_zone_protegee_hors_budget(self):
+        with redirect_stdout(io.StringIO()):
+            self.assertIsNone(self.sim.apply_firebreak(0, 4, protected=[(12, 0)], budget=1))
+        self.assertEqual(self.sim.map.count(TerrainType.EMPTY), 14 * 9 - int(two_corridors().sum()))
+
+
+if __name__ == '__main__':
+    unittest.main()
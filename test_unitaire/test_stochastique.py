@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from stochastique import spread_probabilities
+
+
+class TestFireEnsemble(unittest.TestCase):
+    def setUp(self):
+        self.sim = ForestFireSimulator(30, 20, backend="numpy")
+        self.sim.map_generator(tree_percentage=0.65, water_percentage=0.05, seed=12)
+        self.sim.map[10][15] = TerrainType.TREE
+        self.sim.reset_map()
+
+    def test_probabilite_un_deterministe(self):
+        result = self.sim.simulate_fire_ensemble(15, 10, realizations=5, p_spread=1.0, seed=0)
+        burnt = self.sim.simulate_fire(15, 10, engine="component")
+        self.assertTrue(np.all(result["burn_counts"] == burnt))
+        self.assertTrue(np.array_equal(result["burn_probability"] == 1, self.sim.current_map.data == TerrainType.BURNT.value))
+
+    def test_probabilite_nulle(self):
+        result = self.sim.simulate_fire_ensemble(15, 10, realizations=10, p_spread=0.0, seed=0)
+        self.assertTrue(np.all(result["burn_counts"] == 1))
+
+    def test_reproductible_et_independant_des_processus(self):
+        first = self.sim.simulate_fire_ensemble(15, 10, realizations=50, p_spread=0.5, seed=3, batch_size=16)
+        again = self.sim.simulate_fire_ensemble(15, 10, realizations=50, p_spread=0.5, seed=3, batch_size=16, workers=2)
+        self.assertTrue(np.array_equal(first["burn_counts"], again["burn_counts"]))
+        self.assertTrue(np.array_equal(first["burn_probability"], again["burn_probability"]))
+        # current_map n'est pas modifiée
+        self.assertEqual(self.sim.current_map, self.sim.map)
+
+    def test_vent(self):
+        probabilities = spread_probabilities(0.5, wind=(1, 0), wind_strength=1.0)
+        # voisin est (0, 1) : deux fois plus probable ; voisin ouest (0, -1) : jamais
+        self.assertAlmostEqual(probabilities[4], 1.0)
+        self.assertAlmostEqual(probabilities[3], 0.0)
+        self.assertAlmostEqual(probabilities[1], 0.5)
+
+        sim = ForestFireSimulator(41, 11, backend="numpy")
+        sim.map = sim._from_array(np.ones((11, 41), dtype=np.uint8))
+        sim.reset_map()
+        result = sim.simulate_fire_ensemble(20, 5, realizations=200, p_spread=0.3, wind=(1, 0), wind_strength=1.0, seed=1)
+        probability = result["burn_probability"]
+        self.assertGreater(probability[:, 21:].sum(), 3 * probability[:, :20].sum())
+
+    def test_parametres_invalides(self):
+        with self.assertRaises(ValueError):
+            self.sim.simulate_fire_ensemble(15, 10, p_spread=1.5)
+        with self.assertRaises(ValueError):
+            self.sim.simulate_fire_ensemble(15, 10, realizations=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import io
+import copy
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from empreinte import tree_fingerprint
+
+
+class TestMapOverlay(unittest.TestCase):
+    def make(self, backend="numpy"):
+        sim = ForestFireSimulator(14, 10, backend=backend)
+        sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=4)
+        sim.map[5][7] = TerrainType.TREE
+        sim.reset_map()
+        return sim
+
+    def test_feu_sans_modifier_les_cartes(self):
+        for backend in ForestFireSimulator.BACKENDS:
+            sim = self.make(backend)
+            reference = copy.deepcopy(sim)
+            overlay = sim.overlay(cuts=[(8, 5)])
+            burnt = sim.simulate_fire(7, 5, overlay=overlay)
+
+            reference.map[5][8] = TerrainType.EMPTY
+            reference.reset_map()
+            self.assertEqual(burnt, reference.simulate_fire(7, 5))
+            for y in range(sim.height):
+                for x in range(sim.width):
+                    self.assertEqual(overlay.get(x, y), reference.current_map[y][x].value)
+            # la carte et l'état courant ne sont pas touchés
+            self.assertEqual(sim.map, self.make(backend).map)
+            self.assertEqual(sim.current_map, sim.map)
+
+    def test_meilleure_coupe_sans_effet_de_bord(self):
+        sim = self.make()
+        reference = copy.deepcopy(sim)
+        x, y, before, after = sim.find_best_cut(7, 5)
+        self.assertEqual(sim.map, reference.map)
+        self.assertEqual(sim.current_map, reference.current_map)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(reference.apply_smart_preventive_cut(7, 5), (x, y, before, after))
+
+        # une coupe envisagée dans la surcouche : même résultat qu'une seconde coupe réelle
+        overlay = sim.overlay(cuts=[(x, y)])
+        with redirect_stdout(io.StringIO()):
+            expected = reference.apply_smart_preventive_cut(7, 5)
+        self.assertEqual(sim.find_best_cut(7, 5, overlay), expected)
+        self.assertEqual(len(overlay), 1)
+
+    def test_requetes_concurrentes(self):
+        sim = self.make()
+        sim.enable_fire_cache(64)
+        trees = [(x, y) for y in range(sim.height) for x in range(sim.width) if sim.map[y][x] == TerrainType.TREE]
+        expected = []
+        for cut in trees:
+            reference = copy.deepcopy(sim)
+            reference.map[cut[1]][cut[0]] = TerrainType.EMPTY
+            reference.reset_map()
+            expected.append(reference.simulate_fire(7, 5) if cut != (7, 5) else 0)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda cut: sim.simulate_fire(7, 5, overlay=sim.overlay([cut])), trees))
+        self.assertEqual(results, expected)
+        self.assertEqual(sim.map, self.make().map)
+
+    def test_empreinte_de_la_surcouche(self):
+        sim = self.make()
+        sim.enable_fire_cache(16)
+        overlay = sim.overlay(cuts=[(8, 5)])
+        overlay.set(0, 0, TerrainType.TREE.value)
+        sim.simulate_fire(7, 5, overlay=overlay)
+        values = np.array([[overlay.get(x, y) for x in range(sim.width)] for y in range(sim.height)])
+        self.assertEqual(overlay.fingerprint, tree_fingerprint(values == TerrainType.TREE.value))
+
+        # même arbres, même départ : le second feu est lu dans le cache
+        hits = sim.fire_cache.hits
+        self.assertEqual(sim.simulate_fire(7, 5, overlay=sim.overlay(cuts=[(8, 5)])),
+                         sim.simulate_fire(7, 5, overlay=sim.overlay(cuts=[(8, 5)])))
+        self.assertEqual(sim.fire_cache.hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
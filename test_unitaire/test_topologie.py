@@ -0,0 +1,115 @@
+import io
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import copy
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from composantes import label_components, label_components_parallel
+from topologie import get_topology
+
+TOPOLOGIES = [(4, False), (8, False), ("hex", False), (4, True), (8, True), ("hex", True)]
+
+
+class TestTopology(unittest.TestCase):
+    def test_voisins(self):
+        self.assertCountEqual(get_topology(5, 4, 4).neighbours(0, 0), [(1, 0), (0, 1)])
+        self.assertCountEqual(get_topology(5, 4, 4, True).neighbours(0, 0), [(1, 0), (0, 1), (4, 0), (0, 3)])
+        # ligne paire : voisins diagonaux à gauche, ligne impaire : à droite
+        self.assertCountEqual(get_topology(5, 4, "hex").neighbours(2, 2), [(1, 1), (2, 1), (1, 2), (3, 2), (1, 3), (2, 3)])
+        self.assertCountEqual(get_topology(5, 4, "hex").neighbours(2, 1), [(2, 0), (3, 0), (1, 1), (3, 1), (2, 2), (3, 2)])
+        self.assertEqual(len(get_topology(5, 4, 8, True).neighbours(0, 0)), 8)
+        self.assertIs(get_topology(5, 4, 8, True), get_topology(5, 4, 8, True))
+
+    def test_voisinage_symetrique_et_aretes_uniques(self):
+        mask = np.random.default_rng(1).random((6, 7)) < 0.7
+        for connectivity, wrap in TOPOLOGIES:
+            topology = get_topology(7, 6, connectivity, wrap)
+            expected = set()
+            for y, x in zip(*np.nonzero(mask)):
+                for nx, ny in topology.neighbours(int(x), int(y)):
+                    self.assertIn((int(x), int(y)), topology.neighbours(nx, ny))
+                    if mask[ny, nx]:
+                        expected.add(frozenset((int(y * 7 + x), ny * 7 + nx)))
+            u, v = topology.edges(mask)
+            edges = [frozenset(pair) for pair in zip(u.tolist(), v.tolist())]
+            self.assertEqual(len(edges), len(set(edges)))
+            self.assertEqual(set(edges), expected)
+
+    def test_etiquetage_par_bandes_identique(self):
+        trees = np.random.default_rng(2).random((40, 30)) < 0.45
+        for connectivity, wrap in TOPOLOGIES:
+            topology = get_topology(30, 40, connectivity, wrap)
+            expected = label_components(trees, topology)
+            for strips in (3, 7):
+                labels = label_components_parallel(trees, workers=2, strips=strips, topology=topology)
+                self.assertTrue(np.array_equal(labels, expected), (connectivity, wrap, strips))
+
+    def test_etiquetage_par_bandes_grilles_etroites(self):
+        # largeur 2 : sur un tore, le voisin par le repli est aussi le voisin direct
+        rng = np.random.default_rng(3)
+        for width in (2, 3):
+            for connectivity, wrap in TOPOLOGIES:
+                topology = get_topology(width, 12, connectivity, wrap)
+                for _ in range(10):
+                    trees = rng.random((12, width)) < 0.5
+                    expected = label_components(trees, topology)
+                    labels = label_components_parallel(trees, workers=2, strips=3, topology=topology)
+                    self.assertTrue(np.array_equal(labels, expected), (width, connectivity, wrap))
+
+    def test_hexagonal_torique_lignes_impaires(self):
+        with self.assertRaises(ValueError):
+            get_topology(4, 5, "hex", True)
+        with self.assertRaises(ValueError):
+            ForestFireSimulator(4, 4, connectivity=6)
+
+
+class TestEnginesTopology(unittest.TestCase):
+    def test_moteurs_identiques(self):
+        for connectivity, wrap in TOPOLOGIES:
+            sim = ForestFireSimulator(16, 12, backend="numpy", connectivity=connectivity, wrap=wrap)
+            sim.map_generator(tree_percentage=0.5, water_percentage=0.05, seed=3)
+            sim.map[6][8] = TerrainType.TREE
+            sim.reset_map()
+            burnt = sim.simulate_fire(8, 6)
+            queue = sim.current_map.data.copy()
+            sim.reset_map()
+            self.assertEqual(sim.simulate_fire(8, 6, engine="component"), burnt)
+            self.assertTrue(np.array_equal(sim.current_map.data, queue))
+            sim.reset_map()
+            history = sim.simulate_fire_steps(8, 6)
+            self.assertTrue(np.array_equal(sim.current_map.data, queue))
+            sim.reset_map()
+            self.assertEqual(sim.simulate_fires([(8, 6)])["burnt"], burnt)
+            sim.reset_map()
+            self.assertTrue(np.array_equal(np.isfinite(sim.fire_arrival_times([(8, 6)])), queue == TerrainType.BURNT.value))
+            self.assertEqual(sim.ignition_risk()["burn_size"][6, 8], burnt)
+            ensemble = sim.simulate_fire_ensemble(8, 6, realizations=3, p_spread=1.0, seed=0)
+            self.assertTrue(np.all(ensemble["burn_counts"] == burnt))
+            self.assertEqual(history.burnt, burnt)
+
+    def test_quatre_connexite_sans_diagonale(self):
+        sim = ForestFireSimulator(3, 3, connectivity=4)
+        sim.map = [[TerrainType(cell) for cell in row] for row in [[1, 0, 0], [0, 1, 0], [0, 0, 1]]]
+        sim.reset_map()
+        self.assertEqual(sim.simulate_fire(1, 1), 1)
+
+    def test_coupes_identiques(self):
+        for connectivity, wrap in TOPOLOGIES:
+            sim = ForestFireSimulator(10, 8, backend="numpy", connectivity=connectivity, wrap=wrap)
+            sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=4)
+            sim.map[4][5] = TerrainType.TREE
+            exhaustive = copy.deepcopy(sim)
+            incremental = copy.deepcopy(sim)
+            with redirect_stdout(io.StringIO()):
+                expected = exhaustive.apply_smart_n_preventive_cut(5, 4, 2)
+                self.assertEqual(sim.apply_smart_n_preventive_cut(5, 4, 2, mode="dominator"), expected)
+                self.assertEqual(incremental.apply_smart_n_preventive_cut(5, 4, 2, mode="incremental"), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
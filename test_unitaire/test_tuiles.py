@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+import tempfile
+import numpy as np
+from cas_pratique import ForestFireSimulator
+from cas_pratique import TerrainType
+from tuiles import TiledMap
+
+
+class TestTiledMap(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tiles = os.path.join(self.directory.name, "tuiles")
+        self.work = os.path.join(self.directory.name, "travail")
+        self.sim = ForestFireSimulator(37, 29, backend="numpy")
+        self.sim.map_generator(tree_percentage=0.6, water_percentage=0.05, seed=4)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_feu_identique_au_moteur_en_memoire(self):
+        TiledMap.from_array(self.tiles, self.sim.map.data, tile_size=8)
+        tiled = ForestFireSimulator.from_tiles(self.tiles, self.work, cache_tiles=3)
+        trees = np.argwhere(self.sim.map.data == TerrainType.TREE.value)
+        for y, x in trees[::97]:
+            self.sim.reset_map()
+            tiled.reset_map()
+            expected = self.sim.simulate_fire(int(x), int(y), engine="component")
+            self.assertEqual(tiled.simulate_fire(int(x), int(y)), expected)
+            self.assertEqual(tiled._terrain_counts(tiled.current_map), self.sim._terrain_counts(self.sim.current_map))
+            # le cache ne dépasse jamais sa taille
+            self.assertLessEqual(len(tiled.current_map._cache), 3)
+
+        # la carte de base n'est pas modifiée
+        self.assertEqual(tiled._terrain_counts(tiled.map), self.sim._terrain_counts(self.sim.map))
+
+    def test_seules_les_tuiles_atteintes_sont_lues(self):
+        cells = np.zeros((40, 40), dtype=np.uint8)
+        cells[2:5, 2:12] = TerrainType.TREE.value
+        TiledMap.from_array(self.tiles, cells, tile_size=10)
+        tiled = ForestFireSimulator.from_tiles(self.tiles, self.work)
+        self.assertEqual(tiled.simulate_fire(2, 2), 30)
+        # tuile de départ et sa voisine de droite, plus les voisines du bord brûlé
+        self.assertLessEqual(tiled.current_map.loads, 4)
+
+    def test_generation_en_tuiles(self):
+        tiled = TiledMap.create(self.tiles, 37, 29, tile_size=8, tree_percentage=0.6, water_percentage=0.05, seed=4)
+        self.assertEqual((tiled.tiles_y, tiled.tiles_x), (4, 5))
+        self.assertEqual(tiled.tile(3, 4).shape, (5, 5))
+        for y in (0, 13, 28):
+            for x in (0, 20, 36):
+                self.assertEqual(tiled.get(x, y), self.sim.map.data[y, x])
+
+
+    def test_repertoire_de_travail_preserve(self):
+        cells = np.zeros((20, 20), dtype=np.uint8)
+        cells[2:5, 2:12] = TerrainType.TREE.value
+        TiledMap.from_array(self.tiles, cells, tile_size=10)
+        os.makedirs(self.work)
+        precious = os.path.join(self.work, "precious.txt")
+        with open(precious, "w") as f:
+            f.write("à garder")
+        tiled = ForestFireSimulator.from_tiles(self.tiles, self.work)
+        tiled.simulate_fire(2, 2)
+        tiled.current_map.flush()
+        self.assertTrue(any(name.startswith("tuile_") for name in os.listdir(self.work)))
+        tiled.reset_map()
+        self.assertEqual(sorted(os.listdir(self.work)), ["precious.txt"])
+        self.assertEqual(tiled.current_map.get(2, 2), TerrainType.TREE.value)
+
+    def test_overlay_sur_la_carte_de_base_refuse(self):
+        TiledMap.from_array(self.tiles, np.zeros((20, 20), dtype=np.uint8), tile_size=10)
+        before = sorted(os.listdir(self.tiles))
+        with self.assertRaises(ValueError):
+            ForestFireSimulator.from_tiles(self.tiles, self.tiles)
+        with self.assertRaises(ValueError):
+            ForestFireSimulator.from_tiles(self.tiles, os.path.join(self.tiles, "."))
+        self.assertEqual(sorted(os.listdir(self.tiles)), before)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+CONNECTIVITIES = (4, 8, "hex")
+
+# Décalages (dy, dx) des voisins pour les lignes paires et impaires, dans l'ordre de
+# lecture. Grille hexagonale en lignes décalées : les lignes impaires sont décalées
+# d'une demi-case vers la droite.
+_OFFSETS = {
+    4: (((-1, 0), (0, -1), (0, 1), (1, 0)),) * 2,
+    8: (((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)),) * 2,
+    "hex": (((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)),
+            ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1))),
+}
+
+
+def _index_dtype(size: int):
+    return np.int32 if size < 2**31 else np.int64
+
+
+class Topology:
+    """
+    Voisinage d'une grille hauteur x largeur, précalculé une seule fois par taille
+
+    Pour la direction j, le voisin de (x, y) est (col_map[j, y % 2, x], row_map[j, y]),
+    -1 s'il sort de la grille : ces tables tiennent lieu de masques de bord et
+    intègrent le repli torique. Elles ne coûtent que O(directions * (hauteur + largeur)).
+    """
+    __slots__ = ("width", "height", "connectivity", "wrap", "offsets", "row_map", "col_map",
+                 "rows", "cols", "forward", "distances", "real_offsets")
+
+    def __init__(self, width: int, height: int, connectivity=8, wrap: bool = False):
+        if connectivity not in CONNECTIVITIES:
+            raise ValueError(f"Connexité inconnue: {connectivity}")
+        if connectivity == "hex" and wrap and height % 2:
+            raise ValueError("Une grille hexagonale torique doit avoir un nombre pair de lignes")
+        self.width = width
+        self.height = height
+        self.connectivity = connectivity
+        self.wrap = wrap
+        self.offsets = _OFFSETS[connectivity]
+        directions = len(self.offsets[0])
+
+        self.row_map = np.empty((directions, height), dtype=np.int64)
+        self.col_map = np.empty((directions, 2, width), dtype=np.int64)
+        ys, xs = np.arange(height), np.arange(width)
+        for j in range(directions):
+            self.row_map[j] = self._wrapped(ys + self.offsets[0][j][0], height)
+            for parity in (0, 1):
+                self.col_map[j, parity] = self._wrapped(xs + self.offsets[parity][j][1], width)
+        # mêmes tables en listes Python pour les boucles case par case
+        self.rows = self.row_map.tolist()
+        self.cols = self.col_map.tolist()
+
+        # directions "vers l'avant" : chaque paire de voisins n'est vue qu'une fois
+        self.forward = tuple(j for j in range(directions) if self.offsets[0][j] > (0, 0))
+        # décalage géométrique réel (dy, dx) de chaque direction, par parité de ligne
+        shift = 0.5 if connectivity == "hex" else 0.0
+        row_height = math.sqrt(3) / 2 if connectivity == "hex" else 1.0
+        self.real_offsets = tuple(
+            tuple((dy * row_height, dx + (shift if parity == 0 else -shift) * (dy % 2))
+                  for dy, dx in self.offsets[parity])
+            for parity in (0, 1)
+        )
+        self.distances = tuple(math.hypot(*offset) for offset in self.real_offsets[0])
+
+    def _wrapped(self, coordinates, size: int):
+        if self.wrap:
+            return coordinates % size
+        return np.where((coordinates >= 0) & (coordinates < size), coordinates, -1)
+
+    @property
+    def directions(self):
+        return len(self.offsets[0])
+
+    @property
+    def plain(self):
+        """Grille carrée bornée : les voisins s'obtiennent par simples tranches décalées"""
+        return self.connectivity != "hex" and not self.wrap
+
+    def neighbours(self, x: int, y: int):
+        """Coordonnées (nx, ny) des voisins de (x, y)"""
+        parity = y & 1
+        result = []
+        for rows, cols in zip(self.rows, self.cols):
+            ny, nx = rows[y], cols[parity][x]
+            if ny >= 0 and nx >= 0:
+                result.append((nx, ny))
+        return result
+
+    def neighbour_indices(self, indices):
+        """
+        Voisins de cases données par indices à plat
+
+        Returns:
+            Tableau (directions, len(indices)) d'indices à plat, -1 hors de la grille
+        """
+        ys, xs = np.divmod(np.asarray(indices, dtype=np.int64), self.width)
+        ny = self.row_map[:, ys]
+        nx = self.col_map[:, ys & 1, xs]
+        return np.where((ny >= 0) & (nx >= 0), ny * self.width + nx, -1)
+
+    def edges(self, mask):
+        """
+        Arêtes (u, v) entre cases voisines du masque, en indices à plat, chacune une fois
+        """
+        height, width = mask.shape
+        dtype = _index_dtype(mask.size)
+        if self.plain:
+            index = np.arange(mask.size, dtype=dtype).reshape(height, width)
+            sources, targets = [], []
+            for j in self.forward:
+                dy, dx = self.offsets[0][j]
+                src = (slice(0, height - dy), slice(max(0, -dx), width - max(0, dx)))
+                dst = (slice(dy, height), slice(max(0, dx), width - max(0, -dx)))
+                both = mask[src] & mask[dst]
+                sources.append(index[src][both])
+                targets.append(index[dst][both])
+            return np.concatenate(sources), np.concatenate(targets)
+
+        cells = np.flatnonzero(mask).astype(dtype)
+        neighbours = self.neighbour_indices(cells)[list(self.forward)]
+        sources, targets = [], []
+        flat = mask.reshape(-1)
+        for row in neighbours:
+            ok = row >= 0
+            ok[ok] = flat[row[ok]]
+            sources.append(cells[ok])
+            targets.append(row[ok].astype(dtype))
+        u, v = np.concatenate(sources), np.concatenate(targets)
+        if self.wrap and min(height, width) <= 2:
+            # petite grille torique : un voisin peut être atteint dans deux directions
+            keep = u != v
+            pairs = np.unique(np.stack([np.minimum(u, v)[keep], np.maximum(u, v)[keep]]), axis=1)
+            u, v = pairs[0], pairs[1]
+        return u, v
+
+
+@lru_cache(maxsize=32)
+def get_topology(width: int, height: int, connectivity=8, wrap: bool = False):
+    """Topologie partagée pour une taille de grille et une règle de voisinage"""
+    return Topology(width, height, connectivity, wrap)
+
+
+def topology_for(shape, topology: Topology = None):
+    """Topologie à utiliser pour une grille (hauteur, largeur) : 8-connexe bornée par défaut"""
+    height, width = shape
+    if topology is None:
+        return get_topology(width, height)
+    if (topology.height, topology.width) != (height, width):
+        raise ValueError(f"La topologie {topology.height}x{topology.width} ne correspond pas à la grille {height}x{width}")
+    return topology
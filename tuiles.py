@@ -0,0 +1,211 @@
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from composantes import label_components
+from generation import iter_terrain_blocks
+
+TREE, BURNT = 1, 3
+META_FILE = "carte.json"
+
+
+def _tile_file(directory: str, ty: int, tx: int):
+    return os.path.join(directory, f"tuile_{ty}_{tx}.npy")
+
+
+class TiledMap:
+    """
+    Carte découpée en tuiles carrées stockées sur disque, avec un cache LRU de tuiles
+
+    La mémoire utilisée est bornée par cache_tiles tuiles, quelle que soit la taille de
+    la carte. Avec overlay, les tuiles modifiées sont écrites dans ce répertoire et la
+    carte de base n'est jamais modifiée ; discard_changes revient à la carte de base
+    en supprimant de l'overlay les seuls fichiers de tuiles, le reste du répertoire est conservé.
+    """
+
+    def __init__(self, directory: str, cache_tiles: int = 64, overlay: str = None):
+        if cache_tiles < 1:
+            raise ValueError("Le cache doit contenir au moins une tuile")
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if overlay is not None and os.path.realpath(overlay) == os.path.realpath(directory):
+            raise ValueError("L'overlay doit être distinct du répertoire de la carte de base")
+        self.directory = directory
+        self.overlay = overlay
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.tile_size = meta["tile_size"]
+        self.seed = meta.get("seed")
+        self.tiles_y = -(-self.height // self.tile_size)
+        self.tiles_x = -(-self.width // self.tile_size)
+        self.cache_tiles = cache_tiles
+        self._cache = OrderedDict()
+        self._dirty = set()
+        self.loads = 0
+        self.evictions = 0
+        if overlay is not None:
+            os.makedirs(overlay, exist_ok=True)
+
+    @classmethod
+    def create(cls, directory: str, width: int, height: int, tile_size: int = 1024,
+               tree_percentage: float = 0.6, water_percentage: float = 0.1,
+               seed=None, smoothing: int = 0, **options):
+        """Génère une carte directement en tuiles, une bande de tuiles à la fois"""
+        blocks = iter_terrain_blocks(width, height, tree_percentage, water_percentage, seed, smoothing)
+        return cls._write(directory, width, height, tile_size, (block for _, block in blocks), seed, **options)
+
+    @classmethod
+    def from_array(cls, directory: str, cells, tile_size: int = 1024, seed=None, **options):
+        """Découpe un tableau uint8 en tuiles"""
+        cells = np.asarray(cells, dtype=np.uint8)
+        height, width = cells.shape
+        return cls._write(directory, width, height, tile_size, [cells], seed, **options)
+
+    @classmethod
+    def _write(cls, directory, width, height, tile_size, blocks, seed, **options):
+        os.makedirs(directory, exist_ok=True)
+        band = np.empty((0, width), dtype=np.uint8)
+        ty = 0
+        for block in blocks:
+            band = np.concatenate([band, block])
+            while len(band) >= tile_size or (ty * tile_size + len(band) == height and len(band)):
+                rows, band = band[:tile_size], band[tile_size:]
+                for tx in range(-(-width // tile_size)):
+                    np.save(_tile_file(directory, ty, tx), rows[:, tx * tile_size:(tx + 1) * tile_size])
+                ty += 1
+        if isinstance(seed, np.random.Generator):
+            seed = None
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"width": width, "height": height, "tile_size": tile_size, "seed": seed}, f)
+        return cls(directory, **options)
+
+    def tile_shape(self, ty: int, tx: int):
+        return (min(self.tile_size, self.height - ty * self.tile_size),
+                min(self.tile_size, self.width - tx * self.tile_size))
+
+    def tile(self, ty: int, tx: int):
+        """Tuile (ty, tx), chargée depuis le disque si elle n'est pas dans le cache"""
+        key = (ty, tx)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        filename = _tile_file(self.overlay, ty, tx) if self.overlay is not None else None
+        if filename is None or not os.path.exists(filename):
+            filename = _tile_file(self.directory, ty, tx)
+        tile = np.load(filename)
+        self.loads += 1
+        self._cache[key] = tile
+        while len(self._cache) > self.cache_tiles:
+            self._evict()
+        return tile
+
+    def _evict(self):
+        key, tile = self._cache.popitem(last=False)
+        self.evictions += 1
+        if key in self._dirty:
+            self._dirty.discard(key)
+            np.save(_tile_file(self.overlay or self.directory, *key), tile)
+
+    def mark_dirty(self, ty: int, tx: int):
+        self._dirty.add((ty, tx))
+
+    def get(self, x: int, y: int):
+        return int(self.tile(y // self.tile_size, x // self.tile_size)[y % self.tile_size, x % self.tile_size])
+
+    def set(self, x: int, y: int, value: int):
+        ty, tx = y // self.tile_size, x // self.tile_size
+        self.tile(ty, tx)[y % self.tile_size, x % self.tile_size] = value
+        self.mark_dirty(ty, tx)
+
+    def flush(self):
+        """Écrit les tuiles modifiées encore en cache"""
+        for key in list(self._dirty):
+            np.save(_tile_file(self.overlay or self.directory, *key), self._cache[key])
+        self._dirty.clear()
+
+    def discard_changes(self):
+        """Abandonne les modifications de l'overlay et revient à la carte de base"""
+        if self.overlay is None:
+            raise ValueError("Seule une carte avec overlay peut être remise à zéro")
+        self._cache.clear()
+        self._dirty.clear()
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                filename = _tile_file(self.overlay, ty, tx)
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+    def counts(self, values: int = 4):
+        """Nombre de cases par valeur, tuile par tuile"""
+        counts = np.zeros(values, dtype=np.int64)
+        for ty in range(self.tiles_y):
+            for tx in range(self.tiles_x):
+                counts += np.bincount(self.tile(ty, tx).ravel(), minlength=values)[:values]
+        return counts
+
+
+def burn_tiled(tiled: TiledMap, start_x: int, start_y: int):
+    """
+    Propage le feu d'une tuile à l'autre ; seules les tuiles atteintes par le feu sont lues
+
+    Dans chaque tuile, les composantes d'arbres contenant une case allumée brûlent.
+    Les cases brûlées au bord allument les cases voisines des tuiles adjacentes,
+    qui sont traitées à leur tour.
+
+    Returns:
+        Nombre de cases brûlées
+    """
+    size = tiled.tile_size
+    pending = {(start_y // size, start_x // size): [np.array([(start_y % size) * size + start_x % size])]}
+    burnt_count = 0
+    while pending:
+        (ty, tx), seeds = pending.popitem()
+        tile = tiled.tile(ty, tx)
+        height, width = tile.shape
+        seeds = np.concatenate(seeds)
+        # indices locaux calculés avec la largeur de tuile nominale
+        rows, cols = np.divmod(seeds, size)
+        seeds = rows * width + cols
+        trees = tile == TREE
+        seeds = seeds[trees.flat[seeds]]
+        if not seeds.size:
+            continue
+        labels = label_components(trees)
+        burning = np.isin(labels, np.unique(labels.flat[seeds]))
+        tile[burning] = BURNT
+        tiled.mark_dirty(ty, tx)
+        burnt_count += int(np.count_nonzero(burning))
+
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                ny, nx = ty + dy, tx + dx
+                if (dy, dx) == (0, 0) or not (0 <= ny < tiled.tiles_y and 0 <= nx < tiled.tiles_x):
+                    continue
+                cells = _border_seeds(burning, dy, dx, tiled.tile_shape(ny, nx))
+                if cells is not None:
+                    pending.setdefault((ny, nx), []).append(cells[0] * size + cells[1])
+    tiled.flush()
+    return burnt_count
+
+
+def _border_seeds(burning, dy: int, dx: int, neighbour_shape):
+    """Cases de la tuile voisine (dy, dx) adjacentes aux cases brûlées du bord"""
+    height, width = neighbour_shape
+    if dy and dx:
+        corner = burning[-1 if dy > 0 else 0, -1 if dx > 0 else 0]
+        if not corner:
+            return None
+        return np.array([0 if dy > 0 else height - 1]), np.array([0 if dx > 0 else width - 1])
+    if dy:
+        edge = np.flatnonzero(burning[-1 if dy > 0 else 0])
+        row = 0 if dy > 0 else height - 1
+        cols = np.unique(np.concatenate([edge - 1, edge, edge + 1]))
+        cols = cols[(cols >= 0) & (cols < width)]
+        return (np.full(cols.size, row), cols) if cols.size else None
+    edge = np.flatnonzero(burning[:, -1 if dx > 0 else 0])
+    col = 0 if dx > 0 else width - 1
+    rows = np.unique(np.concatenate([edge - 1, edge, edge + 1]))
+    rows = rows[(rows >= 0) & (rows < height)]
+    return (rows, np.full(rows.size, col)) if rows.size else None